@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+모듈 import 시간 벤치마크
+새 인터프리터에서 모듈을 import하는 데 걸리는 시간과 함께 로드된 무거운 의존성을 측정합니다.
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+# import 시점에 로드되면 안 되는 무거운 의존성
+HEAVY_MODULES = ['matplotlib', 'seaborn', 'wordcloud', 'jieba', 'textblob', 'nltk', 'pandas']
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    'elapsed': elapsed,
+    'loaded': [name for name in {heavy!r} if name in sys.modules]
+}}))
+"""
+
+
+def measure(module: str, runs: int) -> dict:
+    """새 프로세스에서 module import 시간을 runs회 측정"""
+    # 모듈끼리 상대 import하므로 이 폴더를 패키지로 import
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    package = os.path.basename(script_dir)
+    parent_dir = os.path.dirname(script_dir)
+    env = dict(os.environ, PYTHONPATH=parent_dir + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    code = PROBE.format(module=f"{package}.{module}", heavy=HEAVY_MODULES)
+
+    timings = []
+    loaded = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', code],
+            capture_output=True, text=True, check=True, env=env
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        timings.append(result['elapsed'])
+        loaded = result['loaded']
+
+    return {
+        'module': module,
+        'runs': runs,
+        'median_ms': statistics.median(timings) * 1000,
+        'min_ms': min(timings) * 1000,
+        'heavy_modules_loaded': loaded
+    }
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='모듈 import 시간 벤치마크')
+    parser.add_argument('modules', nargs='*', default=['text_analyzer'],
+                        help='측정할 모듈 이름')
+    parser.add_argument('--runs', type=int, default=5, help='반복 횟수')
+
+    args = parser.parse_args()
+
+    for module in args.modules:
+        result = measure(module, args.runs)
+        print(f"{result['module']}: 중앙값 {result['median_ms']:.1f}ms "
+              f"(최소 {result['min_ms']:.1f}ms, {result['runs']}회)")
+        if result['heavy_modules_loaded']:
+            print(f"  ⚠️ import 시 로드된 무거운 의존성: {', '.join(result['heavy_modules_loaded'])}")
+
+
+if __name__ == "__main__":
+    main()
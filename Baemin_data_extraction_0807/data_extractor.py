@@ -10,7 +10,7 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Callable, Tuple
 import redis
 import psycopg2
 from sqlalchemy import create_engine
@@ -25,6 +25,27 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 로그 라인 패턴 (앞에서부터 시도, 그룹: 시각, 레벨, 메시지)
+LOG_PATTERNS = [
+    re.compile(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) \[(\w+)\] (\w+): (.+)'),
+    re.compile(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) - (\w+) - (.+)'),
+    re.compile(r'\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\] (\w+): (.+)'),
+    # 2024-11-14 17:42:48 [INFO] ORDER_CREATED order_id=...
+    re.compile(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) \[(\w+)\] (.+)'),
+    # [2023-01-25 12:29:18.000] [TRACE] com.baedalapp.order.OrderService - ...
+    re.compile(r'\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})(?:\.\d+)?\] \[(\w+)\] (.+)')
+]
+
+# 추출 대상 데이터 파일 (파일명, 형식)
+DATA_FILES = [
+    ('배달의민족_가명데이터_10만건.csv', 'csv'),
+    ('배달의민족_메시지_데이터_25000건.json', 'json'),
+    ('배달의민족_JSON_데이터_25000건.json', 'json'),
+    ('배달의민족_XML_데이터_25000건.xml', 'xml'),
+    ('배달의민족_로그_데이터_25000건.log', 'log'),
+    ('배달의민족_통합_비정형데이터_10만건.pickle', 'pickle')
+]
+
 
 class DataExtractor:
     """비정형 데이터 추출 클래스"""
@@ -54,6 +75,8 @@ class DataExtractor:
             self.redis_client.ping()
             logger.info("Redis 연결 성공")
         except Exception as e:
+            # 연결되지 않은 클라이언트로 파일마다 재시도하지 않도록 해제
+            self.redis_client = None
             logger.warning(f"Redis 연결 실패: {e}")
     
     def setup_database(self, connection_string: str):
@@ -86,7 +109,78 @@ class DataExtractor:
         except Exception as e:
             logger.error(f"JSON 데이터 추출 실패: {filename} - {e}")
             return []
-    
+
+    def stream_json_data(self, filename: str, chunk_size: int = 1 << 16) -> Iterator[Any]:
+        """
+        최상위 JSON 배열을 항목 단위로 스트리밍 추출
+
+        파일 전체를 json.load로 읽지 않고 chunk_size 단위로 읽어
+        배열의 각 항목을 디코딩되는 즉시 yield합니다.
+
+        Args:
+            filename: JSON 파일명 (최상위가 배열이어야 함)
+            chunk_size: 한 번에 읽을 문자 수
+        """
+        filepath = os.path.join(self.data_dir, filename)
+        decoder = json.JSONDecoder()
+        count = 0
+
+        with open(filepath, 'r', encoding='utf-8') as f:
+            buffer = f.read(chunk_size)
+            pos = 0
+            eof = not buffer
+            started = False
+
+            while True:
+                # 공백과 구분자 건너뛰기
+                while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                    pos += 1
+
+                if pos >= len(buffer):
+                    if eof:
+                        break
+                    buffer = f.read(chunk_size)
+                    pos = 0
+                    eof = not buffer
+                    continue
+
+                if not started:
+                    if buffer[pos] != '[':
+                        raise ValueError(f"최상위 JSON 배열이 아닙니다: {filename}")
+                    started = True
+                    pos += 1
+                    continue
+
+                if buffer[pos] == ']':
+                    break
+
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                    # 버퍼 끝에서 끝난 값은 잘린 숫자일 수 있으므로 더 읽어서 확인
+                    complete = end < len(buffer) or eof
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    complete = False
+
+                if not complete:
+                    # 항목이 청크 경계에 걸린 경우 더 읽어서 재시도
+                    chunk = f.read(chunk_size)
+                    eof = not chunk
+                    buffer = buffer[pos:] + chunk
+                    pos = 0
+                    continue
+
+                pos = end
+                count += 1
+                yield item
+
+        logger.info(f"JSON 스트리밍 추출 완료: {filename} - {count}개 항목")
+
+    def stream_message_records(self, filename: str) -> Iterator[Dict[str, Any]]:
+        """JSON 파일에서 메시지 레코드를 스트리밍으로 평탄화하여 추출"""
+        return iter_message_records(self.stream_json_data(filename))
+
     def extract_xml_data(self, filename: str) -> List[Dict]:
         """XML 데이터 추출"""
         try:
@@ -109,18 +203,20 @@ class DataExtractor:
             logger.error(f"XML 데이터 추출 실패: {filename} - {e}")
             return []
     
-    def extract_log_data(self, filename: str) -> List[Dict]:
-        """로그 데이터 추출"""
+    def extract_log_data(self, filename: str, follow: bool = False, **follow_options):
+        """
+        로그 데이터 추출
+        
+        Args:
+            filename: 로그 파일명
+            follow: True면 파일을 계속 팔로우하는 이터레이터 반환 (follow_log_data 참고)
+            follow_options: follow_log_data에 전달할 옵션
+        """
+        if follow:
+            return self.follow_log_data(filename, **follow_options)
+        
         try:
-            filepath = os.path.join(self.data_dir, filename)
-            log_data = []
-            
-            with open(filepath, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    # 로그 패턴 분석
-                    log_entry = self._parse_log_line(line, line_num)
-                    if log_entry:
-                        log_data.append(log_entry)
+            log_data = list(self.stream_log_data(filename))
             
             logger.info(f"로그 데이터 추출 완료: {filename} - {len(log_data)}개 항목")
             return log_data
@@ -128,18 +224,72 @@ class DataExtractor:
             logger.error(f"로그 데이터 추출 실패: {filename} - {e}")
             return []
     
+    def stream_log_data(self, filename: str) -> Iterator[Dict]:
+        """로그 데이터를 한 줄씩 파싱하여 스트리밍 추출"""
+        filepath = os.path.join(self.data_dir, filename)
+        
+        with open(filepath, 'r', encoding='utf-8') as f:
+            for line_num, line in enumerate(f, 1):
+                # 로그 패턴 분석
+                log_entry = self._parse_log_line(line, line_num)
+                if log_entry:
+                    yield log_entry
+    
+    def follow_log_data(self, filename: str, checkpoint_path: Optional[str] = None,
+                        poll_interval: float = 0.5, from_end: bool = False,
+                        on_idle=None, stop_event=None) -> Iterator[Dict]:
+        """
+        커지는 로그 파일을 팔로우하며 새 줄을 파싱하여 스트리밍 추출
+        
+        로테이션(파일 교체/잘라내기)을 감지하고, checkpoint_path에 바이트 오프셋을 기록해
+        재시작 시 이어서 읽습니다.
+        
+        Args:
+            filename: 로그 파일명
+            checkpoint_path: 오프셋 체크포인트 파일 경로
+            poll_interval: 새 데이터 대기 간격(초)
+            from_end: 체크포인트가 없을 때 파일 끝부터 읽을지 여부
+            on_idle: 새 데이터가 없을 때마다 호출할 함수
+            stop_event: 설정되면 팔로우 종료 (threading.Event)
+        """
+        from .log_tailer import LogTailer
+        
+        tailer = LogTailer(os.path.join(self.data_dir, filename), checkpoint_path,
+                           poll_interval=poll_interval, from_end=from_end)
+        for line, line_num in tailer.lines(on_idle=on_idle, stop_event=stop_event):
+            log_entry = self._parse_log_line(line, line_num)
+            if log_entry:
+                yield log_entry
+    
     def _parse_log_line(self, line: str, line_num: int) -> Optional[Dict]:
-        """로그 라인 파싱"""
+        """
+        로그 라인 파싱
+        
+        timestamp는 'YYYY-MM-DD HH:MM:SS' 형식으로 정규화하므로
+        분/시간 단위 키는 문자열 앞부분만 잘라 얻을 수 있습니다.
+        """
         try:
-            # 기본 로그 패턴 (수정 가능)
-            patterns = [
-                r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) \[(\w+)\] (\w+): (.+)',
-                r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) - (\w+) - (.+)',
-                r'\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\] (\w+): (.+)'
-            ]
+            line = line.strip()
             
-            for pattern in patterns:
-                match = re.match(pattern, line.strip())
+            # JSON 구조화 로그
+            if line.startswith('{'):
+                try:
+                    fields = json.loads(line)
+                except json.JSONDecodeError:
+                    fields = None
+                if isinstance(fields, dict):
+                    timestamp = fields.get('timestamp')
+                    return {
+                        'line_number': line_num,
+                        'timestamp': timestamp.replace('T', ' ')[:19] if isinstance(timestamp, str) else None,
+                        'level': str(fields.get('level', 'INFO')).upper(),
+                        'message': fields.get('message') or fields.get('event') or line,
+                        'raw_line': line,
+                        'fields': fields
+                    }
+            
+            for pattern in LOG_PATTERNS:
+                match = pattern.match(line)
                 if match:
                     groups = match.groups()
                     return {
@@ -147,7 +297,7 @@ class DataExtractor:
                         'timestamp': groups[0],
                         'level': groups[1] if len(groups) > 1 else 'INFO',
                         'message': groups[-1],
-                        'raw_line': line.strip()
+                        'raw_line': line
                     }
             
             # 패턴이 맞지 않으면 기본 정보만 반환
@@ -155,8 +305,8 @@ class DataExtractor:
                 'line_number': line_num,
                 'timestamp': None,
                 'level': 'UNKNOWN',
-                'message': line.strip(),
-                'raw_line': line.strip()
+                'message': line,
+                'raw_line': line
             }
         except Exception as e:
             logger.warning(f"로그 라인 파싱 실패 (라인 {line_num}): {e}")
@@ -237,14 +387,19 @@ class DataExtractor:
         except Exception as e:
             logger.error(f"데이터베이스 저장 실패: {table_name} - {e}")
     
-    def save_to_file(self, data: Any, filename: str, format: str = 'json'):
-        """파일로 데이터 저장"""
+    def save_to_file(self, data: Any, filename: str, format: str = 'json', indent: Optional[int] = 2):
+        """
+        파일로 데이터 저장
+        
+        Args:
+            indent: JSON 들여쓰기 (None이면 한 줄로 저장하며 C 인코더를 사용해 훨씬 빠름)
+        """
         try:
             filepath = os.path.join(self.output_dir, filename)
             
             if format == 'json':
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+                from .pipeline import write_json
+                write_json(filepath, data, indent)
             elif format == 'csv':
                 if isinstance(data, pd.DataFrame):
                     data.to_csv(filepath, index=False, encoding='utf-8')
@@ -259,21 +414,47 @@ class DataExtractor:
         except Exception as e:
             logger.error(f"파일 저장 실패: {filename} - {e}")
     
-    def extract_all_data(self) -> Dict[str, Any]:
-        """모든 데이터 파일 추출"""
-        results = {}
+    def save_json_stream(self, items: Iterable[Any], filename: str, **fields) -> int:
+        """
+        항목을 한 건씩 직렬화해 {..fields, "data": [...], "count": n} 형태 JSON 파일로 저장
+
+        save_to_file(indent=None)과 같은 형식이지만 항목 목록을 메모리에 만들지 않습니다.
+
+        Returns:
+            저장한 항목 수
+        """
+        filepath = os.path.join(self.output_dir, filename)
+        count = 0
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write('{')
+            for key, value in fields.items():
+                f.write(f"{json.dumps(key, ensure_ascii=False)}: "
+                        f"{json.dumps(value, ensure_ascii=False, default=str)}, ")
+            f.write('"data": [')
+            for item in items:
+                if count:
+                    f.write(', ')
+                f.write(json.dumps(item, ensure_ascii=False, default=str))
+                count += 1
+            f.write(f'], "count": {count}}}')
+        logger.info(f"파일 저장 완료: {filepath}")
+        return count
+    
+    def extract_all_data(self, writer=None, files: Optional[List[Tuple[str, str]]] = None,
+                         on_extracted: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        모든 데이터 파일 추출
         
-        # 데이터 파일 목록
-        data_files = [
-            ('배달의민족_가명데이터_10만건.csv', 'csv'),
-            ('배달의민족_메시지_데이터_25000건.json', 'json'),
-            ('배달의민족_JSON_데이터_25000건.json', 'json'),
-            ('배달의민족_XML_데이터_25000건.xml', 'xml'),
-            ('배달의민족_로그_데이터_25000건.log', 'log'),
-            ('배달의민족_통합_비정형데이터_10만건.pickle', 'pickle')
-        ]
+        Args:
+            writer: 추출 결과 파일 쓰기를 맡길 백그라운드 작업자 (submit(func, *args, **kwargs) 제공,
+                    pipeline.BackgroundWriter 등). 없으면 파일마다 바로 저장합니다.
+            files: 추출할 (파일명, 형식) 목록 (기본 DATA_FILES, 목록 순서대로 추출)
+            on_extracted: 파일 하나의 추출이 끝날 때마다 (파일명, 결과)로 호출할 함수
+                          (실패한 파일도 호출, 다음 단계를 파일 단위로 바로 시작할 때 사용)
+        """
+        results = {}
         
-        for filename, file_type in data_files:
+        for filename, file_type in files or DATA_FILES:
             try:
                 if file_type == 'csv':
                     data = self.extract_csv_data(filename)
@@ -283,11 +464,13 @@ class DataExtractor:
                         'shape': data.shape if not data.empty else (0, 0)
                     }
                 elif file_type == 'json':
-                    data = self.extract_json_data(filename)
+                    # 메시지 파일은 메모리에 올리지 않고 항목 단위로 추출 파일에 옮겨 씀
+                    # (분석 단계는 stream_message_records로 원본을 다시 스트리밍)
+                    count = self.save_json_stream(self.stream_json_data(filename),
+                                                  f"extracted_{filename}.json", type='json')
                     results[filename] = {
                         'type': 'json',
-                        'data': data,
-                        'count': len(data)
+                        'count': count
                     }
                 elif file_type == 'xml':
                     data = self.extract_xml_data(filename)
@@ -311,11 +494,18 @@ class DataExtractor:
                         'data_type': type(data).__name__
                     }
                 
-                # Redis에 저장
-                self.save_to_redis(f"extracted_{filename}", results[filename])
-                
-                # 파일로 저장
-                self.save_to_file(results[filename], f"extracted_{filename}.json")
+                # Redis 및 파일로 저장 (대용량이므로 들여쓰기 없이, writer가 있으면 다음 파일 추출과 겹쳐 실행)
+                # JSON은 추출 파일을 위에서 이미 스트리밍으로 저장함
+                if writer is not None:
+                    if self.redis_client:
+                        writer.submit(self.save_to_redis, f"extracted_{filename}", results[filename])
+                    if file_type != 'json':
+                        writer.submit(self.save_to_file, results[filename], f"extracted_{filename}.json",
+                                      indent=None)
+                else:
+                    self.save_to_redis(f"extracted_{filename}", results[filename])
+                    if file_type != 'json':
+                        self.save_to_file(results[filename], f"extracted_{filename}.json", indent=None)
                 
             except Exception as e:
                 logger.error(f"데이터 추출 실패: {filename} - {e}")
@@ -324,6 +514,9 @@ class DataExtractor:
                     'error': str(e),
                     'data': None
                 }
+            
+            if on_extracted is not None:
+                on_extracted(filename, results[filename])
         
         return results
     
@@ -355,6 +548,64 @@ class DataExtractor:
         return summary
 
 
+def iter_message_records(records: Iterable[Dict]) -> Iterator[Dict[str, Any]]:
+    """
+    중첩된 대화/주문 레코드를 메시지 단위 레코드로 평탄화
+
+    메시지 데이터는 conversation_id 아래 messages[]에, 주문 JSON 데이터는
+    order_info/customer 아래에 텍스트가 중첩되어 있습니다. 입력을 한 건씩
+    소비하며 중간 리스트 없이 메시지 레코드를 yield합니다.
+
+    Args:
+        records: 대화 또는 주문 레코드 이터러블 (stream_json_data 결과 등)
+
+    Yields:
+        conversation_id, sender, timestamp, text, message_id 키를 갖는 딕셔너리
+    """
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+
+        if 'messages' in record:
+            # 메시지/채팅 데이터
+            conversation_id = record.get('conversation_id')
+            for message in record.get('messages') or []:
+                text = message.get('message') or message.get('text')
+                if not text:
+                    continue
+                yield {
+                    'conversation_id': conversation_id,
+                    'sender': message.get('sender', 'unknown'),
+                    'timestamp': message.get('timestamp'),
+                    'text': text,
+                    'message_id': message.get('message_id')
+                }
+        elif 'order_info' in record:
+            # 주문 JSON 데이터 (고객 요청사항만 텍스트로 사용)
+            order_info = record.get('order_info') or {}
+            address = (record.get('customer') or {}).get('address') or {}
+            text = address.get('note')
+            if text:
+                yield {
+                    'conversation_id': order_info.get('id'),
+                    'sender': 'customer',
+                    'timestamp': order_info.get('timestamp'),
+                    'text': text,
+                    'message_id': f"{order_info.get('id')}_note"
+                }
+        else:
+            # 이미 평탄한 레코드
+            text = record.get('text', record.get('message', ''))
+            if text:
+                yield {
+                    'conversation_id': record.get('conversation_id'),
+                    'sender': record.get('sender', record.get('user_id', 'unknown')),
+                    'timestamp': record.get('timestamp'),
+                    'text': text,
+                    'message_id': record.get('message_id')
+                }
+
+
 def main():
     """메인 실행 함수"""
     # DataExtractor 초기화
@@ -0,0 +1,168 @@
+"""
+유사 중복 메시지 탐지 도구
+MinHash 서명과 LSH 밴딩으로 거의 같은 템플릿 메시지를 선형 시간에 묶고,
+대표 메시지와 중복 건수(가중치)를 생성합니다.
+"""
+
+import re
+import zlib
+import logging
+from typing import Dict, List, Any, Tuple, Iterable, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 2^32보다 큰 소수 (a * x + b 가 uint64 범위를 넘지 않도록 a, b, x < 2^32 사용)
+_PRIME = np.uint64(4294967311)
+
+
+def optimal_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    목표 유사도 임계값에 가장 가까운 (밴드 수, 밴드당 행 수) 선택
+
+    두 문서가 후보로 묶이는 확률이 급격히 변하는 지점은 약 (1/b)^(1/r)입니다.
+    """
+    best = (num_perm, 1)
+    best_gap = float('inf')
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        gap = abs((1 / bands) ** (1 / rows) - threshold)
+        if gap < best_gap:
+            best, best_gap = (bands, rows), gap
+    return best
+
+
+class MinHashDeduplicator:
+    """MinHash + LSH 기반 유사 중복 클러스터링 클래스"""
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64,
+                 shingle_size: int = 3, seed: int = 42):
+        """
+        초기화
+
+        Args:
+            threshold: 같은 클러스터로 묶을 최소 자카드 유사도 (추정치)
+            num_perm: MinHash 순열 수
+            shingle_size: 문자 n-gram 크기
+            seed: 해시 계수 난수 시드
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold는 (0, 1] 범위여야 합니다")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = optimal_bands(threshold, num_perm)
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def _shingles(self, text: str) -> np.ndarray:
+        """정규화된 텍스트의 문자 n-gram 해시 (32비트)"""
+        text = re.sub(r'\s+', ' ', text.lower()).strip()
+        size = self.shingle_size
+        if len(text) <= size:
+            grams = {text}
+        else:
+            grams = {text[i:i + size] for i in range(len(text) - size + 1)}
+        return np.fromiter((zlib.crc32(gram.encode('utf-8')) for gram in grams),
+                           dtype=np.uint64, count=len(grams))
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash 서명 (num_perm개의 최소 해시)"""
+        shingles = self._shingles(text)
+        hashed = (self._a[:, None] * shingles[None, :] + self._b[:, None]) % _PRIME
+        return hashed.min(axis=1)
+
+    def cluster(self, texts: Iterable[str]) -> np.ndarray:
+        """
+        텍스트별 클러스터 대표 인덱스 계산
+
+        완전히 같은 텍스트는 먼저 합치고, 고유 텍스트에만 MinHash/LSH를 적용합니다.
+        LSH 후보는 서명으로 추정한 유사도가 threshold 이상일 때만 합칩니다.
+
+        Returns:
+            각 텍스트가 속한 클러스터 대표(처음 등장한 텍스트)의 인덱스 배열
+        """
+        first_index: Dict[str, int] = {}
+        exact_labels = []
+        unique_texts = []
+        for i, text in enumerate(texts):
+            text = text or ''
+            if text not in first_index:
+                first_index[text] = i
+                unique_texts.append((i, text))
+            exact_labels.append(first_index[text])
+
+        # 고유 텍스트 간 유니온-파인드 (루트는 가장 먼저 등장한 텍스트)
+        parent = {i: i for i, _ in unique_texts}
+
+        def find(x: int) -> int:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        signatures: Dict[int, np.ndarray] = {}
+        buckets: Dict[Tuple[int, bytes], int] = {}
+        for i, text in unique_texts:
+            sig = self.signature(text)
+            signatures[i] = sig
+            for band in range(self.bands):
+                key = (band, sig[band * self.rows:(band + 1) * self.rows].tobytes())
+                other = buckets.setdefault(key, i)
+                if other == i:
+                    continue
+                root_i, root_other = find(i), find(other)
+                if root_i == root_other:
+                    continue
+                if np.mean(signatures[other] == sig) >= self.threshold:
+                    if root_other < root_i:
+                        parent[root_i] = root_other
+                    else:
+                        parent[root_other] = root_i
+
+        labels = np.array([find(label) for label in exact_labels], dtype=np.int64)
+        logger.info(f"유사 중복 탐지 완료 - 텍스트 {len(labels)}개, "
+                    f"고유 {len(unique_texts)}개, 클러스터 {len(np.unique(labels))}개")
+        return labels
+
+    def deduplicate(self, texts: List[str],
+                    include_members: bool = False) -> List[Dict[str, Any]]:
+        """
+        대표 텍스트와 중복 건수 목록
+
+        Args:
+            texts: 텍스트 목록
+            include_members: 클러스터별 원본 인덱스 포함 여부
+
+        Returns:
+            representative, representative_index, count (및 members) 키를 갖는
+            클러스터 목록 (건수 내림차순)
+        """
+        labels = self.cluster(texts)
+        if len(labels) == 0:
+            return []
+
+        representatives, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+        order = np.argsort(-counts, kind='stable')
+
+        members: Optional[List[np.ndarray]] = None
+        if include_members:
+            sorted_idx = np.argsort(inverse, kind='stable')
+            bounds = np.concatenate([[0], np.cumsum(counts)])
+            members = [sorted_idx[bounds[k]:bounds[k + 1]] for k in range(len(representatives))]
+
+        clusters = []
+        for k in order:
+            rep = int(representatives[k])
+            cluster = {
+                'representative': texts[rep],
+                'representative_index': rep,
+                'count': int(counts[k])
+            }
+            if members is not None:
+                cluster['members'] = members[k].tolist()
+            clusters.append(cluster)
+        return clusters
@@ -0,0 +1,175 @@
+"""
+개체명 추출 도구
+음식점/메뉴/지역 사전과 가격/시간 패턴을 하나의 정규식 오토마톤으로 컴파일하여
+텍스트당 한 번의 스캔으로 모든 개체를 추출합니다.
+"""
+
+import re
+from bisect import bisect_right
+from typing import Dict, List, Iterable, Optional
+
+# 사전 데이터 (TestWeb/db.py, testData/test_baemin_data_extraction.py의 생성 기준과 동일)
+RESTAURANTS = [
+    "맘스터치", "맥도날드", "버거킹", "KFC", "롯데리아",
+    "교촌치킨", "BBQ", "굽네치킨", "치킨플러스", "네네치킨",
+    "도미노피자", "피자헛", "미스터피자", "파파존스", "치킨마루",
+    "김밥천국", "컵밥", "한솥도시락", "오니기리와이프", "더진국",
+    "맛닭꼬", "봉추찜닭", "안동찜닭", "원할머니보쌈", "족발야시장",
+    "중국집용", "홍콩반점", "짜장면세상", "중화루", "만리장성",
+    "삼계탕집", "곰탕집", "설렁탕집", "순댓국집", "해장국집",
+    "떡볶이천국", "신전떡볶이", "엽기떡볶이", "청년다방", "호떡집",
+    "초밥나라", "회센터", "연어집", "참치집", "스시로",
+    "파스타천국", "이태리부엌", "스파게티공장", "올리브가든", "베네치아"
+]
+
+MENU_CATEGORIES = {
+    "치킨": ["후라이드치킨", "양념치킨", "간장치킨", "마늘치킨", "허니콤보", "치킨텐더", "핫윙", "치킨버거"],
+    "피자": ["페퍼로니피자", "불고기피자", "하와이안피자", "치킨피자", "새우피자", "마르게리타", "콤비네이션피자"],
+    "햄버거": ["빅맥", "와퍼", "치킨버거", "새우버거", "불고기버거", "치즈버거", "베이컨버거"],
+    "중식": ["짜장면", "짬뽕", "탕수육", "양장피", "깐풍기", "볶음밥", "군만두", "잡채"],
+    "한식": ["비빔밥", "된장찌개", "김치찌개", "불고기", "갈비탕", "삼계탕", "냉면", "국밥"],
+    "일식": ["초밥세트", "연어회", "참치회", "라멘", "우동", "돈카츠", "규동", "연어덮밥"],
+    "양식": ["파스타", "리조또", "스테이크", "샐러드", "오므라이스", "필라프", "크림파스타"],
+    "분식": ["떡볶이", "순대", "튀김", "김밥", "라면", "우동", "만두", "어묵"],
+    "도시락": ["불고기도시락", "치킨도시락", "생선도시락", "돈까스도시락", "스팸도시락", "김치볶음밥", "오므라이스"]
+}
+
+DISTRICTS = [
+    "강남구", "강동구", "강북구", "강서구", "관악구", "광진구", "구로구", "금천구",
+    "노원구", "도봉구", "동대문구", "동작구", "마포구", "서대문구", "서초구",
+    "성동구", "성북구", "송파구", "양천구", "영등포구", "용산구", "은평구", "종로구", "중구", "중랑구"
+]
+
+# 사전 외 패턴 (가격, 시간, 동 단위 주소)
+PRICE_PATTERN = r'\d{1,3}(?:,\d{3})+원|\d+원'
+TIME_PATTERN = r'\d{1,2}:\d{2}|\d{1,3}분'
+DONG_PATTERN = r'\d{1,3}동'
+
+ENTITY_TYPES = ['restaurants', 'food_items', 'locations', 'times', 'prices']
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    단어 목록을 트라이 형태의 정규식으로 변환
+
+    공통 접두사를 공유하므로 대안 목록을 하나씩 시도하지 않으며,
+    같은 위치에서는 가장 긴 단어가 매칭됩니다.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node: Dict) -> str:
+        is_end = '' in node
+        branches = [re.escape(char) + build(child)
+                    for char, child in sorted(node.items()) if char != '']
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if is_end:
+            # 더 긴 단어를 먼저 시도하도록 탐욕적 선택 사용
+            return '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+
+class EntityExtractor:
+    """사전 + 패턴 기반 단일 스캔 개체명 추출 클래스"""
+
+    def __init__(self, restaurants: Optional[Iterable[str]] = None,
+                 food_items: Optional[Iterable[str]] = None,
+                 locations: Optional[Iterable[str]] = None):
+        """
+        초기화
+
+        Args:
+            restaurants: 음식점명 사전 (기본: RESTAURANTS)
+            food_items: 음식명 사전 (기본: 메뉴명 + 카테고리명)
+            locations: 지역명 사전 (기본: DISTRICTS)
+        """
+        if restaurants is None:
+            restaurants = RESTAURANTS
+        if food_items is None:
+            food_items = list(MENU_CATEGORIES)
+            for menus in MENU_CATEGORIES.values():
+                food_items.extend(menus)
+        if locations is None:
+            locations = DISTRICTS
+
+        # 사전 단어 -> 개체 유형 (여러 사전에 있으면 먼저 등록된 유형 사용)
+        self.gazetteer: Dict[str, str] = {}
+        for entity_type, words in (('restaurants', restaurants),
+                                   ('food_items', food_items),
+                                   ('locations', locations)):
+            for word in words:
+                if word:
+                    self.gazetteer.setdefault(word, entity_type)
+
+        # 각 분기 앞에 첫 글자 전방탐색을 두어 대부분의 위치를 분기 시도 없이 건너뜀
+        first_chars = re.escape(''.join(sorted({word[0] for word in self.gazetteer})))
+        self.pattern = re.compile(
+            f'(?=[{first_chars}])(?P<term>{_trie_pattern(self.gazetteer)})'
+            f'|(?=\\d)(?:(?P<prices>{PRICE_PATTERN})'
+            f'|(?P<times>{TIME_PATTERN})'
+            f'|(?P<locations>{DONG_PATTERN}))'
+        )
+
+    def _entity_type(self, match: 're.Match') -> str:
+        """매칭 결과의 개체 유형"""
+        group = match.lastgroup
+        if group == 'term':
+            return self.gazetteer[match.group()]
+        return group
+
+    def extract(self, text: str) -> Dict[str, List[str]]:
+        """텍스트 하나에서 모든 유형의 개체를 한 번의 스캔으로 추출"""
+        entities = {entity_type: [] for entity_type in ENTITY_TYPES}
+        if not text:
+            return entities
+
+        for match in self.pattern.finditer(text):
+            entities[self._entity_type(match)].append(match.group())
+
+        return entities
+
+    def extract_batch(self, texts: Iterable[str], batch_size: int = 10000) -> List[Dict[str, List[str]]]:
+        """
+        여러 텍스트의 개체 추출
+
+        batch_size개씩 줄바꿈으로 이어 붙여 정규식을 한 번만 실행하고,
+        매칭 위치로 원래 텍스트를 찾아 결과를 나눕니다.
+        """
+        results = []
+        batch: List[str] = []
+
+        for text in texts:
+            # 줄바꿈은 어떤 개체에도 포함되지 않으므로 구분자로 사용
+            batch.append((text or '').replace('\n', ' '))
+            if len(batch) >= batch_size:
+                results.extend(self._extract_joined(batch))
+                batch = []
+
+        if batch:
+            results.extend(self._extract_joined(batch))
+
+        return results
+
+    def _extract_joined(self, texts: List[str]) -> List[Dict[str, List[str]]]:
+        """이어 붙인 배치 하나 처리"""
+        results = [{entity_type: [] for entity_type in ENTITY_TYPES} for _ in texts]
+
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+
+        for match in self.pattern.finditer('\n'.join(texts)):
+            index = bisect_right(starts, match.start()) - 1
+            results[index][self._entity_type(match)].append(match.group())
+
+        return results
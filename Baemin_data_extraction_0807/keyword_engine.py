@@ -0,0 +1,184 @@
+"""
+키워드 엔진
+말뭉치를 한 번만 토큰화해 희소 문서-단어 행렬(CSR)을 만들고,
+TF/TF-IDF, n-gram, 메타데이터(업체/구역 등) 기반 슬라이스 질의를 행 선택으로 처리합니다.
+"""
+
+import logging
+from typing import Dict, List, Any, Tuple, Iterable, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+
+class KeywordEngine:
+    """희소 행렬 기반 키워드 엔진 클래스"""
+
+    def __init__(self, analyzer, ngram_range: Tuple[int, int] = (1, 2), min_df: int = 1):
+        """
+        초기화
+
+        Args:
+            analyzer: 토큰화에 사용할 TextAnalyzer
+            ngram_range: 생성할 n-gram 범위 (최소, 최대)
+            min_df: 단어가 포함되어야 하는 최소 문서 수
+        """
+        self.analyzer = analyzer
+        self.ngram_range = ngram_range
+        self.min_df = min_df
+
+        self.vocabulary: Dict[str, int] = {}
+        self.terms: np.ndarray = np.array([], dtype=object)
+        self.term_ngram: np.ndarray = np.array([], dtype=np.int8)
+        self.matrix: Optional[sparse.csr_matrix] = None
+        self.tfidf: Optional[sparse.csr_matrix] = None
+        self.idf: Optional[np.ndarray] = None
+        self.metadata: Dict[str, np.ndarray] = {}
+
+    def _ngrams(self, tokens: List[str]) -> Iterable[Tuple[str, int]]:
+        """토큰 목록에서 (n-gram, n) 생성"""
+        low, high = self.ngram_range
+        for n in range(low, high + 1):
+            for i in range(len(tokens) - n + 1):
+                yield ' '.join(tokens[i:i + n]), n
+
+    def fit(self, texts: Iterable[str],
+            metadata: Optional[Dict[str, Sequence[Any]]] = None) -> 'KeywordEngine':
+        """
+        문서-단어 행렬 구축
+
+        Args:
+            texts: 문서 텍스트 이터러블 (한 번만 순회)
+            metadata: 슬라이스 기준 컬럼 {이름: 문서별 값 목록}
+        """
+        vocabulary: Dict[str, int] = {}
+        term_ngram: List[int] = []
+        indices: List[int] = []
+        data: List[int] = []
+        indptr = [0]
+
+        for tokens in self.analyzer.tokenize_batch(texts):
+            counts: Dict[int, int] = {}
+            for term, n in self._ngrams(tokens):
+                index = vocabulary.get(term)
+                if index is None:
+                    index = vocabulary[term] = len(vocabulary)
+                    term_ngram.append(n)
+                counts[index] = counts.get(index, 0) + 1
+            indices.extend(counts.keys())
+            data.extend(counts.values())
+            indptr.append(len(indices))
+
+        n_docs = len(indptr) - 1
+        matrix = sparse.csr_matrix(
+            (np.array(data, dtype=np.float32), np.array(indices, dtype=np.int32), np.array(indptr)),
+            shape=(n_docs, len(vocabulary))
+        )
+        terms = np.empty(len(vocabulary), dtype=object)
+        for term, index in vocabulary.items():
+            terms[index] = term
+        term_ngram = np.array(term_ngram, dtype=np.int8)
+
+        # 최소 문서 빈도 필터
+        doc_freq = np.bincount(matrix.indices, minlength=matrix.shape[1])
+        if self.min_df > 1:
+            keep = np.flatnonzero(doc_freq >= self.min_df)
+            matrix = matrix[:, keep].tocsr()
+            terms = terms[keep]
+            term_ngram = term_ngram[keep]
+            doc_freq = doc_freq[keep]
+
+        self.matrix = matrix
+        self.terms = terms
+        self.term_ngram = term_ngram
+        self.vocabulary = {term: i for i, term in enumerate(terms)}
+
+        # 평활화된 IDF와 행 단위 L2 정규화 TF-IDF (질의 시 재계산하지 않음)
+        self.idf = np.log((1 + n_docs) / (1 + doc_freq)) + 1
+        tfidf = matrix.multiply(self.idf.astype(np.float32)).tocsr()
+        norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        self.tfidf = sparse.diags(1 / norms).dot(tfidf).tocsr()
+
+        self.metadata = {}
+        for name, values in (metadata or {}).items():
+            values = np.asarray(values, dtype=object)
+            if len(values) != n_docs:
+                raise ValueError(f"메타데이터 길이가 문서 수와 다릅니다: {name}")
+            self.metadata[name] = values
+
+        logger.info(f"키워드 엔진 구축 완료 - 문서 {n_docs}개, 단어 {len(terms)}개")
+        return self
+
+    def select(self, **filters) -> np.ndarray:
+        """
+        메타데이터 조건에 맞는 문서 행 번호
+
+        값이 리스트/집합이면 포함 여부로 비교합니다. 예: select(district='강남구')
+        """
+        mask = np.ones(self.matrix.shape[0], dtype=bool)
+        for name, value in filters.items():
+            if name not in self.metadata:
+                raise KeyError(f"알 수 없는 메타데이터: {name}")
+            column = self.metadata[name]
+            if isinstance(value, (list, tuple, set)):
+                mask &= np.isin(column, list(value))
+            else:
+                mask &= column == value
+        return np.flatnonzero(mask)
+
+    def top_keywords(self, top_n: int = 20, rows: Optional[np.ndarray] = None,
+                     method: str = 'tfidf', ngram: Optional[int] = None,
+                     **filters) -> List[Tuple[str, float]]:
+        """
+        상위 키워드
+
+        Args:
+            top_n: 반환할 키워드 수
+            rows: 대상 문서 행 번호 (없으면 filters 또는 전체)
+            method: 'tf' (빈도 합) 또는 'tfidf' (정규화된 TF-IDF 합)
+            ngram: 특정 n-gram만 (예: 2는 bigram)
+            filters: select()에 전달할 메타데이터 조건
+        """
+        if self.matrix is None:
+            raise ValueError("fit()을 먼저 호출하세요")
+        if method not in ('tf', 'tfidf'):
+            raise ValueError(f"지원하지 않는 방식입니다: {method}")
+
+        source = self.tfidf if method == 'tfidf' else self.matrix
+        if rows is None and filters:
+            rows = self.select(**filters)
+        if rows is not None:
+            source = source[rows]
+
+        scores = np.asarray(source.sum(axis=0)).ravel()
+        if ngram is not None:
+            scores = np.where(self.term_ngram == ngram, scores, 0)
+
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > top_n:
+            candidates = candidates[np.argpartition(-scores[candidates], top_n - 1)[:top_n]]
+        order = candidates[np.argsort(-scores[candidates], kind='stable')]
+
+        if method == 'tf':
+            return [(self.terms[i], int(scores[i])) for i in order]
+        return [(self.terms[i], float(scores[i])) for i in order]
+
+    def top_keywords_by(self, name: str, top_n: int = 10, method: str = 'tfidf',
+                        ngram: Optional[int] = None) -> Dict[Any, List[Tuple[str, float]]]:
+        """메타데이터 값별 상위 키워드 (예: 업체별, 구역별)"""
+        if name not in self.metadata:
+            raise KeyError(f"알 수 없는 메타데이터: {name}")
+
+        column = self.metadata[name]
+        values, inverse = np.unique(column.astype(str), return_inverse=True)
+        order = np.argsort(inverse, kind='stable')
+        bounds = np.searchsorted(inverse[order], np.arange(len(values) + 1))
+
+        results = {}
+        for i, value in enumerate(values.tolist()):
+            rows = order[bounds[i]:bounds[i + 1]]
+            results[value] = self.top_keywords(top_n, rows=rows, method=method, ngram=ngram)
+        return results
@@ -0,0 +1,302 @@
+"""
+스트리밍 로그 분석 도구
+파싱된 로그 항목을 제너레이터로 소비하며 분/시간 단위 텀블링 윈도우로
+레벨별 건수, 에러 코드별 건수, 주문 금액 통계를 집계하고
+닫힌 윈도우를 즉시 내보냅니다. 메모리 사용량은 열린 윈도우 수에만 비례합니다.
+"""
+
+import re
+import time
+import heapq
+import calendar
+import functools
+import logging
+from collections import Counter
+from typing import Dict, List, Any, Iterable, Iterator, Optional
+
+from .stream_aggregator import RunningStats
+
+logger = logging.getLogger(__name__)
+
+# 에러 코드 (예: "Error: CARD_DECLINED", "error_code": "TIMEOUT")
+ERROR_CODE_PATTERN = re.compile(r'''(?:Error:\s*|error_code["']?\s*[=:]\s*["']?)([A-Z][A-Z_]+)''')
+# 주문 금액 (예: amount=42211, "amount": 24627)
+AMOUNT_PATTERN = re.compile(r'''amount["']?\s*[=:]\s*(\d+)''')
+
+WINDOW_SIZES = {'minute': 60, 'hour': 3600}
+
+ERROR_LEVELS = ('ERROR', 'CRITICAL')
+
+
+@functools.lru_cache(maxsize=4096)
+def _minute_epoch(minute_key: str) -> int:
+    """'YYYY-MM-DD HH:MM' 키를 UTC 기준 초로 변환 (strptime 없이 고정 위치에서 숫자 추출)"""
+    if minute_key[4] != '-' or minute_key[7] != '-' or minute_key[13] != ':':
+        raise ValueError(f"잘못된 시각 형식입니다: {minute_key}")
+    return calendar.timegm((int(minute_key[:4]), int(minute_key[5:7]), int(minute_key[8:10]),
+                            int(minute_key[11:13]), int(minute_key[14:16]), 0))
+
+
+def local_epoch() -> int:
+    """현재 로컬 벽시계 시각을 로그 시각과 같은 기준(UTC로 간주한 초)으로 반환"""
+    return calendar.timegm(time.localtime())
+
+
+def _format_epoch(epoch: int) -> str:
+    """초를 'YYYY-MM-DD HH:MM:SS' 문자열로 변환"""
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(epoch))
+
+
+class LogWindow:
+    """윈도우 하나의 누적값"""
+
+    def __init__(self, start: int):
+        self.start = start
+        self.count = 0
+        self.levels: Counter = Counter()
+        self.error_codes: Counter = Counter()
+        self.amounts = RunningStats()
+
+    def add(self, level: str, error_code: Optional[str], amount: Optional[int]):
+        """로그 항목 하나 누적"""
+        self.count += 1
+        self.levels[level] += 1
+        if error_code:
+            self.error_codes[error_code] += 1
+        if amount is not None:
+            self.amounts.update(amount)
+
+    def to_dict(self, window: str, size: int, late: bool = False) -> Dict[str, Any]:
+        """윈도우 결과 형식으로 변환"""
+        errors = sum(self.levels[level] for level in ERROR_LEVELS)
+        return {
+            'window': window,
+            'start': _format_epoch(self.start),
+            'end': _format_epoch(self.start + size),
+            'count': self.count,
+            'error_count': errors,
+            'error_rate': errors / self.count if self.count else 0,
+            'levels': dict(self.levels),
+            'error_codes': dict(self.error_codes),
+            'amount_stats': self.amounts.to_dict(),
+            'late': late
+        }
+
+
+class TumblingWindowAggregator:
+    """
+    텀블링 윈도우 집계기
+
+    지금까지 본 가장 늦은 시각(워터마크)에서 lateness_seconds 이상 지난 윈도우를 닫아 내보냅니다.
+    이미 닫힌 윈도우에 늦게 도착한 항목은 새 부분 윈도우로 모아 late=True로 다시 내보내므로,
+    소비자는 같은 start의 윈도우를 합산하면 됩니다.
+    """
+
+    def __init__(self, window: str = 'minute', lateness_seconds: int = 0,
+                 max_open_windows: int = 1000):
+        """
+        초기화
+
+        Args:
+            window: 'minute' 또는 'hour'
+            lateness_seconds: 워터마크 이후 윈도우를 열어 두는 시간
+            max_open_windows: 동시에 열어 둘 최대 윈도우 수 (초과 시 가장 오래된 것부터 닫음)
+        """
+        if window not in WINDOW_SIZES:
+            raise ValueError(f"지원하지 않는 윈도우입니다: {window}")
+        self.window = window
+        self.size = WINDOW_SIZES[window]
+        self.lateness_seconds = lateness_seconds
+        self.max_open_windows = max_open_windows
+
+        self.watermark: Optional[int] = None
+        self.closed_before: Optional[int] = None
+        self.late_events = 0
+        self._open: Dict[int, LogWindow] = {}
+        self._starts: List[int] = []  # 열린 윈도우 시작 시각 힙
+        self._late: set = set()
+
+    def add(self, epoch: int, level: str, error_code: Optional[str] = None,
+            amount: Optional[int] = None) -> List[Dict[str, Any]]:
+        """항목 하나 누적 후 닫힌 윈도우 목록 반환"""
+        start = epoch - epoch % self.size
+
+        window = self._open.get(start)
+        if window is None:
+            window = self._open[start] = LogWindow(start)
+            heapq.heappush(self._starts, start)
+            if self.closed_before is not None and start < self.closed_before:
+                self._late.add(start)
+        if start in self._late:
+            self.late_events += 1
+        window.add(level, error_code, amount)
+
+        if self.watermark is None or epoch > self.watermark:
+            self.watermark = epoch
+        return self._close(self.watermark - self.lateness_seconds)
+
+    def _close(self, before: int) -> List[Dict[str, Any]]:
+        """끝 시각이 before 이하인 윈도우와 최대 개수를 넘는 윈도우를 오래된 순으로 닫기"""
+        emitted = []
+        while self._starts and (self._starts[0] + self.size <= before
+                                or len(self._open) > self.max_open_windows):
+            emitted.append(self._emit(heapq.heappop(self._starts)))
+        return emitted
+
+    def _emit(self, start: int) -> Dict[str, Any]:
+        """윈도우 하나를 닫아 결과로 변환"""
+        window = self._open.pop(start)
+        late = start in self._late
+        self._late.discard(start)
+        self.closed_before = max(self.closed_before or start + self.size, start + self.size)
+        return window.to_dict(self.window, self.size, late=late)
+
+    def advance(self, epoch: int) -> List[Dict[str, Any]]:
+        """
+        새 항목 없이 워터마크를 epoch까지 진행하고 닫힌 윈도우 반환
+
+        실시간 팔로우 시 로그가 뜸해도 윈도우가 제때 닫히도록 현재 시각으로 호출합니다.
+        """
+        if self.watermark is None or epoch > self.watermark:
+            self.watermark = epoch
+        return self._close(self.watermark - self.lateness_seconds)
+
+    def open_windows(self) -> List[Dict[str, Any]]:
+        """아직 닫히지 않은 윈도우의 현재 값 (시작 시각 순)"""
+        return [self._open[start].to_dict(self.window, self.size, late=start in self._late)
+                for start in sorted(self._open)]
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """열린 윈도우를 모두 닫아 반환 (입력 종료 시)"""
+        emitted = []
+        while self._starts:
+            emitted.append(self._emit(heapq.heappop(self._starts)))
+        return emitted
+
+
+class LogAnalytics:
+    """파싱된 로그 항목 스트림 분석 클래스"""
+
+    def __init__(self, windows: Iterable[str] = ('minute', 'hour'), lateness_seconds: int = 0,
+                 max_open_windows: int = 1000, max_error_samples: int = 10,
+                 template_miner=None):
+        """
+        초기화
+
+        Args:
+            windows: 집계할 윈도우 종류
+            lateness_seconds: 늦게 도착하는 항목을 기다리는 시간
+            max_open_windows: 윈도우 종류별 최대 열린 윈도우 수
+            max_error_samples: 보관할 에러 메시지 예시 수 (템플릿 마이너가 없을 때)
+            template_miner: 같은 순회에서 메시지를 템플릿으로 묶을 LogTemplateMiner
+        """
+        self.aggregators = {
+            window: TumblingWindowAggregator(window, lateness_seconds, max_open_windows)
+            for window in windows
+        }
+        self.max_error_samples = max_error_samples
+        self.template_miner = template_miner
+
+        self.total_logs = 0
+        self.level_counts: Counter = Counter()
+        self.time_patterns: Counter = Counter()
+        self.error_codes: Counter = Counter()
+        self.amounts = RunningStats()
+        self.error_count = 0
+        self.error_samples: List[str] = []
+        self.windows_emitted = 0
+
+    def update(self, entry: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        로그 항목 하나 누적
+
+        Returns:
+            이 항목으로 닫힌 윈도우 목록 (없으면 빈 리스트)
+        """
+        self.total_logs += 1
+        level = entry.get('level') or 'UNKNOWN'
+        self.level_counts[level] += 1
+
+        raw_line = entry.get('raw_line') or entry.get('message') or ''
+        match = ERROR_CODE_PATTERN.search(raw_line)
+        error_code = match.group(1) if match else None
+        match = AMOUNT_PATTERN.search(raw_line)
+        amount = int(match.group(1)) if match else None
+
+        if error_code:
+            self.error_codes[error_code] += 1
+        if amount is not None:
+            self.amounts.update(amount)
+        if level in ERROR_LEVELS:
+            self.error_count += 1
+            if len(self.error_samples) < self.max_error_samples:
+                self.error_samples.append(entry.get('message', ''))
+        if self.template_miner is not None:
+            self.template_miner.add(entry.get('message', ''), entry.get('line_number'), level)
+
+        # timestamp는 'YYYY-MM-DD HH:MM:SS'로 정규화되어 있으므로 문자열 앞부분을 키로 사용
+        timestamp = entry.get('timestamp')
+        if not timestamp or len(timestamp) < 16:
+            return []
+        try:
+            epoch = _minute_epoch(timestamp[:16].replace('T', ' '))
+        except ValueError:
+            return []
+        self.time_patterns[int(timestamp[11:13])] += 1
+
+        emitted = []
+        for aggregator in self.aggregators.values():
+            emitted.extend(aggregator.add(epoch, level, error_code, amount))
+        self.windows_emitted += len(emitted)
+        return emitted
+
+    def process(self, entries: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """로그 항목 스트림을 소비하며 닫힌 윈도우를 차례로 yield (입력 종료 시 나머지도 yield)"""
+        for entry in entries:
+            yield from self.update(entry)
+        yield from self.flush()
+
+    def advance(self, epoch: int) -> List[Dict[str, Any]]:
+        """모든 윈도우 종류의 워터마크를 epoch(로그 시각 기준 초)까지 진행"""
+        emitted = []
+        for aggregator in self.aggregators.values():
+            emitted.extend(aggregator.advance(epoch))
+        self.windows_emitted += len(emitted)
+        return emitted
+
+    def open_windows(self, window: str = 'minute') -> List[Dict[str, Any]]:
+        """진행 중인 윈도우의 현재 값"""
+        return self.aggregators[window].open_windows()
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """열린 윈도우를 모두 닫아 반환"""
+        emitted = []
+        for aggregator in self.aggregators.values():
+            emitted.extend(aggregator.flush())
+        self.windows_emitted += len(emitted)
+        return emitted
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        전체 누적 결과 (run_log_analysis 결과 형식)
+
+        템플릿 마이너가 있으면 top_errors는 에러 메시지 원문 대신 에러 템플릿 상위 10개이고,
+        log_templates에 전체 템플릿 상위 20개가 추가됩니다.
+        """
+        summary = {
+            'total_logs': self.total_logs,
+            'level_distribution': dict(self.level_counts),
+            'time_patterns': dict(sorted(self.time_patterns.items())),
+            'error_count': self.error_count,
+            'error_rate': self.error_count / self.total_logs if self.total_logs else 0,
+            'error_codes': dict(self.error_codes.most_common()),
+            'amount_stats': self.amounts.to_dict(),
+            'top_errors': self.error_samples,
+            'windows_emitted': self.windows_emitted,
+            'late_events': {window: aggregator.late_events
+                            for window, aggregator in self.aggregators.items()}
+        }
+        if self.template_miner is not None:
+            summary['top_errors'] = self.template_miner.templates(10, levels=ERROR_LEVELS)
+            summary['log_templates'] = self.template_miner.templates(20)
+        return summary
@@ -0,0 +1,195 @@
+"""
+로그 파일 팔로우(tail -F) 도구
+계속 커지는 로그 파일에서 새 줄만 읽고, 로테이션(파일 교체/잘라내기)을 감지하며
+처리한 바이트 오프셋을 체크포인트 파일에 기록해 재시작 시 이어서 읽습니다.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class LogTailer:
+    """로그 파일 팔로우 클래스"""
+
+    def __init__(self, path: str, checkpoint_path: Optional[str] = None,
+                 poll_interval: float = 0.5, checkpoint_interval: float = 1.0,
+                 from_end: bool = False):
+        """
+        초기화
+
+        Args:
+            path: 팔로우할 로그 파일 경로
+            checkpoint_path: 오프셋 체크포인트 파일 경로 (없으면 기록하지 않음)
+            poll_interval: 새 데이터가 없을 때 대기 시간(초) (inotify 사용 시 최대 대기 시간)
+            checkpoint_interval: 체크포인트 기록 최소 간격(초)
+            from_end: 체크포인트가 없을 때 파일 끝부터 읽을지 여부
+        """
+        self.path = path
+        self.checkpoint_path = checkpoint_path
+        self.poll_interval = poll_interval
+        self.checkpoint_interval = checkpoint_interval
+        self.from_end = from_end
+
+        self.offset = 0
+        self.line_number = 0
+        self.inode: Optional[int] = None
+        self._file = None
+        self._last_checkpoint = 0.0
+        self._inotify = None
+
+    def _load_checkpoint(self) -> Optional[dict]:
+        """체크포인트 파일 읽기"""
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return None
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"체크포인트 읽기 실패, 처음부터 읽습니다: {e}")
+            return None
+
+    def save_checkpoint(self):
+        """현재 오프셋을 체크포인트 파일에 원자적으로 기록"""
+        if not self.checkpoint_path:
+            return
+        directory = os.path.dirname(self.checkpoint_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temp_path = self.checkpoint_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'path': self.path,
+                'inode': self.inode,
+                'offset': self.offset,
+                'line_number': self.line_number,
+                'updated_at': datetime.now().isoformat()
+            }, f)
+        os.replace(temp_path, self.checkpoint_path)
+        self._last_checkpoint = time.monotonic()
+
+    def _open(self, resume: bool):
+        """파일 열기 (resume이면 체크포인트 위치부터)"""
+        self._file = open(self.path, 'rb')
+        stat = os.fstat(self._file.fileno())
+        self.inode = stat.st_ino
+        self.offset = 0
+        self.line_number = 0
+
+        if resume:
+            checkpoint = self._load_checkpoint()
+            if checkpoint and checkpoint.get('inode') == stat.st_ino \
+                    and checkpoint.get('offset', 0) <= stat.st_size:
+                self.offset = checkpoint['offset']
+                self.line_number = checkpoint.get('line_number', 0)
+                logger.info(f"체크포인트에서 재개: {self.path} - 오프셋 {self.offset}")
+            elif checkpoint:
+                logger.warning(f"체크포인트 이후 파일이 교체되어 처음부터 읽습니다: {self.path}")
+            elif self.from_end:
+                self.offset = stat.st_size
+        self._file.seek(self.offset)
+
+    def _rotation(self) -> Optional[str]:
+        """로테이션 감지 ('replaced', 'truncated' 또는 None)"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            # 이동 후 새 파일이 아직 생성되지 않음
+            return None
+        if stat.st_ino != self.inode:
+            return 'replaced'
+        if stat.st_size < self.offset:
+            return 'truncated'
+        return None
+
+    def _setup_watch(self):
+        """inotify 사용 가능 시 디렉토리 감시 등록 (inotify_simple 패키지, 선택사항)"""
+        try:
+            from inotify_simple import INotify, flags
+        except ImportError:
+            return
+        try:
+            self._inotify = INotify()
+            self._inotify.add_watch(os.path.dirname(os.path.abspath(self.path)),
+                                    flags.MODIFY | flags.CREATE | flags.MOVED_TO)
+        except OSError as e:
+            logger.warning(f"inotify 사용 불가, 폴링으로 대체합니다: {e}")
+            self._inotify = None
+
+    def _wait(self):
+        """새 데이터가 생길 때까지 최대 poll_interval 동안 대기"""
+        if self._inotify is not None:
+            self._inotify.read(timeout=int(self.poll_interval * 1000))
+        else:
+            time.sleep(self.poll_interval)
+
+    def lines(self, on_idle: Optional[Callable[[], None]] = None,
+              stop_event: Optional[threading.Event] = None) -> Iterator[Tuple[str, int]]:
+        """
+        새 줄을 (줄 내용, 줄 번호)로 계속 yield
+
+        완성되지 않은 마지막 줄은 줄바꿈이 쓰일 때까지 보류합니다.
+        체크포인트는 소비자가 다음 줄을 요청할 때(이전 줄 처리 완료 후) 기록됩니다.
+
+        Args:
+            on_idle: 새 데이터가 없을 때마다 호출할 함수 (윈도우 마감 등)
+            stop_event: 설정되면 팔로우 종료
+        """
+        self._open(resume=True)
+        self._setup_watch()
+        try:
+            while stop_event is None or not stop_event.is_set():
+                line = self._file.readline()
+                if line.endswith(b'\n'):
+                    self.offset += len(line)
+                    self.line_number += 1
+                    yield line.decode('utf-8', errors='replace').rstrip('\r\n'), self.line_number
+                    if time.monotonic() - self._last_checkpoint >= self.checkpoint_interval:
+                        self.save_checkpoint()
+                    continue
+
+                # 파일 끝: 쓰다 만 줄은 되돌리고 로테이션 확인 후 대기
+                rotation = self._rotation()
+                if rotation == 'replaced':
+                    if line:
+                        # 교체 전 파일의 줄바꿈 없는 마지막 줄
+                        self.line_number += 1
+                        yield line.decode('utf-8', errors='replace').rstrip('\r'), self.line_number
+                    logger.info(f"로그 파일 교체 감지, 새 파일을 처음부터 읽습니다: {self.path}")
+                    self._file.close()
+                    self._open(resume=False)
+                    self.save_checkpoint()
+                    continue
+                if rotation == 'truncated':
+                    logger.info(f"로그 파일 잘라내기 감지, 처음부터 읽습니다: {self.path}")
+                    self.offset = 0
+                    self.line_number = 0
+                    self._file.seek(0)
+                    self.save_checkpoint()
+                    continue
+
+                self._file.seek(self.offset)
+                if time.monotonic() - self._last_checkpoint >= self.checkpoint_interval:
+                    self.save_checkpoint()
+                if on_idle is not None:
+                    on_idle()
+                self._wait()
+        finally:
+            self.save_checkpoint()
+            self.close()
+
+    def close(self):
+        """파일 및 감시 닫기"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
@@ -0,0 +1,204 @@
+"""
+로그 템플릿 마이닝 도구
+Drain 방식의 고정 깊이 파스 트리로 로그 메시지를 가변 슬롯(<*>)을 가진 템플릿으로 묶고,
+템플릿별 건수, 레벨 분포, 예시 ID, 슬롯별 상위 값을 한 번의 스트리밍 순회로 집계합니다.
+"""
+
+import re
+import logging
+from collections import Counter, OrderedDict
+from typing import Dict, List, Any, Iterable, Optional, Pattern, Tuple
+
+from .stream_aggregator import SpaceSavingSketch
+
+logger = logging.getLogger(__name__)
+
+WILDCARD = '<*>'
+
+# 토큰화 전에 <*>로 치환할 값 (주문/메시지 ID, 숫자)
+DEFAULT_MASKS = [
+    re.compile(r'\b[A-Z]+_\d+(?:_\d+)*\b'),
+    re.compile(r'(?<![\w.])[-+]?\d+(?:[.,:]\d+)*(?![\w.])')
+]
+
+
+class LogCluster:
+    """템플릿 하나의 누적값"""
+
+    def __init__(self, cluster_id: int, tokens: List[str], max_examples: int, max_slot_values: int):
+        self.cluster_id = cluster_id
+        self.tokens = list(tokens)
+        self.count = 0
+        self.levels: Counter = Counter()
+        self.examples: List[Any] = []
+        self.max_examples = max_examples
+        self.max_slot_values = max_slot_values
+        # 슬롯 위치 -> 관측 값 스케치 (마스킹된 ID/숫자는 제외)
+        self.slot_values: Dict[int, SpaceSavingSketch] = {}
+
+    @property
+    def template(self) -> str:
+        return ' '.join(self.tokens)
+
+    def similarity(self, tokens: List[str]) -> Tuple[float, int]:
+        """(일치 비율, 와일드카드 수) - 와일드카드 위치는 일치로 보지 않음"""
+        matched = 0
+        wildcards = 0
+        for template_token, token in zip(self.tokens, tokens):
+            if template_token == WILDCARD:
+                wildcards += 1
+            elif template_token == token:
+                matched += 1
+        return matched / len(tokens), wildcards
+
+    def add(self, tokens: List[str], level: Optional[str], example_id: Any):
+        """메시지 하나 반영 (다른 위치는 슬롯으로 일반화)"""
+        for i, (template_token, token) in enumerate(zip(self.tokens, tokens)):
+            if template_token != WILDCARD and template_token != token:
+                self.tokens[i] = WILDCARD
+                template_token = WILDCARD
+            if template_token == WILDCARD and token != WILDCARD:
+                sketch = self.slot_values.get(i)
+                if sketch is None:
+                    sketch = self.slot_values[i] = SpaceSavingSketch(self.max_slot_values)
+                sketch.update(token)
+
+        self.count += 1
+        if level:
+            self.levels[level] += 1
+        if example_id is not None and len(self.examples) < self.max_examples:
+            self.examples.append(example_id)
+
+    def to_dict(self, top_values: int = 5) -> Dict[str, Any]:
+        """결과 형식으로 변환"""
+        return {
+            'cluster_id': self.cluster_id,
+            'template': self.template,
+            'count': self.count,
+            'levels': dict(self.levels),
+            'examples': self.examples,
+            'slot_values': {
+                str(position): sketch.most_common(top_values)
+                for position, sketch in sorted(self.slot_values.items())
+                if self.tokens[position] == WILDCARD
+            }
+        }
+
+
+class LogTemplateMiner:
+    """Drain 방식 로그 템플릿 마이너 클래스"""
+
+    def __init__(self, depth: int = 4, sim_threshold: float = 0.5, max_children: int = 100,
+                 max_clusters: int = 1000, max_examples: int = 3, max_slot_values: int = 20,
+                 masks: Optional[List[Pattern]] = None):
+        """
+        초기화
+
+        Args:
+            depth: 파스 트리 깊이 (길이 노드 + 앞쪽 depth-2개 토큰으로 분기)
+            sim_threshold: 기존 템플릿에 합칠 최소 토큰 일치 비율
+            max_children: 노드당 최대 자식 수 (초과 시 <*> 자식으로 보냄)
+            max_clusters: 유지할 최대 템플릿 수 (초과 시 가장 오래 쓰이지 않은 템플릿 제거)
+            max_examples: 템플릿별 보관할 예시 ID 수
+            max_slot_values: 슬롯별 값 스케치 크기
+            masks: 토큰화 전 <*>로 치환할 정규식 목록 (기본: DEFAULT_MASKS)
+        """
+        if depth < 3:
+            raise ValueError("depth는 3 이상이어야 합니다")
+        self.depth = depth
+        self.sim_threshold = sim_threshold
+        self.max_children = max_children
+        self.max_clusters = max_clusters
+        self.max_examples = max_examples
+        self.max_slot_values = max_slot_values
+        self.masks = DEFAULT_MASKS if masks is None else masks
+
+        self.root: Dict[Any, Any] = {}
+        # 최근 사용 순서 유지 (LRU 제거용), 값은 (템플릿, 소속 리프)
+        self.clusters: 'OrderedDict[int, Tuple[LogCluster, List[LogCluster]]]' = OrderedDict()
+        self.total_lines = 0
+        self.evicted_clusters = 0
+        self._next_id = 1
+
+    def tokenize(self, message: str) -> List[str]:
+        """마스킹 후 공백 기준 토큰화"""
+        for mask in self.masks:
+            message = mask.sub(WILDCARD, message)
+        return message.split()
+
+    def _leaf(self, tokens: List[str]) -> List[LogCluster]:
+        """토큰 수와 앞쪽 토큰으로 트리를 내려가 리프(템플릿 목록) 반환 (없으면 생성)"""
+        node = self.root.setdefault(len(tokens), {})
+        for token in tokens[:self.depth - 2]:
+            # 숫자가 섞인 토큰은 값일 가능성이 높으므로 와일드카드 분기로 보냄
+            key = WILDCARD if any(char.isdigit() for char in token) else token
+            if key not in node and len(node) >= self.max_children:
+                key = WILDCARD
+            node = node.setdefault(key, {})
+        return node.setdefault(None, [])
+
+    def add(self, message: str, example_id: Any = None, level: Optional[str] = None) -> LogCluster:
+        """
+        메시지 하나를 템플릿에 반영
+
+        Returns:
+            메시지가 속한 템플릿
+        """
+        self.total_lines += 1
+        tokens = self.tokenize(message or '')
+        if not tokens:
+            tokens = ['']
+        leaf = self._leaf(tokens)
+
+        best, best_key = None, None
+        for cluster in leaf:
+            key = cluster.similarity(tokens)
+            if best_key is None or key > best_key:
+                best, best_key = cluster, key
+
+        if best is None or best_key[0] < self.sim_threshold:
+            best = LogCluster(self._next_id, tokens, self.max_examples, self.max_slot_values)
+            self._next_id += 1
+            leaf.append(best)
+            self.clusters[best.cluster_id] = (best, leaf)
+            if len(self.clusters) > self.max_clusters:
+                _, (evicted, evicted_leaf) = self.clusters.popitem(last=False)
+                evicted_leaf.remove(evicted)
+                self.evicted_clusters += 1
+        else:
+            self.clusters.move_to_end(best.cluster_id)
+
+        best.add(tokens, level, example_id)
+        return best
+
+    def process(self, entries: Iterable[Dict[str, Any]], message_key: str = 'message',
+                id_key: str = 'line_number') -> 'LogTemplateMiner':
+        """파싱된 로그 항목 스트림을 한 번 순회하며 반영"""
+        for entry in entries:
+            self.add(entry.get(message_key, ''), entry.get(id_key), entry.get('level'))
+        return self
+
+    def templates(self, top_n: Optional[int] = None, levels: Optional[Iterable[str]] = None,
+                  top_values: int = 5) -> List[Dict[str, Any]]:
+        """
+        건수 상위 템플릿 목록
+
+        Args:
+            top_n: 반환할 템플릿 수 (없으면 전체)
+            levels: 이 레벨이 포함된 템플릿만 (예: ('ERROR', 'CRITICAL')), 건수도 해당 레벨 기준
+            top_values: 슬롯별 반환할 상위 값 수
+        """
+        results = []
+        for cluster, _ in self.clusters.values():
+            if levels is None:
+                count = cluster.count
+            else:
+                count = sum(cluster.levels[level] for level in levels)
+                if not count:
+                    continue
+            results.append((count, cluster))
+
+        results.sort(key=lambda item: (-item[0], item[1].cluster_id))
+        if top_n is not None:
+            results = results[:top_n]
+        return [dict(cluster.to_dict(top_values), count=count) for count, cluster in results]
@@ -0,0 +1,128 @@
+"""
+파이프라인 실행 도구
+단계별 소요 시간 측정과 백그라운드 I/O 스레드(리포트/시각화 파일 쓰기)를 제공합니다.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StageTimer:
+    """단계별 소요 시간 기록 클래스 (스레드 안전)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.timings: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str):
+        """with 블록의 소요 시간을 name으로 기록"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float):
+        """다른 스레드/프로세스에서 측정한 소요 시간 기록"""
+        with self._lock:
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def report(self) -> List[str]:
+        """단계별 소요 시간과 전체 경과 시간 요약"""
+        wall = time.perf_counter() - self.started
+        total = sum(self.timings.values())
+        lines = [f"- {name}: {seconds:.2f}초" for name, seconds in self.timings.items()]
+        lines.append(f"- 단계 합계: {total:.2f}초 / 실제 경과: {wall:.2f}초")
+        return lines
+
+
+class BackgroundWriter:
+    """
+    백그라운드 I/O 스레드
+
+    리포트/추출 결과 쓰기를 단일 스레드에 맡겨 계산 단계와 겹쳐 실행합니다.
+    쓰기 순서는 제출 순서와 같으며, close()에서 남은 작업을 모두 기다립니다.
+    """
+
+    def __init__(self, timer: Optional[StageTimer] = None):
+        """
+        초기화
+
+        Args:
+            timer: 쓰기 시간을 'I/O (백그라운드)'로 누적할 StageTimer
+        """
+        self.timer = timer
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='report-io')
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """임의 작업을 I/O 스레드에 제출 (예외는 로그로 남김)"""
+        def run():
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"백그라운드 작업 실패: {getattr(func, '__name__', func)} - {e}")
+            finally:
+                if self.timer is not None:
+                    self.timer.record('I/O (백그라운드)', time.perf_counter() - start)
+
+        return self._executor.submit(run)
+
+    def write_json(self, path: str, data: Any, indent: Optional[int] = 2) -> Future:
+        """JSON 파일 쓰기 제출"""
+        return self.submit(write_json, path, data, indent)
+
+    def write_text(self, path: str, text: str) -> Future:
+        """텍스트 파일 쓰기 제출"""
+        return self.submit(write_text, path, text)
+
+    def close(self):
+        """제출된 작업이 모두 끝날 때까지 대기 후 스레드 종료"""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> 'BackgroundWriter':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_json(path: str, data: Any, indent: Optional[int] = 2):
+    """
+    JSON 파일 쓰기
+
+    json.dump는 항상 순수 Python 인코더를 쓰므로 json.dumps로 한 번에 직렬화합니다
+    (indent=None이면 C 인코더 사용).
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    text = json.dumps(data, ensure_ascii=False, indent=indent, default=str)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def write_text(path: str, text: str):
+    """텍스트 파일 쓰기"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def run_timed(func: Callable, *args, **kwargs):
+    """함수 실행 결과와 소요 시간(초)을 함께 반환 (다른 프로세스에서 실행한 단계의 시간 측정용)"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
@@ -7,15 +7,18 @@
 import os
 import sys
 import json
+import time
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import logging
 
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from data_extraction.data_extractor import DataExtractor
+from data_extraction.data_extractor import DATA_FILES, DataExtractor
 from data_extraction.text_analyzer import TextAnalyzer
+from data_extraction.pipeline import BackgroundWriter, StageTimer, run_timed, write_json, write_text
 
 # 로깅 설정
 logging.basicConfig(
@@ -28,6 +31,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 분석 단계별 입력 파일
+MESSAGE_FILES = [
+    '배달의민족_메시지_데이터_25000건.json',
+    '배달의민족_JSON_데이터_25000건.json'
+]
+LOG_FILE = '배달의민족_로그_데이터_25000건.log'
+
 
 def setup_environment():
     """환경 설정"""
@@ -39,94 +49,112 @@ def setup_environment():
     logger.info("환경 설정 완료")
 
 
-def run_data_extraction():
-    """데이터 추출 실행"""
+def run_data_extraction(writer=None, on_extracted=None):
+    """
+    데이터 추출 실행
+    
+    분석 단계의 입력(메시지/로그 파일)을 먼저 추출하므로, on_extracted에서 분석을 바로 시작하면
+    나머지 파일(CSV, XML, pickle) 추출과 분석이 겹쳐 실행됩니다.
+    
+    Args:
+        writer: 추출 결과 파일 쓰기를 맡길 BackgroundWriter (없으면 바로 저장)
+        on_extracted: 파일 하나의 추출이 끝날 때마다 (파일명, 결과)로 호출할 함수
+    """
     logger.info("데이터 추출 시작")
     
     # DataExtractor 초기화
     extractor = DataExtractor()
     
     # Redis 설정 (선택사항)
-    try:
-        extractor.setup_redis()
-        logger.info("Redis 연결 성공")
-    except Exception as e:
-        logger.warning(f"Redis 연결 실패: {e}")
+    extractor.setup_redis()
     
-    # 모든 데이터 추출
-    results = extractor.extract_all_data()
+    # 모든 데이터 추출 (분석 입력 파일 먼저)
+    analysis_inputs = set(MESSAGE_FILES + [LOG_FILE])
+    files = sorted(DATA_FILES, key=lambda item: item[0] not in analysis_inputs)
+    results = extractor.extract_all_data(writer, files=files, on_extracted=on_extracted)
     
     # 요약 리포트 생성
     summary = extractor.generate_summary_report(results)
     
     # 요약 리포트 저장
-    extractor.save_to_file(summary, "extraction_summary.json")
+    if writer is not None:
+        writer.submit(extractor.save_to_file, summary, "extraction_summary.json")
+    else:
+        extractor.save_to_file(summary, "extraction_summary.json")
     
     logger.info("데이터 추출 완료")
     return results, summary
 
 
-def run_text_analysis(results):
-    """텍스트 분석 실행"""
-    logger.info("텍스트 분석 시작")
+def run_text_analysis(message_files=MESSAGE_FILES, workers=1, writer=None):
+    """
+    텍스트 분석 실행
     
-    # TextAnalyzer 초기화
-    analyzer = TextAnalyzer(language='korean')
+    메시지 파일을 JSON 리더에서 바로 스트리밍해 메시지 단위로 평탄화하므로
+    파일 전체나 중간 리스트를 메모리에 올리지 않습니다.
     
-    # 메시지 데이터 분석
-    message_files = [
-        '배달의민족_메시지_데이터_25000건.json',
-        '배달의민족_JSON_데이터_25000건.json'
-    ]
+    Args:
+        message_files: data/ 아래 메시지 JSON 파일명 목록
+        workers: 분석 워커 프로세스 수 (1이면 현재 프로세스, 0이면 CPU 코어 수)
+        writer: 리포트/워드클라우드 쓰기를 맡길 BackgroundWriter (없으면 이 함수 안에서 만들고 닫음)
+    """
+    logger.info("텍스트 분석 시작")
     
-    all_texts = []
-    all_messages = []
+    if writer is None:
+        with BackgroundWriter() as writer:
+            return run_text_analysis(message_files, workers, writer)
     
-    for filename in message_files:
-        if filename in results and 'data' in results[filename]:
-            data = results[filename]['data']
-            
-            # 텍스트 추출
-            if isinstance(data, list):
-                for item in data:
-                    if isinstance(item, dict):
-                        text = item.get('text', item.get('message', ''))
-                        if text:
-                            all_texts.append(text)
-                            all_messages.append(item)
-    
-    if all_texts:
+    # TextAnalyzer 초기화
+    analyzer = TextAnalyzer(language='korean')
+    extractor = DataExtractor()
+
+    def message_stream():
+        """파일별 메시지 레코드를 한 건씩 평탄화하여 공급"""
+        for filename in message_files:
+            if not os.path.exists(os.path.join(extractor.data_dir, filename)):
+                logger.warning(f"메시지 파일 없음: {filename}")
+                continue
+            yield from extractor.stream_message_records(filename)
+
+    # 메시지 패턴 분석 (키워드 빈도까지 한 번의 순회로 계산)
+    if workers == 1:
+        aggregator = analyzer.aggregate_message_patterns(message_stream())
+    else:
+        # conversation_id 기준 샤딩 후 워커별 누적 결과를 병합
+        aggregator = analyzer.aggregate_message_patterns_sharded(message_stream(), workers=workers or None)
+    message_analysis = aggregator.to_dict()
+
+    if message_analysis['total_messages']:
         # 키워드 추출
-        keywords = analyzer.extract_keywords(all_texts, top_n=50)
+        keywords = aggregator.keywords.most_common(50)
         
-        # 메시지 패턴 분석
-        message_analysis = analyzer.analyze_message_patterns(all_messages)
+        # 워드클라우드 생성 (I/O 스레드에서 리포트 작성과 겹쳐 실행)
+        def render_wordcloud(frequencies):
+            try:
+                analyzer.generate_wordcloud(
+                    output_path='visualizations/wordcloud.png',
+                    frequencies=frequencies,
+                    cache_dir='visualizations/.cache'
+                )
+                logger.info("워드클라우드 생성 완료")
+            except Exception as e:
+                logger.warning(f"워드클라우드 생성 실패: {e}")
         
-        # 워드클라우드 생성
-        try:
-            wordcloud = analyzer.generate_wordcloud(
-                all_texts, 
-                'visualizations/wordcloud.png'
-            )
-            logger.info("워드클라우드 생성 완료")
-        except Exception as e:
-            logger.warning(f"워드클라우드 생성 실패: {e}")
+        writer.submit(render_wordcloud, aggregator.keywords.most_common(100))
         
         # 분석 결과 저장
         analysis_results = {
             'keywords': keywords,
             'message_analysis': message_analysis,
-            'total_texts': len(all_texts),
+            'total_texts': message_analysis['total_messages'],
             'analysis_time': datetime.now().isoformat()
         }
         
-        with open('reports/text_analysis.json', 'w', encoding='utf-8') as f:
-            json.dump(analysis_results, f, ensure_ascii=False, indent=2, default=str)
+        writer.write_json('reports/text_analysis.json', analysis_results)
         
         # 리포트 생성
         report = analyzer.generate_report(message_analysis)
-        with open('reports/text_analysis_report.txt', 'w', encoding='utf-8') as f:
-            f.write(report)
+        writer.write_text('reports/text_analysis_report.txt', report)
         
         logger.info("텍스트 분석 완료")
         return analysis_results
@@ -134,56 +162,169 @@ def run_text_analysis(results):
     return None
 
 
-def run_log_analysis(results):
-    """로그 데이터 분석"""
+def run_log_analysis(log_file=LOG_FILE, window_path='reports/log_windows.jsonl', writer=None):
+    """
+    로그 데이터 분석
+    
+    로그 파일을 한 줄씩 파싱해 소비하며 분/시간 단위 윈도우를 집계하고,
+    닫힌 윈도우는 window_path에 JSON Lines로 바로 기록합니다.
+    
+    Args:
+        log_file: data/ 아래 로그 파일명
+        writer: 분석 결과 쓰기를 맡길 BackgroundWriter (없으면 바로 저장)
+    """
+    from data_extraction.log_analytics import LogAnalytics
+    from data_extraction.log_templates import LogTemplateMiner
+    
     logger.info("로그 분석 시작")
     
-    log_file = '배달의민족_로그_데이터_25000건.log'
-    if log_file in results and 'data' in results[log_file]:
-        log_data = results[log_file]['data']
+    extractor = DataExtractor()
+    if not os.path.exists(os.path.join(extractor.data_dir, log_file)):
+        logger.warning(f"로그 파일 없음: {log_file}")
+        return None
+    entries = extractor.stream_log_data(log_file)
+    
+    # 윈도우 집계와 템플릿 마이닝을 한 번의 순회로 처리
+    analytics = LogAnalytics(template_miner=LogTemplateMiner())
+    with open(window_path, 'w', encoding='utf-8') as f:
+        for window in analytics.process(entries):
+            f.write(json.dumps(window, ensure_ascii=False) + '\n')
+    
+    if not analytics.total_logs:
+        return None
+    
+    log_analysis = analytics.summary()
+    
+    # 분석 결과 저장
+    if writer is not None:
+        writer.write_json('reports/log_analysis.json', log_analysis)
+    else:
+        write_json('reports/log_analysis.json', log_analysis)
+    
+    logger.info("로그 분석 완료")
+    return log_analysis
+
+
+def run_log_follow(log_file=LOG_FILE,
+                   checkpoint_path='extracted_data/log_follow_checkpoint.json',
+                   window_path='reports/log_windows_live.jsonl', poll_interval=0.5,
+                   from_end=False, alert_error_rate=0.5, alert_min_count=20,
+                   lateness_seconds=5):
+    """
+    로그 파일을 팔로우하며 실시간 윈도우 분석
+    
+    닫힌 윈도우는 window_path에 바로 기록하고, 진행 중인 분 단위 윈도우의 에러율이
+    alert_error_rate 이상이면 윈도우가 닫히기 전에 경고합니다. Ctrl+C로 종료합니다.
+    """
+    from data_extraction.log_analytics import LogAnalytics, local_epoch
+    from data_extraction.log_templates import LogTemplateMiner
+    
+    logger.info(f"로그 팔로우 시작: {log_file}")
+    
+    extractor = DataExtractor()
+    analytics = LogAnalytics(lateness_seconds=lateness_seconds, template_miner=LogTemplateMiner())
+    alerted = set()
+    last_check = 0.0
+    
+    with open(window_path, 'a', encoding='utf-8') as f:
+        def emit(windows):
+            for window in windows:
+                f.write(json.dumps(window, ensure_ascii=False) + '\n')
+            if windows:
+                f.flush()
         
-        # 로그 레벨별 분석
-        level_counts = {}
-        time_patterns = {}
-        error_messages = []
+        def check_alerts():
+            # 진행 중인 분 윈도우의 에러율 급증 확인 (윈도우당 한 번만 경고)
+            for window in analytics.open_windows('minute'):
+                if (window['count'] >= alert_min_count and window['error_rate'] >= alert_error_rate
+                        and window['start'] not in alerted):
+                    alerted.add(window['start'])
+                    logger.warning(f"에러율 급증: {window['start']} - {window['error_rate']:.1%} "
+                                   f"({window['error_count']}/{window['count']}) {window['error_codes']}")
         
-        for log_entry in log_data:
-            level = log_entry.get('level', 'UNKNOWN')
-            level_counts[level] = level_counts.get(level, 0) + 1
-            
-            # 시간 패턴 분석
-            timestamp = log_entry.get('timestamp')
-            if timestamp:
-                try:
-                    hour = datetime.fromisoformat(timestamp.replace('Z', '+00:00')).hour
-                    time_patterns[hour] = time_patterns.get(hour, 0) + 1
-                except:
-                    pass
-            
-            # 에러 메시지 수집
-            if level in ['ERROR', 'CRITICAL']:
-                error_messages.append(log_entry.get('message', ''))
+        def on_idle():
+            emit(analytics.advance(local_epoch()))
+            check_alerts()
         
-        log_analysis = {
-            'total_logs': len(log_data),
-            'level_distribution': level_counts,
-            'time_patterns': time_patterns,
-            'error_count': len(error_messages),
-            'top_errors': error_messages[:10]
-        }
+        try:
+            for entry in extractor.extract_log_data(log_file, follow=True,
+                                                    checkpoint_path=checkpoint_path,
+                                                    poll_interval=poll_interval,
+                                                    from_end=from_end, on_idle=on_idle):
+                emit(analytics.update(entry))
+                now = time.monotonic()
+                if now - last_check >= poll_interval:
+                    last_check = now
+                    check_alerts()
+        except KeyboardInterrupt:
+            logger.info("로그 팔로우 종료")
+        finally:
+            emit(analytics.flush())
+    
+    summary = analytics.summary()
+    with open('reports/log_analysis_live.json', 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2, default=str)
+    return summary
+
+
+def run_search_indexing(index_dir='search_index'):
+    """추출된 메시지와 로그로 전문 검색 인덱스 생성"""
+    from data_extraction.search_index import SearchIndexWriter, SearchTokenizer
+    
+    logger.info("검색 인덱스 생성 시작")
+    
+    analyzer = TextAnalyzer(language='korean')
+    extractor = DataExtractor()
+    writer = SearchIndexWriter(SearchTokenizer(analyzer))
+    
+    log_files = [LOG_FILE]
+    
+    for filename in MESSAGE_FILES + log_files:
+        if not os.path.exists(os.path.join(extractor.data_dir, filename)):
+            logger.warning(f"색인할 파일 없음: {filename}")
+            continue
         
-        # 분석 결과 저장
-        with open('reports/log_analysis.json', 'w', encoding='utf-8') as f:
-            json.dump(log_analysis, f, ensure_ascii=False, indent=2, default=str)
+        if filename in log_files:
+            documents = ({'source': filename, 'line_number': entry['line_number'],
+                          'timestamp': entry['timestamp'], 'level': entry['level'],
+                          'text': entry['message']}
+                         for entry in extractor.stream_log_data(filename))
+        else:
+            documents = (dict(record, source=filename)
+                         for record in extractor.stream_message_records(filename))
         
-        logger.info("로그 분석 완료")
-        return log_analysis
+        count = writer.add_many(documents)
+        logger.info(f"색인 완료: {filename} - {count}개 문서")
     
-    return None
+    writer.write(index_dir)
+    logger.info("검색 인덱스 생성 완료")
+    return writer.num_docs
+
+
+def run_search(query, index_dir='search_index', limit=20):
+    """검색 인덱스에서 질의 실행 후 결과 출력"""
+    from data_extraction.search_index import SearchIndex, SearchTokenizer
+    
+    analyzer = TextAnalyzer(language='korean')
+    with SearchIndex(index_dir, SearchTokenizer(analyzer)) as index:
+        start = time.perf_counter()
+        try:
+            result = index.search(query, limit=limit)
+        except ValueError as e:
+            # 괄호 짝이 맞지 않거나 피연산자가 없는 검색어
+            print(f"❌ {e}", file=sys.stderr)
+            sys.exit(1)
+        elapsed = (time.perf_counter() - start) * 1000
+    
+    print(f"🔍 '{query}': {result['total']:,}건 ({elapsed:.1f}ms)")
+    for hit in result['hits']:
+        location = hit.get('message_id') or f"line {hit.get('line_number')}"
+        print(f"- [{hit.get('source')} / {location}] {hit['text']}")
+    return result
 
 
-def generate_final_report(results, summary, text_analysis=None, log_analysis=None):
-    """최종 리포트 생성"""
+def generate_final_report(results, summary, text_analysis=None, log_analysis=None, writer=None):
+    """최종 리포트 생성 (writer가 있으면 파일 쓰기는 I/O 스레드에서 실행)"""
     logger.info("최종 리포트 생성")
     
     report = {
@@ -209,8 +350,10 @@ def generate_final_report(results, summary, text_analysis=None, log_analysis=Non
                 }
     
     # 리포트 저장
-    with open('reports/final_report.json', 'w', encoding='utf-8') as f:
-        json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+    if writer is not None:
+        writer.write_json('reports/final_report.json', report)
+    else:
+        write_json('reports/final_report.json', report)
     
     # 텍스트 리포트 생성
     text_report = []
@@ -252,6 +395,14 @@ def generate_final_report(results, summary, text_analysis=None, log_analysis=Non
         text_report.append("- 로그 레벨 분포:")
         for level, count in log_analysis['level_distribution'].items():
             text_report.append(f"  * {level}: {count:,}개")
+        if log_analysis.get('log_templates'):
+            text_report.append("- 주요 에러 템플릿:")
+            for template in log_analysis['top_errors'][:5]:
+                text_report.append(f"  * {template['template']}: {template['count']:,}개")
+        if log_analysis.get('error_codes'):
+            text_report.append("- 에러 코드 분포:")
+            for code, count in log_analysis['error_codes'].items():
+                text_report.append(f"  * {code}: {count:,}개")
     text_report.append("")
     
     text_report.append("🎯 다음 단계")
@@ -264,8 +415,10 @@ def generate_final_report(results, summary, text_analysis=None, log_analysis=Non
     
     text_report.append("=" * 60)
     
-    with open('reports/final_report.txt', 'w', encoding='utf-8') as f:
-        f.write('\n'.join(text_report))
+    if writer is not None:
+        writer.write_text('reports/final_report.txt', '\n'.join(text_report))
+    else:
+        write_text('reports/final_report.txt', '\n'.join(text_report))
     
     logger.info("최종 리포트 생성 완료")
 
@@ -281,28 +434,100 @@ def main():
                        help='Redis 호스트')
     parser.add_argument('--redis-port', type=int, default=6379, 
                        help='Redis 포트')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='텍스트 분석 워커 프로세스 수 (0이면 CPU 코어 수)')
+    
+    # 하위 명령 (지정하지 않으면 전체 추출/분석 실행)
+    subparsers = parser.add_subparsers(dest='command')
+    index_parser = subparsers.add_parser('index', help='메시지/로그 전문 검색 인덱스 생성')
+    index_parser.add_argument('--index-dir', default='search_index',
+                              help='인덱스 저장 디렉토리')
+    follow_parser = subparsers.add_parser('follow', help='로그 파일을 팔로우하며 실시간 분석')
+    follow_parser.add_argument('--log-file', default=LOG_FILE,
+                               help='data/ 아래 로그 파일명')
+    follow_parser.add_argument('--checkpoint', default='extracted_data/log_follow_checkpoint.json',
+                               help='오프셋 체크포인트 파일')
+    follow_parser.add_argument('--poll-interval', type=float, default=0.5,
+                               help='새 데이터 대기 간격(초)')
+    follow_parser.add_argument('--from-end', action='store_true',
+                               help='체크포인트가 없으면 파일 끝부터 읽기')
+    follow_parser.add_argument('--alert-error-rate', type=float, default=0.5,
+                               help='경고할 분당 에러율')
+    search_parser = subparsers.add_parser(
+        'search', help='검색 인덱스에서 질의 실행',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="예시:\n"
+               "  search '맘스터치 AND CARD_DECLINED'\n"
+               "  search '\"배달이 완료\" -강남구' --limit 50\n"
+               "  search '(치킨 OR 피자) NOT 취소'\n"
+               "잘못된 검색어 (오류 메시지 출력 후 종료 코드 1):\n"
+               "  search '('    # 닫는 괄호 없음\n"
+               "  search NOT    # 피연산자 없음"
+    )
+    search_parser.add_argument('query',
+                               help='검색어 (AND/OR/NOT, -제외어, "구문" 지원)')
+    search_parser.add_argument('--index-dir', default='search_index',
+                               help='인덱스 디렉토리')
+    search_parser.add_argument('--limit', type=int, default=20,
+                               help='출력할 결과 수')
     
     args = parser.parse_args()
     
+    if args.command == 'index':
+        run_search_indexing(args.index_dir)
+        return
+    if args.command == 'follow':
+        setup_environment()
+        run_log_follow(args.log_file, args.checkpoint, poll_interval=args.poll_interval,
+                       from_end=args.from_end, alert_error_rate=args.alert_error_rate)
+        return
+    if args.command == 'search':
+        run_search(args.query, args.index_dir, args.limit)
+        return
+    
+    timer = StageTimer()
+    
     try:
         # 환경 설정
         setup_environment()
         
-        # 데이터 추출
-        results, summary = run_data_extraction()
-        
-        # 텍스트 분석
-        text_analysis = None
-        if not args.skip_text_analysis:
-            text_analysis = run_text_analysis(results)
-        
-        # 로그 분석
-        log_analysis = None
-        if not args.skip_log_analysis:
-            log_analysis = run_log_analysis(results)
-        
-        # 최종 리포트 생성
-        generate_final_report(results, summary, text_analysis, log_analysis)
+        with BackgroundWriter(timer) as writer:
+            # 텍스트 분석과 로그 분석은 입력 파일 추출이 끝나는 즉시 별도 프로세스에서 시작하고,
+            # 자식 프로세스는 파일명만 받아 원본을 직접 스트리밍
+            text_analysis = None
+            log_analysis = None
+            with ProcessPoolExecutor(max_workers=2) as pool:
+                futures = {}
+                pending_messages = set(MESSAGE_FILES)
+                
+                def on_extracted(filename, result):
+                    if filename in pending_messages:
+                        pending_messages.discard(filename)
+                        if not pending_messages and not args.skip_text_analysis:
+                            futures['텍스트 분석'] = pool.submit(run_timed, run_text_analysis, MESSAGE_FILES,
+                                                              workers=args.workers)
+                    elif filename == LOG_FILE and not args.skip_log_analysis:
+                        futures['로그 분석'] = pool.submit(run_timed, run_log_analysis, LOG_FILE)
+                
+                # 데이터 추출 (추출 결과 파일은 I/O 스레드에서 쓰면서 다음 파일 추출)
+                with timer.stage('데이터 추출'):
+                    results, summary = run_data_extraction(writer, on_extracted)
+                
+                for stage, future in futures.items():
+                    result, elapsed = future.result()
+                    timer.record(stage, elapsed)
+                    if stage == '텍스트 분석':
+                        text_analysis = result
+                    else:
+                        log_analysis = result
+            
+            # 최종 리포트 생성
+            with timer.stage('최종 리포트'):
+                generate_final_report(results, summary, text_analysis, log_analysis, writer)
+            
+            # 남은 파일 쓰기 대기
+            with timer.stage('I/O 대기'):
+                writer.close()
         
         print("\n" + "=" * 50)
         print("✅ 데이터 추출 및 분석 완료!")
@@ -315,6 +540,9 @@ def main():
         print("- 추출된 데이터: extracted_data/")
         print("- 분석 리포트: reports/")
         print("- 시각화: visualizations/")
+        print("\n⏱️ 단계별 소요 시간 (텍스트/로그 분석은 나머지 추출, I/O와 병렬 실행):")
+        for line in timer.report():
+            print(line)
         print("\n🚀 다음 단계: README.md의 Phase 2부터 진행하세요!")
         
     except Exception as e:
@@ -0,0 +1,412 @@
+"""
+전문 검색 인덱스
+추출된 메시지와 로그를 디스크 기반 역색인으로 저장하고
+불리언(AND/OR/NOT) 및 구문("...") 질의를 전체 스캔 없이 처리합니다.
+
+디렉토리 구성:
+    meta.json         문서 수, 포맷 버전
+    lexicon.json      단어 -> [오프셋, 문서 수, 위치 수, 자료형 코드 3개]
+    postings.bin      단어별 [문서 번호 차분 | 문서 내 빈도 | 위치] 배열
+    docs.jsonl        원본 문서 (필드 + 텍스트)
+    docs_offsets.npy  docs.jsonl 줄별 바이트 오프셋
+"""
+
+import os
+import re
+import json
+import mmap
+import logging
+from array import array
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+# 값 범위에 맞춰 가장 작은 자료형으로 저장 (코드 = 목록 인덱스)
+_DTYPES = [np.dtype(np.uint8), np.dtype(np.uint16), np.dtype(np.uint32), np.dtype(np.uint64)]
+
+# 한글 연속 구간은 문자 bigram, 그 외 단어 문자(영문/숫자/_) 연속 구간은 단어 단위로 색인
+_TOKEN_PATTERN = re.compile(r'[가-힣]+|[^\W가-힣]+')
+
+_QUERY_PATTERN = re.compile(r'"([^"]*)"|\(|\)|-(?=\S)|[^\s()"]+')
+
+
+def _encode(values: np.ndarray) -> Tuple[bytes, int]:
+    """정수 배열을 가장 작은 부호 없는 자료형으로 직렬화"""
+    peak = int(values.max()) if len(values) else 0
+    for code, dtype in enumerate(_DTYPES):
+        if peak <= np.iinfo(dtype).max:
+            return values.astype(dtype).tobytes(), code
+    raise ValueError("값이 uint64 범위를 벗어났습니다")
+
+
+class SearchTokenizer:
+    """
+    검색용 토크나이저
+
+    TextAnalyzer.preprocess_text로 정규화한 뒤 한글은 문자 bigram으로 나눕니다.
+    jieba 토큰화는 한글을 한 글자씩 분리하고 한 글자 토큰을 버리므로
+    이름/업체명 검색에 쓸 수 없기 때문입니다. 영문/숫자/식별자(CARD_DECLINED 등)는
+    대소문자 구분 없이 단어 단위로 색인합니다.
+    """
+
+    def __init__(self, analyzer=None):
+        """
+        초기화
+
+        Args:
+            analyzer: 전처리에 사용할 TextAnalyzer (색인과 검색에 같은 설정을 사용)
+        """
+        self.analyzer = analyzer
+
+    def tokenize(self, text: str) -> List[str]:
+        """텍스트를 색인 토큰 목록으로 변환 (목록 위치가 구문 검색 위치)"""
+        if not text:
+            return []
+        if self.analyzer is not None:
+            text = self.analyzer.preprocess_text(text)
+
+        tokens = []
+        for run in _TOKEN_PATTERN.findall(text):
+            if '가' <= run[0] <= '힣':
+                if len(run) == 1:
+                    tokens.append(run)
+                else:
+                    tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+            else:
+                tokens.append(run.lower())
+        return tokens
+
+
+class SearchIndexWriter:
+    """역색인 생성 클래스"""
+
+    def __init__(self, tokenizer: Optional[SearchTokenizer] = None):
+        """
+        초기화
+
+        Args:
+            tokenizer: 검색용 토크나이저 (기본: 전처리 없는 SearchTokenizer)
+        """
+        self.tokenizer = tokenizer or SearchTokenizer()
+        self.num_docs = 0
+        # 단어 -> (문서 번호, 문서 내 빈도, 위치) 배열
+        self._postings: Dict[str, Tuple[array, array, array]] = {}
+        self._docs: List[bytes] = []
+
+    def add(self, text: str, **fields) -> int:
+        """
+        문서 하나 추가
+
+        Args:
+            text: 색인할 텍스트
+            fields: 검색 결과에 함께 반환할 필드 (source, message_id 등)
+
+        Returns:
+            문서 번호
+        """
+        doc_id = self.num_docs
+        self.num_docs += 1
+
+        positions: Dict[str, List[int]] = {}
+        for position, token in enumerate(self.tokenizer.tokenize(text)):
+            positions.setdefault(token, []).append(position)
+
+        for token, token_positions in positions.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = (array('I'), array('I'), array('I'))
+            postings[0].append(doc_id)
+            postings[1].append(len(token_positions))
+            postings[2].extend(token_positions)
+
+        document = dict(fields, text=text)
+        self._docs.append(json.dumps(document, ensure_ascii=False, default=str).encode('utf-8'))
+        return doc_id
+
+    def add_many(self, documents: Iterable[Dict[str, Any]], text_key: str = 'text') -> int:
+        """문서 딕셔너리 여러 개 추가 (text_key 값을 색인)"""
+        count = 0
+        for document in documents:
+            fields = dict(document)
+            self.add(fields.pop(text_key, '') or '', **fields)
+            count += 1
+        return count
+
+    def write(self, index_dir: str):
+        """인덱스를 디렉토리에 저장"""
+        os.makedirs(index_dir, exist_ok=True)
+
+        lexicon = {}
+        offset = 0
+        with open(os.path.join(index_dir, 'postings.bin'), 'wb') as f:
+            for token in sorted(self._postings):
+                doc_ids, freqs, positions = self._postings[token]
+                doc_ids = np.frombuffer(doc_ids, dtype=np.uint32)
+                deltas = np.diff(doc_ids, prepend=np.uint32(0))
+
+                entry = [offset, len(doc_ids), len(positions)]
+                for values in (deltas, np.frombuffer(freqs, dtype=np.uint32),
+                               np.frombuffer(positions, dtype=np.uint32)):
+                    data, code = _encode(values)
+                    f.write(data)
+                    offset += len(data)
+                    entry.append(code)
+                lexicon[token] = entry
+
+        with open(os.path.join(index_dir, 'lexicon.json'), 'w', encoding='utf-8') as f:
+            json.dump(lexicon, f, ensure_ascii=False)
+
+        offsets = np.zeros(len(self._docs), dtype=np.int64)
+        with open(os.path.join(index_dir, 'docs.jsonl'), 'wb') as f:
+            for i, document in enumerate(self._docs):
+                offsets[i] = f.tell()
+                f.write(document + b'\n')
+        np.save(os.path.join(index_dir, 'docs_offsets.npy'), offsets)
+
+        with open(os.path.join(index_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({'format_version': FORMAT_VERSION, 'num_docs': self.num_docs,
+                       'num_terms': len(lexicon)}, f)
+
+        logger.info(f"검색 인덱스 저장 완료: {index_dir} - 문서 {self.num_docs}개, 단어 {len(lexicon)}개")
+
+
+class SearchIndex:
+    """디스크 기반 역색인 검색 클래스"""
+
+    def __init__(self, index_dir: str, tokenizer: Optional[SearchTokenizer] = None):
+        """
+        인덱스 열기
+
+        Args:
+            index_dir: SearchIndexWriter.write로 만든 디렉토리
+            tokenizer: 색인 시 사용한 것과 같은 토크나이저
+        """
+        self.index_dir = index_dir
+        self.tokenizer = tokenizer or SearchTokenizer()
+
+        with open(os.path.join(index_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 인덱스 버전입니다: {meta.get('format_version')}")
+        self.num_docs = meta['num_docs']
+
+        with open(os.path.join(index_dir, 'lexicon.json'), 'r', encoding='utf-8') as f:
+            self.lexicon: Dict[str, List[int]] = json.load(f)
+        self.doc_offsets = np.load(os.path.join(index_dir, 'docs_offsets.npy'), mmap_mode='r')
+
+        # 포스팅은 필요한 구간만 메모리 매핑으로 읽음
+        self._postings_file = open(os.path.join(index_dir, 'postings.bin'), 'rb')
+        if os.path.getsize(self._postings_file.name) > 0:
+            self._postings = mmap.mmap(self._postings_file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._postings = b''
+        self._docs_file = open(os.path.join(index_dir, 'docs.jsonl'), 'rb')
+
+    def close(self):
+        """파일 닫기"""
+        if isinstance(self._postings, mmap.mmap):
+            self._postings.close()
+        self._postings_file.close()
+        self._docs_file.close()
+
+    def __enter__(self) -> 'SearchIndex':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _read_postings(self, token: str,
+                       with_positions: bool = False) -> Tuple[np.ndarray, ...]:
+        """단어의 문서 번호 (및 문서 내 빈도, 위치) 배열 복원"""
+        entry = self.lexicon.get(token)
+        if entry is None:
+            empty = np.array([], dtype=np.int64)
+            return (empty, empty, empty) if with_positions else (empty,)
+
+        offset, df, npos, doc_code, freq_code, pos_code = entry
+        doc_dtype, freq_dtype, pos_dtype = _DTYPES[doc_code], _DTYPES[freq_code], _DTYPES[pos_code]
+
+        deltas = np.frombuffer(self._postings, dtype=doc_dtype, count=df, offset=offset)
+        doc_ids = np.cumsum(deltas, dtype=np.int64)
+        if not with_positions:
+            return (doc_ids,)
+
+        offset += df * doc_dtype.itemsize
+        freqs = np.frombuffer(self._postings, dtype=freq_dtype, count=df, offset=offset)
+        offset += df * freq_dtype.itemsize
+        positions = np.frombuffer(self._postings, dtype=pos_dtype, count=npos, offset=offset)
+        return doc_ids, freqs.astype(np.int64), positions.astype(np.int64)
+
+    def _phrase(self, tokens: List[str]) -> np.ndarray:
+        """연속된 토큰 목록(구문)을 포함하는 문서 번호"""
+        if not tokens:
+            return np.array([], dtype=np.int64)
+        if len(tokens) == 1:
+            return self._read_postings(tokens[0])[0]
+
+        # 문서 빈도가 낮은 단어부터 교집합
+        order = sorted(set(tokens), key=lambda token: self.lexicon.get(token, [0, 0])[1])
+        candidates = self._read_postings(order[0])[0]
+        for token in order[1:]:
+            if len(candidates) == 0:
+                return candidates
+            candidates = np.intersect1d(candidates, self._read_postings(token)[0], assume_unique=True)
+        if len(candidates) == 0:
+            return candidates
+
+        # 후보 문서에서 (문서, 구문 시작 위치) 키가 모든 토큰에 공통인지 확인
+        starts = None
+        for i, token in enumerate(tokens):
+            doc_ids, freqs, positions = self._read_postings(token, with_positions=True)
+            entry_docs = np.repeat(doc_ids, freqs)
+            mask = np.isin(entry_docs, candidates) & (positions >= i)
+            keys = (entry_docs[mask] << 32) | (positions[mask] - i)
+            starts = keys if starts is None else np.intersect1d(starts, keys)
+            if len(starts) == 0:
+                break
+
+        return np.unique(starts >> 32)
+
+    def _term(self, text: str) -> np.ndarray:
+        """질의어 하나 평가 (여러 토큰으로 나뉘면 구문으로 처리)"""
+        return self._phrase(self.tokenizer.tokenize(text))
+
+    # 질의 문법:
+    #   query  := or ('OR' or)*
+    #   or     := unary (['AND'] unary)*
+    #   unary  := ('NOT' | '-') unary | '(' query ')' | '"구문"' | 단어
+    def _parse(self, query: str) -> Tuple:
+        """질의 문자열을 구문 트리로 변환"""
+        tokens = []
+        for match in _QUERY_PATTERN.finditer(query):
+            if match.group(1) is not None:
+                tokens.append(('PHRASE', match.group(1)))
+            else:
+                tokens.append(('OP', match.group()) if match.group() in ('(', ')', '-', 'AND', 'OR', 'NOT')
+                              else ('WORD', match.group()))
+        pos = 0
+
+        def peek():
+            return tokens[pos] if pos < len(tokens) else (None, None)
+
+        def parse_query():
+            nonlocal pos
+            nodes = [parse_and()]
+            while peek() == ('OP', 'OR'):
+                pos += 1
+                nodes.append(parse_and())
+            return nodes[0] if len(nodes) == 1 else ('OR', nodes)
+
+        def parse_and():
+            nonlocal pos
+            nodes = []
+            while True:
+                kind, value = peek()
+                if kind is None or (kind, value) in (('OP', ')'), ('OP', 'OR')):
+                    break
+                if (kind, value) == ('OP', 'AND'):
+                    pos += 1
+                    continue
+                nodes.append(parse_unary())
+            if not nodes:
+                raise ValueError(f"잘못된 검색어입니다: {query}")
+            return nodes[0] if len(nodes) == 1 else ('AND', nodes)
+
+        def parse_unary():
+            nonlocal pos
+            kind, value = peek()
+            pos += 1
+            if kind == 'OP' and value in ('NOT', '-'):
+                return ('NOT', parse_unary())
+            if (kind, value) == ('OP', '('):
+                node = parse_query()
+                if peek() != ('OP', ')'):
+                    raise ValueError(f"괄호가 닫히지 않았습니다: {query}")
+                pos += 1
+                return node
+            if kind in ('WORD', 'PHRASE'):
+                return (kind, value)
+            raise ValueError(f"잘못된 검색어입니다: {query}")
+
+        tree = parse_query()
+        if pos != len(tokens):
+            raise ValueError(f"잘못된 검색어입니다: {query}")
+        return tree
+
+    def _evaluate(self, node: Tuple) -> np.ndarray:
+        """구문 트리를 정렬된 문서 번호 배열로 평가"""
+        kind, value = node
+        if kind in ('WORD', 'PHRASE'):
+            return self._term(value)
+        if kind == 'NOT':
+            return np.setdiff1d(np.arange(self.num_docs, dtype=np.int64),
+                                self._evaluate(value), assume_unique=True)
+        if kind == 'OR':
+            return np.unique(np.concatenate([self._evaluate(child) for child in value]))
+
+        # AND: 긍정 조건을 작은 것부터 교집합한 뒤 부정 조건을 차집합
+        positives = [self._evaluate(child) for child in value if child[0] != 'NOT']
+        negatives = [self._evaluate(child[1]) for child in value if child[0] == 'NOT']
+        if positives:
+            positives.sort(key=len)
+            result = positives[0]
+            for docs in positives[1:]:
+                result = np.intersect1d(result, docs, assume_unique=True)
+        else:
+            result = np.arange(self.num_docs, dtype=np.int64)
+        for docs in negatives:
+            result = np.setdiff1d(result, docs, assume_unique=True)
+        return result
+
+    def get_document(self, doc_id: int) -> Dict[str, Any]:
+        """문서 번호로 원본 문서 조회"""
+        self._docs_file.seek(int(self.doc_offsets[doc_id]))
+        document = json.loads(self._docs_file.readline())
+        document['doc_id'] = int(doc_id)
+        return document
+
+    def count(self, query: str) -> int:
+        """질의에 맞는 문서 수"""
+        return len(self._evaluate(self._parse(query)))
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        """
+        검색
+
+        Args:
+            query: 검색어 (예: '권예은 AND CARD_DECLINED', '"배달이 완료" -취소', '맘스터치 OR 버거킹')
+            limit: 반환할 문서 수
+            offset: 건너뛸 문서 수 (페이지 처리)
+
+        Returns:
+            total (전체 매칭 수)과 hits (문서 번호 순 문서 목록)
+        """
+        doc_ids = self._evaluate(self._parse(query))
+        return {
+            'query': query,
+            'total': int(len(doc_ids)),
+            'hits': [self.get_document(doc_id) for doc_id in doc_ids[offset:offset + limit]]
+        }
+
+
+def build_search_index(documents: Iterable[Dict[str, Any]], index_dir: str,
+                       analyzer=None, text_key: str = 'text') -> int:
+    """
+    문서 딕셔너리 이터러블로 인덱스 생성
+
+    Args:
+        documents: text_key 값을 가진 문서 딕셔너리 이터러블
+        index_dir: 저장 디렉토리
+        analyzer: 전처리에 사용할 TextAnalyzer (없으면 전처리 생략)
+
+    Returns:
+        색인된 문서 수
+    """
+    writer = SearchIndexWriter(SearchTokenizer(analyzer))
+    count = writer.add_many(documents, text_key=text_key)
+    writer.write(index_dir)
+    return count
@@ -0,0 +1,432 @@
+"""
+스트리밍 집계 도구
+메모리 사용량이 입력 크기와 무관한, 병합 가능한 온라인 집계기를 제공합니다.
+"""
+
+import heapq
+import math
+from bisect import bisect_right
+from collections import Counter, deque
+from typing import Dict, List, Any, Tuple, Iterable, Hashable, Optional
+
+import numpy as np
+
+
+def _as_array(values: Iterable[float]) -> np.ndarray:
+    """이터러블을 float 배열로 변환"""
+    if isinstance(values, np.ndarray):
+        return values.astype(float, copy=False)
+    return np.fromiter(values, dtype=float)
+
+
+class SpaceSavingSketch:
+    """
+    Space-Saving 상위 빈도 항목(heavy hitters) 스케치
+
+    최대 capacity개의 항목만 유지하며, 보고되는 빈도는 실제 빈도 이상이고
+    오차는 전체 건수 / capacity 이하입니다.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        """
+        초기화
+
+        Args:
+            capacity: 추적할 최대 항목 수
+        """
+        if capacity < 1:
+            raise ValueError("capacity는 1 이상이어야 합니다")
+        self.capacity = capacity
+        self.total = 0
+        self.counts: Dict[Hashable, int] = {}
+        self.errors: Dict[Hashable, int] = {}
+        # (빈도 하한, 항목) 최소 힙 - 항목당 하나씩만 유지하며 꺼낼 때 갱신
+        self._heap: List[Tuple[int, Hashable]] = []
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def update(self, item: Hashable, count: int = 1):
+        """항목 빈도 누적"""
+        self.total += count
+
+        if item in self.counts:
+            self.counts[item] += count
+            return
+
+        if len(self.counts) < self.capacity:
+            self.counts[item] = count
+            self.errors[item] = 0
+            heapq.heappush(self._heap, (count, item))
+            return
+
+        # 최소 빈도 항목을 찾아 교체
+        while True:
+            heap_count, victim = self._heap[0]
+            current = self.counts[victim]
+            if current == heap_count:
+                break
+            heapq.heapreplace(self._heap, (current, victim))
+
+        heapq.heappop(self._heap)
+        del self.counts[victim]
+        del self.errors[victim]
+
+        self.counts[item] = current + count
+        self.errors[item] = current
+        heapq.heappush(self._heap, (current + count, item))
+
+    def update_many(self, items: Iterable[Hashable], weight: int = 1):
+        """여러 항목 빈도 누적 (weight는 항목 묶음의 반복 횟수)"""
+        for item, count in Counter(items).items():
+            self.update(item, count * weight)
+
+    def min_count(self) -> int:
+        """스케치가 가득 찬 경우 추적되지 않는 항목의 최대 가능 빈도"""
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+
+    def merge(self, other: 'SpaceSavingSketch') -> 'SpaceSavingSketch':
+        """다른 스케치를 병합 (빈도 상한 성질 유지)"""
+        self_min = self.min_count()
+        other_min = other.min_count()
+
+        merged_counts = {}
+        merged_errors = {}
+        for item in set(self.counts) | set(other.counts):
+            merged_counts[item] = (self.counts.get(item, self_min)
+                                   + other.counts.get(item, other_min))
+            merged_errors[item] = (self.errors.get(item, self_min)
+                                   + other.errors.get(item, other_min))
+
+        capacity = max(self.capacity, other.capacity)
+        kept = heapq.nlargest(capacity, merged_counts.items(), key=lambda x: x[1])
+
+        self.capacity = capacity
+        self.total += other.total
+        self.counts = dict(kept)
+        self.errors = {item: merged_errors[item] for item in self.counts}
+        self._heap = [(count, item) for item, count in self.counts.items()]
+        heapq.heapify(self._heap)
+        return self
+
+    def most_common(self, n: Optional[int] = None) -> List[Tuple[Hashable, int]]:
+        """
+        빈도 상위 n개 항목 (Counter.most_common과 동일한 형식)
+
+        동률은 항목 문자열 순으로 정렬하므로 병합 순서와 무관하게 결과가 같습니다.
+        """
+        def rank(entry):
+            return -entry[1], str(entry[0])
+
+        if n is None:
+            return sorted(self.counts.items(), key=rank)
+        return heapq.nsmallest(n, self.counts.items(), key=rank)
+
+    def error_bound(self) -> float:
+        """보고 빈도의 최대 과대추정량"""
+        return self.total / self.capacity
+
+
+class RunningStats:
+    """Welford 알고리즘 기반 평균/분산 누적기"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, value: float, weight: int = 1):
+        """값 하나 누적 (weight는 같은 값의 반복 횟수)"""
+        self.count += weight
+        delta = value - self.mean
+        self.mean += delta * weight / self.count
+        self._m2 += weight * delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def update_many(self, values: Iterable[float]):
+        """여러 값을 한 번에 누적 (배치 통계를 계산한 뒤 병합)"""
+        values = _as_array(values)
+        if values.size == 0:
+            return
+        batch = RunningStats()
+        batch.count = int(values.size)
+        batch.mean = float(values.mean())
+        batch._m2 = float(((values - batch.mean) ** 2).sum())
+        batch.min = float(values.min())
+        batch.max = float(values.max())
+        self.merge(batch)
+
+    def merge(self, other: 'RunningStats') -> 'RunningStats':
+        """다른 누적기를 병합 (Chan 등의 병렬 분산 공식)"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self._m2 = other.count, other.mean, other._m2
+            self.min, self.max = other.min, other.max
+            return self
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """모분산 (np.var 기본값과 동일)"""
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        """모표준편차"""
+        return math.sqrt(self.variance)
+
+    def to_dict(self) -> Dict[str, float]:
+        """요약 통계 딕셔너리"""
+        return {
+            'count': self.count,
+            'mean': self.mean if self.count else 0.0,
+            'std': self.std,
+            'min': self.min if self.count else 0.0,
+            'max': self.max if self.count else 0.0
+        }
+
+
+class FixedHistogram:
+    """고정 구간 히스토그램 (구간이 같으면 병합 가능, 마지막 구간은 상한 포함)"""
+
+    def __init__(self, low: float = 0.0, high: float = 500.0, bins: int = 50):
+        """
+        초기화
+
+        Args:
+            low: 첫 구간 하한
+            high: 마지막 구간 상한
+            bins: 구간 수
+        """
+        self.edges = np.linspace(low, high, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    def update(self, value: float, weight: int = 1):
+        """값 하나 누적 (weight는 같은 값의 반복 횟수)"""
+        if value < self.edges[0]:
+            self.underflow += weight
+        elif value > self.edges[-1]:
+            self.overflow += weight
+        else:
+            # 마지막 구간은 상한을 포함 (np.histogram과 동일)
+            idx = min(bisect_right(self.edges, value) - 1, len(self.counts) - 1)
+            self.counts[idx] += weight
+
+    def update_many(self, values: Iterable[float]):
+        """여러 값을 한 번에 누적"""
+        values = _as_array(values)
+        self.underflow += int((values < self.edges[0]).sum())
+        self.overflow += int((values > self.edges[-1]).sum())
+        inside = values[(values >= self.edges[0]) & (values <= self.edges[-1])]
+        self.counts += np.histogram(inside, bins=self.edges)[0]
+
+    def merge(self, other: 'FixedHistogram') -> 'FixedHistogram':
+        """다른 히스토그램을 병합"""
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("구간이 다른 히스토그램은 병합할 수 없습니다")
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        return self
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum()) + self.underflow + self.overflow
+
+    def quantile(self, q: float) -> float:
+        """구간 내 선형 보간으로 근사 분위수 계산"""
+        total = self.total
+        if total == 0:
+            return 0.0
+
+        target = q * total
+        if target <= self.underflow:
+            return float(self.edges[0])
+
+        cumulative = self.underflow + np.cumsum(self.counts)
+        idx = int(np.searchsorted(cumulative, target))
+        if idx >= len(self.counts):
+            return float(self.edges[-1])
+
+        before = cumulative[idx - 1] if idx > 0 else self.underflow
+        fraction = (target - before) / self.counts[idx] if self.counts[idx] else 0.0
+        return float(self.edges[idx] + fraction * (self.edges[idx + 1] - self.edges[idx]))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """직렬화 가능한 딕셔너리"""
+        return {
+            'edges': self.edges.tolist(),
+            'counts': self.counts.tolist(),
+            'underflow': self.underflow,
+            'overflow': self.overflow
+        }
+
+
+class StreamingAnomalyDetector:
+    """
+    도착 순서대로 값을 받아 이상 여부를 즉시 판정하는 탐지기
+
+    method='zscore'는 지금까지의 누적 평균/표준편차를, method='mad'는 최근
+    window개 값의 중앙값/MAD(중앙값 절대 편차)를 기준으로 점수를 계산합니다.
+    판정은 현재 값을 반영하기 전의 통계로 수행합니다.
+    """
+
+    # 정규분포에서 MAD를 표준편차로 환산하는 계수
+    MAD_SCALE = 1.4826
+
+    def __init__(self, threshold: float = 2.0, method: str = 'zscore',
+                 window: int = 1000, min_samples: int = 30, refresh: int = None):
+        """
+        초기화
+
+        Args:
+            threshold: 이상으로 판정할 점수 기준
+            method: 'zscore' 또는 'mad'
+            window: 'mad' 방식의 슬라이딩 윈도우 크기
+            min_samples: 판정을 시작하기 전 필요한 최소 관측 수
+            refresh: 'mad' 방식에서 중앙값/MAD를 다시 계산하는 간격 (기본: window의 1/20)
+        """
+        if method not in ('zscore', 'mad'):
+            raise ValueError(f"지원하지 않는 방식입니다: {method}")
+        if window < 1:
+            raise ValueError("window는 1 이상이어야 합니다")
+        if method == 'mad' and min_samples > window:
+            # 윈도우가 min_samples개까지 차지 않아 아무것도 판정하지 못함
+            raise ValueError(f"min_samples({min_samples})는 window({window}) 이하여야 합니다")
+        self.threshold = threshold
+        self.method = method
+        self.min_samples = min_samples
+        self.stats = RunningStats()
+        self.window = deque(maxlen=window) if method == 'mad' else None
+        self.refresh = refresh or max(1, window // 20)
+        self._since_refresh = 0
+        self._median = 0.0
+        self._scale = 0.0
+
+    def _refresh_robust_stats(self):
+        """윈도우의 중앙값과 MAD 기반 척도 재계산"""
+        values = np.fromiter(self.window, dtype=float, count=len(self.window))
+        self._median = float(np.median(values))
+        self._scale = self.MAD_SCALE * float(np.median(np.abs(values - self._median)))
+        if self._scale == 0:
+            # 대부분 값이 같은 경우 MAD가 0이 되므로 표준편차로 대체
+            self._scale = float(values.std())
+        self._since_refresh = 0
+
+    def score(self, value: float) -> float:
+        """현재 기준 통계로 계산한 이상 점수 (판정 불가 시 0)"""
+        if self.method == 'zscore':
+            if self.stats.count < self.min_samples or self.stats.std == 0:
+                return 0.0
+            return abs(value - self.stats.mean) / self.stats.std
+
+        if len(self.window) < self.min_samples or self._scale == 0:
+            return 0.0
+        return abs(value - self._median) / self._scale
+
+    def update(self, value: float) -> Tuple[bool, float]:
+        """값 하나를 판정한 뒤 통계에 반영"""
+        score = self.score(value)
+        if self.method == 'zscore':
+            self.stats.update(value)
+        else:
+            self.window.append(value)
+            self._since_refresh += 1
+            if len(self.window) == self.min_samples or (
+                    len(self.window) > self.min_samples and self._since_refresh >= self.refresh):
+                self._refresh_robust_stats()
+        return score > self.threshold, score
+
+
+class MessagePatternAggregator:
+    """메시지 패턴 분석용 병합 가능 누적기"""
+
+    def __init__(self, keyword_capacity: int = 2000, user_capacity: int = 1000):
+        """
+        초기화
+
+        Args:
+            keyword_capacity: 키워드 스케치 크기
+            user_capacity: 사용자 스케치 크기
+        """
+        self.total_messages = 0
+        self.length_stats = RunningStats()
+        self.length_histogram = FixedHistogram(0, 500, 50)
+        self.sentiment_stats = RunningStats()
+        self.sentiment_histogram = FixedHistogram(-1.0, 1.0, 20)
+        self.time_patterns: Counter = Counter()
+        self.keywords = SpaceSavingSketch(keyword_capacity)
+        self.users = SpaceSavingSketch(user_capacity)
+
+    def add(self, length: int, sentiment: float, hour: Optional[int],
+            user_id: Hashable, tokens: Iterable[str], weight: int = 1,
+            hour_counts: Optional[Dict[int, int]] = None,
+            user_counts: Optional[Dict[Hashable, int]] = None):
+        """
+        메시지 하나의 특징값 누적
+
+        weight는 같은 내용의 메시지(유사 중복 클러스터) 건수로, 텍스트에서 나온 특징값(길이, 감정,
+        키워드)에만 적용됩니다. 클러스터 구성원의 보낸 사람/시간이 서로 다르면 hour_counts,
+        user_counts로 구성원별 건수를 넘기며, 이때 hour/user_id는 사용하지 않습니다.
+        """
+        self.total_messages += weight
+        self.length_stats.update(length, weight)
+        self.length_histogram.update(length, weight)
+        self.sentiment_stats.update(sentiment, weight)
+        self.sentiment_histogram.update(sentiment, weight)
+        if hour_counts is not None:
+            self.time_patterns.update(hour_counts)
+        elif hour is not None:
+            self.time_patterns[hour] += weight
+        if user_counts is not None:
+            for member_user, count in user_counts.items():
+                self.users.update(member_user, count)
+        else:
+            self.users.update(user_id, weight)
+        self.keywords.update_many(tokens, weight)
+
+    def merge(self, other: 'MessagePatternAggregator') -> 'MessagePatternAggregator':
+        """다른 파티션의 누적 결과를 병합"""
+        self.total_messages += other.total_messages
+        self.length_stats.merge(other.length_stats)
+        self.length_histogram.merge(other.length_histogram)
+        self.sentiment_stats.merge(other.sentiment_stats)
+        self.sentiment_histogram.merge(other.sentiment_histogram)
+        self.time_patterns.update(other.time_patterns)
+        self.keywords.merge(other.keywords)
+        self.users.merge(other.users)
+        return self
+
+    def to_dict(self, top_keywords: int = 20, top_users: int = 10) -> Dict[str, Any]:
+        """analyze_message_patterns 결과 형식으로 변환"""
+        return {
+            'total_messages': self.total_messages,
+            'avg_message_length': self.length_stats.mean if self.total_messages else 0,
+            'avg_sentiment': self.sentiment_stats.mean if self.total_messages else 0,
+            'message_length_stats': self.length_stats.to_dict(),
+            'message_length_histogram': self.length_histogram.to_dict(),
+            'sentiment_stats': self.sentiment_stats.to_dict(),
+            'sentiment_histogram': self.sentiment_histogram.to_dict(),
+            'time_patterns': dict(self.time_patterns),
+            'top_keywords': self.keywords.most_common(top_keywords),
+            'keyword_error_bound': self.keywords.error_bound(),
+            'top_users': dict(self.users.most_common(top_users))
+        }
@@ -1,40 +1,103 @@
 """
 텍스트 데이터 분석 도구
 배달의민족 메시지 데이터에서 텍스트 분석을 수행합니다.
+예제 실행: 상위 폴더에서 python -m data_extraction.text_analyzer
 """
 
+import os
 import re
-import json
-import pandas as pd
+import shutil
+import hashlib
+import platform
+import zlib
+import queue
+import functools
+import itertools
 import numpy as np
-from collections import Counter, defaultdict
-from typing import Dict, List, Any, Tuple
+from collections import Counter
+from typing import Dict, List, Any, Tuple, Iterable, Iterator, Optional, TYPE_CHECKING
 import logging
 from datetime import datetime
-import matplotlib.pyplot as plt
-import seaborn as sns
-from wordcloud import WordCloud
-import jieba
-from textblob import TextBlob
-import nltk
-from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
 
-# NLTK 데이터 다운로드 (최초 실행 시)
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-    nltk.download('stopwords')
-    nltk.download('wordnet')
+from .stream_aggregator import MessagePatternAggregator, SpaceSavingSketch, StreamingAnomalyDetector
+from .entity_extractor import EntityExtractor
+
+# matplotlib, wordcloud, jieba, textblob, nltk는 import 비용이 크므로
+# 실제로 필요한 메서드 안에서 지연 import합니다.
+if TYPE_CHECKING:
+    from PIL.Image import Image
 
 logger = logging.getLogger(__name__)
 
+# 워드클라우드용 한글 폰트 후보 (WORDCLOUD_FONT_PATH 환경 변수가 우선)
+FONT_CANDIDATES = {
+    'Darwin': ['/System/Library/Fonts/AppleSDGothicNeo.ttc',
+               '/System/Library/Fonts/Supplemental/AppleGothic.ttf',
+               '/Library/Fonts/AppleGothic.ttf'],
+    'Windows': ['C:/Windows/Fonts/malgun.ttf',
+                'C:/Windows/Fonts/gulim.ttc'],
+    'Linux': ['/usr/share/fonts/truetype/nanum/NanumGothic.ttf',
+              '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
+              '/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc']
+}
+FONT_FAMILIES = ['AppleGothic', 'Apple SD Gothic Neo', 'Malgun Gothic',
+                 'NanumGothic', 'Noto Sans CJK KR', 'Noto Sans KR']
+
+
+def _nltk_resource_available(resource: str) -> bool:
+    """
+    NLTK 리소스 설치 여부 확인 (네트워크 접근 없음)
+    
+    설치: python -m nltk.downloader punkt stopwords wordnet
+    """
+    import nltk
+    try:
+        nltk.data.find(resource)
+        return True
+    except LookupError:
+        logger.warning(f"NLTK 리소스 없음: {resource} - 'python -m nltk.downloader'로 설치하세요")
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def _discover_korean_font() -> Optional[str]:
+    """설치된 한글 폰트 경로 탐색 (프로세스당 한 번)"""
+    for candidate in FONT_CANDIDATES.get(platform.system(), []):
+        if os.path.exists(candidate):
+            return candidate
+    
+    from matplotlib import font_manager
+    for font in font_manager.fontManager.ttflist:
+        if font.name in FONT_FAMILIES:
+            return font.fname
+    
+    logger.warning("한글 폰트를 찾지 못했습니다 - WORDCLOUD_FONT_PATH를 설정하세요")
+    return None
+
+
+def _message_hour(message: Dict) -> Optional[int]:
+    """메시지 timestamp의 시간 (없거나 형식이 잘못되면 None)"""
+    timestamp = message.get('timestamp', '')
+    if timestamp:
+        try:
+            return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).hour
+        except (ValueError, AttributeError):
+            pass
+    return None
+
+
+def _message_user(message: Dict) -> Any:
+    """메시지 보낸 사람 식별값"""
+    return message.get('user_id', message.get('sender', 'unknown'))
+
 
 class TextAnalyzer:
     """텍스트 데이터 분석 클래스"""
     
+    # 한국어 감정 분석 키워드 (간단한 키워드 기반)
+    POSITIVE_WORDS = ['좋', '맛있', '훌륭', '완벽', '최고', '감사', '만족']
+    NEGATIVE_WORDS = ['나쁘', '별로', '최악', '불만', '실망', '화나', '짜증']
+    
     def __init__(self, language: str = 'korean'):
         """
         초기화
@@ -44,11 +107,15 @@ class TextAnalyzer:
         """
         self.language = language
         self.stop_words = set()
-        self.lemmatizer = WordNetLemmatizer()
+        self._lemmatizer = None
+        self._word_tokenize = None
+        self.entity_extractor = None
         
         # 언어별 설정
         if language == 'english':
-            self.stop_words = set(stopwords.words('english'))
+            if _nltk_resource_available('corpora/stopwords'):
+                from nltk.corpus import stopwords
+                self.stop_words = set(stopwords.words('english'))
         elif language == 'korean':
             # 한국어 불용어 설정
             self.stop_words = {
@@ -64,6 +131,14 @@ class TextAnalyzer:
         
         logger.info(f"TextAnalyzer 초기화 완료 - 언어: {language}")
     
+    @property
+    def lemmatizer(self):
+        """WordNet 표제어 추출기 (최초 접근 시 생성)"""
+        if self._lemmatizer is None:
+            from nltk.stem import WordNetLemmatizer
+            self._lemmatizer = WordNetLemmatizer()
+        return self._lemmatizer
+    
     def preprocess_text(self, text: str) -> str:
         """텍스트 전처리"""
         if not text:
@@ -88,20 +163,45 @@ class TextAnalyzer:
         """텍스트 토큰화"""
         if self.language == 'korean':
             # 한국어 토큰화
+            import jieba
             tokens = jieba.lcut(text)
         else:
-            # 영어 토큰화
-            tokens = word_tokenize(text)
+            # 영어 토큰화 (punkt가 없으면 정규식 기반 토크나이저 사용)
+            if self._word_tokenize is None:
+                if _nltk_resource_available('tokenizers/punkt'):
+                    from nltk.tokenize import word_tokenize
+                else:
+                    from nltk.tokenize import wordpunct_tokenize as word_tokenize
+                self._word_tokenize = word_tokenize
+            tokens = self._word_tokenize(text)
         
         # 불용어 제거 및 길이 필터링
         tokens = [token for token in tokens if token not in self.stop_words and len(token) > 1]
         
         return tokens
     
+    def tokenize_batch(self, texts: Iterable[str]) -> Iterator[List[str]]:
+        """여러 텍스트를 전처리 후 토큰화 (텍스트 순서대로 yield)"""
+        for text in texts:
+            yield self.tokenize_text(self.preprocess_text(text or ''))
+    
+    def build_keyword_engine(self, texts: Iterable[str],
+                             metadata: Dict[str, List[Any]] = None,
+                             ngram_range: Tuple[int, int] = (1, 2),
+                             min_df: int = 1):
+        """
+        TF-IDF / n-gram 키워드 엔진 구축
+        
+        말뭉치를 한 번만 토큰화하며, 이후 슬라이스별 질의는 희소 행렬 행 선택으로 처리합니다.
+        """
+        from .keyword_engine import KeywordEngine
+        return KeywordEngine(self, ngram_range=ngram_range, min_df=min_df).fit(texts, metadata)
+    
     def analyze_sentiment(self, text: str) -> Dict[str, float]:
         """감정 분석"""
         try:
             if self.language == 'english':
+                from textblob import TextBlob
                 blob = TextBlob(text)
                 return {
                     'polarity': blob.sentiment.polarity,  # -1 (부정) ~ 1 (긍정)
@@ -109,12 +209,9 @@ class TextAnalyzer:
                 }
             else:
                 # 한국어 감정 분석 (간단한 키워드 기반)
-                positive_words = ['좋', '맛있', '훌륭', '완벽', '최고', '감사', '만족']
-                negative_words = ['나쁘', '별로', '최악', '불만', '실망', '화나', '짜증']
-                
                 text_lower = text.lower()
-                positive_count = sum(1 for word in positive_words if word in text_lower)
-                negative_count = sum(1 for word in negative_words if word in text_lower)
+                positive_count = sum(1 for word in self.POSITIVE_WORDS if word in text_lower)
+                negative_count = sum(1 for word in self.NEGATIVE_WORDS if word in text_lower)
                 
                 total_words = len(text.split())
                 if total_words == 0:
@@ -131,205 +228,468 @@ class TextAnalyzer:
             logger.error(f"감정 분석 실패: {e}")
             return {'polarity': 0, 'subjectivity': 0}
     
-    def extract_keywords(self, texts: List[str], top_n: int = 20) -> List[Tuple[str, int]]:
-        """키워드 추출"""
-        all_tokens = []
+    def analyze_sentiment_batch(self, texts: Iterable[str]) -> np.ndarray:
+        """
+        감정 극성 일괄 계산 (analyze_sentiment의 polarity와 동일한 값)
         
-        for text in texts:
-            processed_text = self.preprocess_text(text)
-            tokens = self.tokenize_text(processed_text)
-            all_tokens.extend(tokens)
+        한국어는 키워드 포함 여부를 pandas 문자열 연산으로 벡터화합니다.
+        """
+        import pandas as pd
+        
+        texts = pd.Series(list(texts), dtype=object).fillna('').astype(str)
+        if texts.empty:
+            return np.zeros(0)
+        
+        if self.language == 'english':
+            return np.array([self.analyze_sentiment(text)['polarity'] for text in texts])
+        
+        lowered = texts.str.lower()
+        positive = sum(lowered.str.contains(word, regex=False).to_numpy(dtype=int)
+                       for word in self.POSITIVE_WORDS)
+        negative = sum(lowered.str.contains(word, regex=False).to_numpy(dtype=int)
+                       for word in self.NEGATIVE_WORDS)
+        total_words = texts.str.split().str.len().to_numpy(dtype=float)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            polarity = np.where(total_words > 0, (positive - negative) / total_words, 0.0)
+        return np.clip(polarity, -1, 1)
+    
+    def extract_keywords(self, texts: Iterable[str], top_n: int = 20,
+                         weights: Iterable[int] = None,
+                         capacity: int = 1000) -> List[Tuple[str, int]]:
+        """
+        키워드 추출
+        
+        빈도는 Space-Saving 스케치로 누적하므로 메모리가 어휘 크기와 무관합니다.
+        고유 단어가 capacity개 이하이면 빈도는 정확하고, 넘으면 실제 빈도 이상의 근삿값입니다.
         
-        # 빈도 계산
-        word_freq = Counter(all_tokens)
+        Args:
+            texts: 텍스트 이터러블
+            top_n: 반환할 키워드 수
+            weights: 텍스트별 가중치 (deduplicate_texts의 count 등, 기본 1)
+            capacity: 키워드 스케치 크기 (top_n보다 작으면 top_n 사용)
+        """
+        word_freq = SpaceSavingSketch(max(capacity, top_n))
+        
+        # 텍스트별로 빈도 누적 (전체 토큰 리스트를 만들지 않음)
+        if weights is None:
+            weights = itertools.repeat(1)
+        for text, weight in zip(texts, weights):
+            processed_text = self.preprocess_text(text)
+            word_freq.update_many(self.tokenize_text(processed_text), weight)
         
         # 상위 키워드 반환
         return word_freq.most_common(top_n)
     
-    def analyze_message_patterns(self, messages: List[Dict]) -> Dict[str, Any]:
-        """메시지 패턴 분석"""
-        analysis = {
-            'total_messages': len(messages),
-            'message_lengths': [],
-            'sentiment_scores': [],
-            'time_patterns': defaultdict(int),
-            'user_patterns': defaultdict(int),
-            'keyword_frequency': Counter(),
-            'response_times': []
-        }
+    def deduplicate_texts(self, texts: List[str], threshold: float = 0.8,
+                          num_perm: int = 64, shingle_size: int = 3,
+                          include_members: bool = False) -> List[Dict[str, Any]]:
+        """
+        유사 중복 텍스트 클러스터링 (MinHash + LSH)
+        
+        결과의 representative/count를 extract_keywords(texts, weights=...)에 넘기면
+        분석 비용이 원본 건수가 아니라 고유 내용 수에 비례합니다.
+        """
+        from .deduplicator import MinHashDeduplicator
+        deduplicator = MinHashDeduplicator(threshold, num_perm, shingle_size)
+        return deduplicator.deduplicate(texts, include_members=include_members)
+    
+    def deduplicate_messages(self, messages: List[Dict], threshold: float = 0.8,
+                             num_perm: int = 64) -> List[Dict]:
+        """
+        유사 중복 메시지를 대표 메시지 하나로 합침
+        
+        반환된 메시지의 'weight' 키에 중복 건수가 들어가며, aggregate_message_patterns가 이를
+        텍스트 특징값(길이, 감정, 키워드)의 가중치로 사용합니다. 사용자/시간 패턴은 구성원마다 다르므로
+        'member_users', 'member_hours' 키에 구성원별 건수를 따로 담습니다.
+        """
+        clusters = self.deduplicate_texts([message.get('text', '') for message in messages],
+                                          threshold, num_perm, include_members=True)
+        results = []
+        for cluster in clusters:
+            members = [messages[index] for index in cluster['members']]
+            hours = Counter(_message_hour(member) for member in members)
+            hours.pop(None, None)
+            results.append(dict(messages[cluster['representative_index']],
+                                weight=cluster['count'],
+                                member_users=Counter(_message_user(member) for member in members),
+                                member_hours=hours))
+        return results
+    
+    def aggregate_message_patterns(self, messages: Iterable[Dict],
+                                   aggregator: MessagePatternAggregator = None
+                                   ) -> MessagePatternAggregator:
+        """
+        메시지 패턴을 병합 가능한 누적기에 집계
+        
+        Args:
+            messages: 메시지 레코드 이터러블 (한 번만 순회)
+            aggregator: 이어서 누적할 기존 누적기 (없으면 새로 생성)
+        """
+        if aggregator is None:
+            aggregator = MessagePatternAggregator()
         
         for message in messages:
-            # 메시지 길이
             text = message.get('text', '')
-            analysis['message_lengths'].append(len(text))
             
             # 감정 분석
             sentiment = self.analyze_sentiment(text)
-            analysis['sentiment_scores'].append(sentiment['polarity'])
-            
-            # 시간 패턴
-            timestamp = message.get('timestamp', '')
-            if timestamp:
-                try:
-                    hour = datetime.fromisoformat(timestamp.replace('Z', '+00:00')).hour
-                    analysis['time_patterns'][hour] += 1
-                except:
-                    pass
-            
-            # 사용자 패턴
-            user_id = message.get('user_id', 'unknown')
-            analysis['user_patterns'][user_id] += 1
             
             # 키워드 빈도
             tokens = self.tokenize_text(self.preprocess_text(text))
-            analysis['keyword_frequency'].update(tokens)
-        
-        # 통계 계산
-        analysis['avg_message_length'] = np.mean(analysis['message_lengths'])
-        analysis['avg_sentiment'] = np.mean(analysis['sentiment_scores'])
-        analysis['top_keywords'] = analysis['keyword_frequency'].most_common(20)
-        analysis['top_users'] = dict(analysis['user_patterns'].most_common(10))
+            
+            # 중복 제거된 대표 메시지는 텍스트 특징값을 weight만큼 반영하고,
+            # 시간/사용자 패턴은 구성원별 건수(deduplicate_messages 결과)로 반영
+            weight = message.get('weight', 1)
+            
+            aggregator.add(len(text), sentiment['polarity'], _message_hour(message),
+                           _message_user(message), tokens, weight,
+                           hour_counts=message.get('member_hours'),
+                           user_counts=message.get('member_users'))
         
-        return analysis
+        return aggregator
     
-    def generate_wordcloud(self, texts: List[str], output_path: str = None) -> WordCloud:
-        """워드클라우드 생성"""
-        # 모든 텍스트 결합
-        combined_text = ' '.join(texts)
-        
-        # 한국어 폰트 설정
-        if self.language == 'korean':
-            font_path = '/System/Library/Fonts/AppleGothic.ttf'  # macOS
-            # Windows: 'C:/Windows/Fonts/malgun.ttf'
-            # Linux: '/usr/share/fonts/truetype/nanum/NanumGothic.ttf'
-        else:
-            font_path = None
-        
-        # 워드클라우드 생성
-        wordcloud = WordCloud(
-            font_path=font_path,
-            width=800,
-            height=400,
-            background_color='white',
-            max_words=100,
-            colormap='viridis'
-        ).generate(combined_text)
+    def aggregate_message_patterns_sharded(self, messages: Iterable[Dict], workers: int = None,
+                                           batch_size: int = 1000) -> MessagePatternAggregator:
+        """
+        conversation_id 기준으로 메시지를 여러 프로세스에 나눠 집계
         
-        # 저장
-        if output_path:
-            wordcloud.to_file(output_path)
-            logger.info(f"워드클라우드 저장 완료: {output_path}")
+        같은 대화의 메시지는 항상 같은 워커로 가며, 워커별 누적기를
+        샤드 순서대로 merge()하므로 결과 형식은 aggregate_message_patterns와 같습니다.
         
-        return wordcloud
-    
-    def analyze_customer_feedback(self, feedback_data: List[Dict]) -> Dict[str, Any]:
-        """고객 피드백 분석"""
-        analysis = {
-            'total_feedback': len(feedback_data),
-            'rating_distribution': defaultdict(int),
-            'sentiment_by_rating': defaultdict(list),
-            'common_issues': Counter(),
-            'positive_keywords': Counter(),
-            'negative_keywords': Counter(),
-            'response_time_analysis': {},
-            'category_analysis': defaultdict(list)
-        }
+        Args:
+            messages: 메시지 레코드 이터러블 (한 번만 순회)
+            workers: 워커 프로세스 수 (기본: CPU 코어 수, 1 이하면 현재 프로세스에서 처리)
+            batch_size: 워커에 한 번에 보낼 메시지 수
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1:
+            return self.aggregate_message_patterns(messages)
+        
+        import multiprocessing
+        
+        tasks = [multiprocessing.Queue(maxsize=4) for _ in range(workers)]
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=_shard_worker, args=(self.language, shard, tasks[shard], results),
+                                    daemon=True)
+            for shard in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        
+        partials = {}
+        
+        def collect(timeout: float):
+            """워커 결과 하나를 받아 기록 (워커가 실패했거나 비정상 종료했으면 예외 발생)"""
+            try:
+                shard, partial, error = results.get(timeout=timeout)
+            except queue.Empty:
+                failed = [process.exitcode for process in processes
+                          if process.exitcode not in (None, 0)]
+                if failed:
+                    raise RuntimeError(f"샤드 워커가 비정상 종료했습니다: exitcode={failed}")
+                return
+            if error is not None:
+                raise RuntimeError(f"샤드 워커 {shard} 처리 실패: {error}")
+            partials[shard] = partial
+        
+        def send(shard: int, item):
+            """작업 큐에 넣기 (큐가 가득 찬 동안 워커 실패 여부를 확인해 무한 대기하지 않음)"""
+            while True:
+                try:
+                    tasks[shard].put(item, timeout=1)
+                    return
+                except queue.Full:
+                    collect(timeout=0.01)
         
-        for feedback in feedback_data:
-            rating = feedback.get('rating', 0)
-            text = feedback.get('text', '')
-            category = feedback.get('category', 'general')
-            
-            # 평점 분포
-            analysis['rating_distribution'][rating] += 1
-            
-            # 평점별 감정 분석
-            sentiment = self.analyze_sentiment(text)
-            analysis['sentiment_by_rating'][rating].append(sentiment['polarity'])
+        try:
+            batches: List[List[Dict]] = [[] for _ in range(workers)]
+            for message in messages:
+                key = str(message.get('conversation_id')).encode('utf-8')
+                shard = zlib.crc32(key) % workers
+                batches[shard].append(message)
+                if len(batches[shard]) >= batch_size:
+                    send(shard, batches[shard])
+                    batches[shard] = []
             
-            # 카테고리별 분석
-            analysis['category_analysis'][category].append({
-                'rating': rating,
-                'sentiment': sentiment['polarity'],
-                'text': text
-            })
+            for shard, batch in enumerate(batches):
+                if batch:
+                    send(shard, batch)
+                send(shard, None)
             
-            # 키워드 분석
-            tokens = self.tokenize_text(self.preprocess_text(text))
-            if rating >= 4:
-                analysis['positive_keywords'].update(tokens)
-            elif rating <= 2:
-                analysis['negative_keywords'].update(tokens)
+            # 워커 결과 수집
+            while len(partials) < workers:
+                collect(timeout=1)
+        except BaseException:
+            # 실패 시 남은 워커는 작업 큐를 기다리므로 바로 종료
+            for process in processes:
+                process.terminate()
+            raise
+        finally:
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+        
+        aggregator = MessagePatternAggregator()
+        for shard in range(workers):
+            aggregator.merge(partials[shard])
+        
+        logger.info(f"샤드 집계 완료 - 워커 {workers}개, 메시지 {aggregator.total_messages}개")
+        return aggregator
+    
+    def analyze_message_patterns(self, messages: Iterable[Dict]) -> Dict[str, Any]:
+        """메시지 패턴 분석 (메모리 사용량은 메시지 수와 무관)"""
+        return self.aggregate_message_patterns(messages).to_dict()
+    
+    def find_font(self, font_path: Optional[str] = None) -> Optional[str]:
+        """
+        워드클라우드 폰트 탐색
+        
+        우선순위: 인자 > WORDCLOUD_FONT_PATH 환경 변수 > 플랫폼별 기본 경로 > matplotlib 폰트 목록.
+        영어 분석이거나 한글 폰트를 찾지 못하면 None (wordcloud 기본 폰트)을 반환합니다.
+        """
+        if font_path:
+            return font_path
         
-        # 통계 계산
-        for rating in analysis['sentiment_by_rating']:
-            analysis['sentiment_by_rating'][rating] = np.mean(analysis['sentiment_by_rating'][rating])
+        env_font = os.environ.get('WORDCLOUD_FONT_PATH')
+        if env_font:
+            return env_font
         
-        analysis['top_positive_keywords'] = analysis['positive_keywords'].most_common(10)
-        analysis['top_negative_keywords'] = analysis['negative_keywords'].most_common(10)
+        if self.language != 'korean':
+            return None
         
-        return analysis
+        return _discover_korean_font()
     
-    def detect_anomalies(self, texts: List[str], threshold: float = 2.0) -> List[int]:
-        """이상 텍스트 탐지"""
-        anomalies = []
-        
-        # 텍스트 길이 기반 이상 탐지
-        lengths = [len(text) for text in texts]
-        mean_length = np.mean(lengths)
-        std_length = np.std(lengths)
+    def generate_wordcloud(self, texts: Optional[Iterable[str]] = None, output_path: str = None,
+                           frequencies: Optional[Dict[str, float]] = None,
+                           font_path: Optional[str] = None, max_words: int = 100,
+                           cache_dir: Optional[str] = None) -> 'Image':
+        """
+        워드클라우드 생성
         
-        for i, length in enumerate(lengths):
-            z_score = abs(length - mean_length) / std_length
-            if z_score > threshold:
-                anomalies.append(i)
+        이미 계산된 키워드 빈도(extract_keywords 결과나 스트리밍 스케치의 상위 항목)를
+        generate_from_frequencies로 렌더링하므로 비용이 말뭉치 크기와 무관합니다.
         
-        return anomalies
-    
-    def extract_entities(self, text: str) -> Dict[str, List[str]]:
-        """개체명 추출 (간단한 규칙 기반)"""
-        entities = {
-            'restaurants': [],
-            'food_items': [],
-            'locations': [],
-            'times': [],
-            'prices': []
+        Args:
+            texts: 빈도가 없을 때 extract_keywords로 빈도를 계산할 텍스트
+            output_path: 이미지 저장 경로
+            frequencies: {단어: 빈도} 딕셔너리 또는 (단어, 빈도) 목록
+            font_path: 폰트 경로 (없으면 find_font로 탐색)
+            max_words: 표시할 최대 단어 수
+            cache_dir: 렌더링 결과 캐시 디렉토리 (빈도 지문으로 조회)
+        
+        Returns:
+            워드클라우드 이미지 (PIL Image, 캐시 적중 시 캐시 파일을 지연 로드)
+        """
+        if frequencies is None:
+            frequencies = self.extract_keywords(texts or [], top_n=max_words)
+        frequencies = dict(frequencies)
+        
+        # 표시될 상위 단어만 사용
+        top_words = sorted(frequencies.items(), key=lambda x: (-x[1], x[0]))[:max_words]
+        if not top_words:
+            raise ValueError("워드클라우드를 만들 키워드가 없습니다")
+        
+        font_path = self.find_font(font_path)
+        render_options = {
+            'font_path': font_path,
+            'width': 800,
+            'height': 400,
+            'background_color': 'white',
+            'max_words': max_words,
+            'colormap': 'viridis'
         }
         
-        # 음식점명 패턴
-        restaurant_patterns = [
-            r'([가-힣]+[집|점|당|관])',
-            r'([가-힣]+[치킨|피자|햄버거|카페])'
-        ]
+        # 빈도 + 렌더링 옵션 지문으로 캐시 조회
+        cache_path = None
+        if cache_dir:
+            fingerprint = hashlib.sha256(
+                repr((top_words, sorted(render_options.items()))).encode('utf-8')
+            ).hexdigest()[:16]
+            cache_path = os.path.join(cache_dir, f"wordcloud_{fingerprint}.png")
+            if os.path.exists(cache_path):
+                if output_path:
+                    shutil.copyfile(cache_path, output_path)
+                logger.info(f"워드클라우드 캐시 사용: {cache_path}")
+                from PIL import Image
+                return Image.open(cache_path)
+        
+        from wordcloud import WordCloud
         
-        # 음식명 패턴
-        food_patterns = [
-            r'([가-힣]+[치킨|피자|햄버거|스테이크|파스타|샐러드])',
-            r'([가-힣]+[김치|된장|순두부|갈비|삼겹살])'
-        ]
+        # 워드클라우드 생성
+        wordcloud = WordCloud(**render_options).generate_from_frequencies(dict(top_words))
         
-        # 가격 패턴
-        price_pattern = r'(\d{1,3}(?:,\d{3})*원)'
+        # 저장
+        if cache_path:
+            os.makedirs(cache_dir, exist_ok=True)
+            wordcloud.to_file(cache_path)
+        if output_path:
+            if cache_path:
+                shutil.copyfile(cache_path, output_path)
+            else:
+                wordcloud.to_file(output_path)
+            logger.info(f"워드클라우드 저장 완료: {output_path}")
         
-        # 시간 패턴
-        time_pattern = r'(\d{1,2}:\d{2})'
+        return wordcloud.to_image()
+    
+    def analyze_customer_feedback(self, feedback_data: List[Dict], top_n: int = 10,
+                                  sample_size: int = 0,
+                                  keyword_capacity: int = 1000) -> Dict[str, Any]:
+        """
+        고객 피드백 분석 (컬럼 단위 집계)
         
-        # 패턴 매칭
-        for pattern in restaurant_patterns:
-            matches = re.findall(pattern, text)
-            entities['restaurants'].extend(matches)
+        평점/카테고리별 그룹 집계와 벡터화된 감정 분석을 사용하며, 원문 대신
+        건수/평균/분위수/상위 키워드만 반환하므로 결과 크기가 피드백 수와 무관합니다.
         
-        for pattern in food_patterns:
-            matches = re.findall(pattern, text)
-            entities['food_items'].extend(matches)
+        Args:
+            feedback_data: rating, text, category 키를 갖는 피드백 목록
+            top_n: 반환할 상위 키워드 수
+            sample_size: 카테고리별로 포함할 원문 예시 수 (기본 0 - 미포함)
+            keyword_capacity: 평점 구간별 키워드 스케치 크기
+        """
+        import pandas as pd
+        
+        frame = pd.DataFrame.from_records(
+            [(feedback.get('rating'), feedback.get('text'), feedback.get('category'))
+             for feedback in feedback_data],
+            columns=['rating', 'text', 'category']
+        )
+        frame['rating'] = pd.to_numeric(frame['rating'], errors='coerce').fillna(0)
+        frame['text'] = frame['text'].fillna('').astype(str)
+        frame['category'] = frame['category'].fillna('general')
+        
+        # 벡터화된 감정 분석
+        frame['sentiment'] = self.analyze_sentiment_batch(frame['text'])
+        
+        # 평점 구간 (4점 이상 긍정, 2점 이하 부정)
+        frame['band'] = np.where(frame['rating'] >= 4, 'positive',
+                                 np.where(frame['rating'] <= 2, 'negative', 'neutral'))
+        
+        def rating_key(rating: float):
+            return int(rating) if float(rating).is_integer() else float(rating)
+        
+        # 평점별 집계
+        by_rating = frame.groupby('rating')['sentiment'].agg(
+            ['count', 'mean', lambda x: x.quantile(0.25), 'median', lambda x: x.quantile(0.75)]
+        )
+        by_rating.columns = ['count', 'mean', 'q25', 'median', 'q75']
+        
+        rating_stats = {
+            rating_key(rating): {
+                'count': int(row['count']),
+                'mean_sentiment': float(row['mean']),
+                'sentiment_quantiles': {'q25': float(row['q25']),
+                                        'median': float(row['median']),
+                                        'q75': float(row['q75'])}
+            }
+            for rating, row in by_rating.iterrows()
+        }
         
-        price_matches = re.findall(price_pattern, text)
-        entities['prices'].extend(price_matches)
+        # 카테고리별 집계
+        grouped = frame.groupby('category')
+        by_category = grouped.agg(
+            count=('rating', 'size'),
+            mean_rating=('rating', 'mean'),
+            mean_sentiment=('sentiment', 'mean')
+        )
+        rating_quantiles = grouped['rating'].quantile([0.25, 0.5, 0.75]).unstack()
+        
+        category_analysis = {}
+        for category, row in by_category.iterrows():
+            category_analysis[category] = {
+                'count': int(row['count']),
+                'mean_rating': float(row['mean_rating']),
+                'mean_sentiment': float(row['mean_sentiment']),
+                'rating_quantiles': {'q25': float(rating_quantiles.loc[category, 0.25]),
+                                     'median': float(rating_quantiles.loc[category, 0.5]),
+                                     'q75': float(rating_quantiles.loc[category, 0.75])},
+                'band_counts': {}
+            }
+        for (category, band), count in frame.groupby(['category', 'band']).size().items():
+            category_analysis[category]['band_counts'][band] = int(count)
+        
+        if sample_size > 0:
+            samples = grouped.head(sample_size)
+            for category, rows in samples.groupby('category'):
+                category_analysis[category]['samples'] = rows[['rating', 'sentiment', 'text']].to_dict('records')
+        
+        # 평점 구간별 키워드 (크기가 고정된 스케치로 누적)
+        band_keywords = {band: SpaceSavingSketch(keyword_capacity)
+                         for band in ('positive', 'neutral', 'negative')}
+        for text, band in zip(frame['text'], frame['band']):
+            band_keywords[band].update_many(self.tokenize_text(self.preprocess_text(text)))
+        
+        return {
+            'total_feedback': len(frame),
+            'rating_distribution': {rating: stats['count'] for rating, stats in rating_stats.items()},
+            'sentiment_by_rating': {rating: stats['mean_sentiment'] for rating, stats in rating_stats.items()},
+            'rating_stats': rating_stats,
+            'category_analysis': category_analysis,
+            'keywords_by_rating_band': {band: sketch.most_common(top_n)
+                                        for band, sketch in band_keywords.items()},
+            'top_positive_keywords': band_keywords['positive'].most_common(top_n),
+            'top_negative_keywords': band_keywords['negative'].most_common(top_n)
+        }
+    
+    def detect_anomalies(self, texts: Iterable[str], threshold: float = 2.0) -> List[int]:
+        """이상 텍스트 탐지 (텍스트 길이 z-score 기반, 벡터화)"""
+        lengths = np.fromiter((len(text) for text in texts), dtype=float)
+        if lengths.size == 0:
+            return []
+        
+        std_length = lengths.std()
+        if std_length == 0:
+            # 모든 길이가 같으면 이상치가 없음
+            return []
+        
+        z_scores = np.abs(lengths - lengths.mean()) / std_length
+        return np.flatnonzero(z_scores > threshold).tolist()
+    
+    def iter_anomalies(self, texts: Iterable[str], threshold: float = 2.0,
+                       method: str = 'zscore', window: int = 1000,
+                       min_samples: int = 30) -> Iterator[Dict[str, Any]]:
+        """
+        스트리밍 이상 텍스트 탐지
         
-        time_matches = re.findall(time_pattern, text)
-        entities['times'].extend(time_matches)
+        텍스트가 도착하는 즉시 판정하므로 실시간 채팅 피드에 바로 적용할 수 있습니다.
         
-        return entities
+        Args:
+            texts: 텍스트 이터러블 (제너레이터 가능)
+            threshold: 이상으로 판정할 점수 기준
+            method: 'zscore' (누적 평균/표준편차) 또는 'mad' (슬라이딩 윈도우 중앙값/MAD)
+            window: 'mad' 방식의 윈도우 크기
+            min_samples: 판정을 시작하기 전 필요한 최소 관측 수
+        
+        Yields:
+            이상으로 판정된 텍스트의 index, text, length, score
+        """
+        detector = StreamingAnomalyDetector(threshold, method, window, min_samples)
+        
+        for i, text in enumerate(texts):
+            is_anomaly, score = detector.update(len(text))
+            if is_anomaly:
+                yield {
+                    'index': i,
+                    'text': text,
+                    'length': len(text),
+                    'score': score
+                }
+    
+    def _get_entity_extractor(self) -> EntityExtractor:
+        """개체명 추출기 (최초 사용 시 한 번만 컴파일)"""
+        if self.entity_extractor is None:
+            self.entity_extractor = EntityExtractor()
+        return self.entity_extractor
+    
+    def extract_entities(self, text: str) -> Dict[str, List[str]]:
+        """개체명 추출 (사전 + 규칙 기반, 한 번의 스캔)"""
+        return self._get_entity_extractor().extract(text)
+    
+    def extract_entities_batch(self, texts: Iterable[str]) -> List[Dict[str, List[str]]]:
+        """여러 텍스트의 개체명 일괄 추출"""
+        return self._get_entity_extractor().extract_batch(texts)
     
     def generate_report(self, analysis_results: Dict[str, Any]) -> str:
         """분석 리포트 생성"""
@@ -373,6 +733,19 @@ class TextAnalyzer:
         return "\n".join(report)
 
 
+def _shard_worker(language: str, shard: int, tasks, results):
+    """샤드 워커 프로세스: 메시지 배치를 받아 누적한 뒤 (샤드 번호, 누적기, 에러) 반환"""
+    try:
+        analyzer = TextAnalyzer(language=language)
+        aggregator = MessagePatternAggregator()
+        for batch in iter(tasks.get, None):
+            analyzer.aggregate_message_patterns(batch, aggregator)
+    except Exception as e:
+        results.put((shard, None, f"{type(e).__name__}: {e}"))
+        return
+    results.put((shard, aggregator, None))
+
+
 def main():
     """메인 실행 함수"""
     # TextAnalyzer 초기화
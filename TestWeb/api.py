@@ -0,0 +1,103 @@
+"""
+JSON 데이터 API 도구
+분석 결과(get_analysis)를 브라우저 차트용 집계값(장르별 매출, 부트스트랩 요약과 히스토그램 구간,
+회귀 계수, ROC 점, 혼동행렬)으로 줄여 압축 JSON으로 직렬화합니다.
+직렬화/gzip 결과는 데이터 지문별로 캐시되어 요청마다 다시 만들지 않습니다.
+"""
+
+import gzip
+import json
+import hashlib
+import numpy as np
+from typing import Any, Dict
+
+# 소수점 자릿수 (응답 크기 축소)
+FLOAT_DIGITS = 6
+
+
+def _round(value: float) -> float:
+    return round(float(value), FLOAT_DIGITS)
+
+
+def _rounded_list(values) -> list:
+    return [_round(value) for value in np.asarray(values, dtype=np.float64)]
+
+
+def histogram(values, bins: int = 30) -> Dict[str, list]:
+    """히스토그램 구간 경계(bins+1개)와 구간별 빈도"""
+    counts, edges = np.histogram(np.asarray(values), bins=bins)
+    return {'edges': _rounded_list(edges), 'counts': counts.tolist()}
+
+
+def project1_payload(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """장르별 총/평균 매출"""
+    totals = analysis['sales_by_genre'].set_index('Genre')['US Sales (millions)']
+    means = analysis['avg_sales_by_genre'].set_index('Genre')['US Sales (millions)']
+    return {
+        'genres': [
+            {'genre': genre, 'total_sales': _round(totals[genre]), 'mean_sales': _round(means[genre])}
+            for genre in totals.index
+        ]
+    }
+
+
+def project2_payload(analysis: Dict[str, Any], bins: int = 30) -> Dict[str, Any]:
+    """Platform 비율 신뢰구간과 중앙값 차이 검정 요약 + 부트스트랩 분포 히스토그램"""
+    return {
+        'n_bootstrap': len(analysis['bootstrap_diffs']),
+        'proportion': {
+            'estimate': _round(analysis['proportion']),
+            'ci_lower': _round(analysis['ci_lower']),
+            'ci_upper': _round(analysis['ci_upper']),
+            'histogram': histogram(analysis['bootstrap_proportions'], bins)
+        },
+        'median_difference': {
+            'observed': _round(analysis['observed_diff']),
+            'p_value': _round(analysis['p_value']),
+            'permutation_p_value': _round(analysis['permutation_p_value']),
+            'histogram': histogram(analysis['bootstrap_diffs'], bins)
+        }
+    }
+
+
+def project3_payload(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """회귀 계수, 성능 지표, ROC 점, 혼동행렬"""
+    return {
+        'linear_regression': {
+            'coefficients': {name: _round(value) for name, value in analysis['ols_params'].items()},
+            'rmse': _round(analysis['rmse']),
+            'r2': _round(analysis['r2'])
+        },
+        'logistic_regression': {
+            'coefficients': {name: _round(value) for name, value in analysis['logit_params'].items()},
+            'auc': _round(analysis['auc']),
+            'accuracy': _round(analysis['accuracy']),
+            'sensitivity': _round(analysis['sensitivity']),
+            'specificity': _round(analysis['specificity']),
+            'roc': {'fpr': _rounded_list(analysis['fpr']), 'tpr': _rounded_list(analysis['tpr'])},
+            'confusion_matrix': np.asarray(analysis['cm']).tolist()
+        }
+    }
+
+
+API_PAYLOADS = {
+    'project1': project1_payload,
+    'project2': project2_payload,
+    'project3': project3_payload
+}
+
+
+def encode_payload(payload: Dict[str, Any], fingerprint: str) -> Dict[str, Any]:
+    """
+    응답 본문을 압축 JSON과 gzip 두 형태로 직렬화
+
+    Returns:
+        body, gzip_body, etag (본문 내용 해시)
+    """
+    body = json.dumps(dict(payload, data_version=fingerprint), ensure_ascii=False,
+                      separators=(',', ':')).encode('utf-8')
+    return {
+        'body': body,
+        'gzip_body': gzip.compress(body, compresslevel=6, mtime=0),
+        'etag': hashlib.sha1(body).hexdigest()
+    }
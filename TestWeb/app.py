@@ -1,172 +1,196 @@
-from flask import Flask, render_template, jsonify
+from flask import Flask, render_template, jsonify, request, Response, url_for, abort
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LinearRegression
-from sklearn.metrics import mean_squared_error, r2_score, roc_auc_score, confusion_matrix, accuracy_score, recall_score
+from sklearn.metrics import mean_squared_error, r2_score, roc_auc_score, confusion_matrix, accuracy_score, recall_score, roc_curve
 import statsmodels.api as sm
-import io
-import base64
-from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.font_manager as fm
-import platform
-
-# 한글 폰트 설정
-if platform.system() == 'Darwin':  # macOS
-    plt.rcParams['font.family'] = 'AppleGothic'
-elif platform.system() == 'Windows':
-    plt.rcParams['font.family'] = 'Malgun Gothic'
-else:  # Linux
-    plt.rcParams['font.family'] = 'DejaVu Sans'
-    
-plt.rcParams['axes.unicode_minus'] = False
-
-app = Flask(__name__)
-
-# 데이터 로드 및 전처리
-def load_data():
-    try:
-        df = pd.read_csv("video_games.csv", encoding='unicode_escape')
-        return df
-    except:
-        # 샘플 데이터 생성 (실제 데이터가 없을 경우)
-        np.random.seed(42)
-        n_samples = 1000
-        data = {
-            'Console': np.random.choice(['Xbox 360', 'PlayStation 3', 'Nintendo DS', 'Wii'], n_samples),
-            'Title': [f'Game_{i}' for i in range(n_samples)],
-            'US Sales (millions)': np.random.exponential(0.5, n_samples),
-            'Review Score': np.random.normal(75, 15, n_samples).clip(0, 100),
-            'YearReleased': np.random.randint(2004, 2011, n_samples),
-            'Usedprice': np.random.uniform(10, 50, n_samples),
-            'Genre': np.random.choice(['Action', 'Sports', 'Racing', 'Platform', 'Shooter', 'RPG'], n_samples),
-            'Action': np.random.choice([0, 1], n_samples, p=[0.7, 0.3]),
-            'Platform': np.random.choice([0, 1], n_samples, p=[0.9, 0.1])
-        }
-        return pd.DataFrame(data)
-
-df = load_data()
+import os
+import json
+import hashlib
+import logging
+import threading
+from datetime import datetime
 
-@app.route('/')
-def index():
-    return render_template('index.html')
+from bootstrap import bootstrap_proportion, ParallelResampler
+from result_cache import ResultCache
+from dataset import DatasetManager
+from charts import CHARTS, ChartRenderer, resolve_dpi
+from api import API_PAYLOADS, encode_payload
+from jobs import JobManager
+from cube import DIMENSIONS as ORDER_DIMENSIONS, OrderCube, result_rows, result_totals
 
-@app.route('/project1')
-def project1():
-    # 프로젝트 1 분석
-    sales_by_genre = df.groupby('Genre')['US Sales (millions)'].sum().reset_index()
-    avg_sales_by_genre = df.groupby('Genre')['US Sales (millions)'].mean().reset_index()
-    
-    # 차트 생성
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-    
-    # 총 매출 차트
-    sns.barplot(data=sales_by_genre, x='US Sales (millions)', y='Genre', ax=ax1, palette='viridis')
-    ax1.set_title('총 매출별 게임 장르')
-    
-    # 평균 매출 차트
-    sns.barplot(data=avg_sales_by_genre, x='US Sales (millions)', y='Genre', ax=ax2, palette='viridis')
-    ax2.set_title('게임당 평균 매출별 장르')
-    
-    plt.tight_layout()
-    
-    # 차트를 base64로 인코딩
-    img = io.BytesIO()
-    plt.savefig(img, format='png', bbox_inches='tight', dpi=300)
-    img.seek(0)
-    chart_url = base64.b64encode(img.getvalue()).decode()
-    plt.close()
-    
-    return render_template('project1.html', chart_url=chart_url)
+# 템플릿은 저장소 루트의 templates/ 사용 (TEMPLATE_DIR로 변경 가능)
+TEMPLATE_DIR = os.environ.get('TEMPLATE_DIR',
+                              os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'templates'))
 
-@app.route('/project2')
-def project2():
-    # 프로젝트 2 분석
+app = Flask(__name__, template_folder=TEMPLATE_DIR)
+
+# 부트스트랩/순열검정 반복 수와 시드 (같은 데이터면 페이지마다 같은 결과)
+N_BOOTSTRAP = int(os.environ.get('N_BOOTSTRAP', 100000))
+BOOTSTRAP_SEED = 42
+# 재표본 계산 프로세스 수 (1이면 요청 스레드에서 직접 계산, 0이면 CPU 코어 수)
+# 웹 워커 프로세스마다 풀이 따로 생기므로 기본값은 작게 두고, 여러 워커로 실행할 때는
+# 워커 수에 맞춰 지정 (gunicorn.conf.py 참고)
+BOOTSTRAP_WORKERS = int(os.environ.get('BOOTSTRAP_WORKERS', 2)) or None
+
+resampler = ParallelResampler(workers=BOOTSTRAP_WORKERS, seed=BOOTSTRAP_SEED)
+
+# 분석 결과 캐시 (RESULT_CACHE_DIR, REDIS_URL 지정 시 재시작 후에도 재사용)
+result_cache = ResultCache(cache_dir=os.environ.get('RESULT_CACHE_DIR'),
+                           redis_url=os.environ.get('REDIS_URL'))
+# 렌더링된 차트 이미지 캐시 (차트/형식/DPI별)
+chart_cache = ResultCache(cache_dir=os.environ.get('RESULT_CACHE_DIR'), max_entries=128)
+# 모델 학습 작업 (project3 학습은 요청 경로 밖의 작업 스레드에서 실행)
+job_manager = JobManager(workers=int(os.environ.get('TRAINING_WORKERS', 1)))
+# 직렬화된 API 응답 캐시 (메모리)
+api_cache = ResultCache(max_entries=32)
+# 차트 렌더링 작업 프로세스 수 (0이면 요청 스레드에서 직접 렌더링)
+chart_renderer = ChartRenderer(workers=int(os.environ.get('RENDER_WORKERS', 2)))
+
+DATA_PATH = os.environ.get('DATA_PATH', "video_games.csv")
+
+# 컬럼 타입 (범주형은 category, 0/1 플래그는 int8)
+VIDEO_GAME_DTYPES = {
+    'Console': 'category',
+    'Genre': 'category',
+    'Action': 'int8',
+    'Platform': 'int8'
+}
+
+# 샘플 데이터 생성 (실제 데이터가 없을 경우)
+def sample_data():
+    np.random.seed(42)
+    n_samples = 1000
+    data = {
+        'Console': np.random.choice(['Xbox 360', 'PlayStation 3', 'Nintendo DS', 'Wii'], n_samples),
+        'Title': [f'Game_{i}' for i in range(n_samples)],
+        'US Sales (millions)': np.random.exponential(0.5, n_samples),
+        'Review Score': np.random.normal(75, 15, n_samples).clip(0, 100),
+        'YearReleased': np.random.randint(2004, 2011, n_samples),
+        'Usedprice': np.random.uniform(10, 50, n_samples),
+        'Genre': np.random.choice(['Action', 'Sports', 'Racing', 'Platform', 'Shooter', 'RPG'], n_samples),
+        'Action': np.random.choice([0, 1], n_samples, p=[0.7, 0.3]),
+        'Platform': np.random.choice([0, 1], n_samples, p=[0.9, 0.1])
+    }
+    return pd.DataFrame(data)
+
+def _on_data_change(old_fingerprint, new_fingerprint):
+    """데이터가 교체되면 이전 데이터의 메모리 캐시 결과 제거 (project3는 다음 요청 때 재학습 제출)"""
+    result_cache.invalidate(old_fingerprint)
+
+# 데이터셋 (첫 사용 시 로드, 스냅샷으로 빠른 재시작, 원본 변경 시 백그라운드에서 교체)
+dataset = DatasetManager(DATA_PATH,
+                         read_options={'encoding': 'unicode_escape'},
+                         dtypes=VIDEO_GAME_DTYPES,
+                         fallback=sample_data,
+                         snapshot_dir=os.environ.get('DATASET_CACHE_DIR', '.dataset_cache'),
+                         poll_interval=float(os.environ.get('DATA_POLL_INTERVAL', 2.0)),
+                         on_change=_on_data_change)
+
+def get_data():
+    """현재 데이터와 지문 반환"""
+    return dataset.get()
+
+ORDERS_PATH = os.environ.get('ORDERS_PATH', "배달의민족_가명데이터_10만건.csv")
+
+ORDER_DTYPES = {
+    '업체명': 'category',
+    '카테고리': 'category',
+    '구역': 'category',
+    '주문상태': 'category'
+}
+
+# 주문 샘플 데이터 생성 (실제 데이터가 없을 경우, db.py와 같은 컬럼)
+def sample_orders():
+    np.random.seed(42)
+    n_samples = 5000
+    restaurants = {'교촌치킨': '치킨', 'BBQ': '치킨', '도미노피자': '피자', '맥도날드': '햄버거',
+                   '홍콩반점': '중식', '김밥천국': '도시락', '신전떡볶이': '분식', '스시로': '일식'}
+    names = np.random.choice(list(restaurants), n_samples)
+    ordered_at = (pd.Timestamp('2023-01-01')
+                  + pd.to_timedelta(np.random.randint(0, 730, n_samples), unit='D')
+                  + pd.to_timedelta(np.random.randint(10 * 60, 24 * 60, n_samples), unit='min'))
+    status = np.random.choice(['주문접수', '조리중', '배달중', '배달완료', '주문취소'], n_samples)
+    data = {
+        '주문ID': [f'ORD{i + 1:08d}' for i in range(n_samples)],
+        '주문일시': ordered_at.strftime('%Y-%m-%d %H:%M:%S'),
+        '업체명': names,
+        '카테고리': [restaurants[name] for name in names],
+        '최종결제금액': np.random.randint(8000, 60000, n_samples),
+        '구역': np.random.choice(['강남구', '마포구', '송파구', '서초구', '종로구'], n_samples),
+        '주문상태': status,
+        '평점': np.where(status == '배달완료', np.random.randint(1, 6, n_samples), np.nan)
+    }
+    return pd.DataFrame(data)
+
+# 주문 집계 큐브 (조건 선택/상위 집계를 미리 집계한 배열에서 계산)
+order_cube = OrderCube()
+
+def _on_orders_change(old_fingerprint, new_fingerprint):
+    """주문 데이터가 교체되면 큐브 갱신 (뒤에 추가된 주문만 더하거나 새로 생성)"""
+    order_cube.sync(*order_dataset.get())
+
+order_dataset = DatasetManager(ORDERS_PATH,
+                               read_options={'encoding': 'utf-8-sig'},
+                               dtypes=ORDER_DTYPES,
+                               fallback=sample_orders,
+                               snapshot_dir=os.environ.get('DATASET_CACHE_DIR', '.dataset_cache'),
+                               poll_interval=float(os.environ.get('DATA_POLL_INTERVAL', 2.0)),
+                               on_change=_on_orders_change)
+
+def get_order_cube():
+    """현재 주문 데이터 기준 집계 큐브 (처음 호출 시 생성)"""
+    order_cube.sync(*order_dataset.get())
+    return order_cube
+
+# 분석 결과 형식 버전 (결과 항목이 바뀌면 올려서 저장된 이전 결과를 쓰지 않도록 함)
+ANALYSIS_VERSION = 2
+# 분석 파라미터 (캐시 키에 포함)
+PROJECT2_PARAMS = {'n_bootstrap': N_BOOTSTRAP, 'seed': BOOTSTRAP_SEED}
+PROJECT3_PARAMS = {'test_size': 0.2, 'random_state': 42}
+
+def analyze_project1(df):
+    """장르별 총/평균 매출"""
+    return {
+        'sales_by_genre': df.groupby('Genre', observed=True)['US Sales (millions)'].sum().reset_index(),
+        'avg_sales_by_genre': df.groupby('Genre', observed=True)['US Sales (millions)'].mean().reset_index()
+    }
+
+def analyze_project2(df, n_bootstrap, seed):
+    """Platform 비율 신뢰구간과 Action vs Platform 중앙값 차이 검정"""
     platform_games = df[df['Platform'] == 1]
     action_games = df[df['Action'] == 1]
     
-    # 신뢰구간 계산
-    total_games = len(df)
-    num_platform_games = len(platform_games)
-    proportion_platform = num_platform_games / total_games
-    
-    # 부트스트랩 신뢰구간
-    n_bootstrap = 1000
-    bootstrap_proportions = []
-    for _ in range(n_bootstrap):
-        sample = df.sample(n=total_games, replace=True)
-        prop = len(sample[sample['Platform'] == 1]) / total_games
-        bootstrap_proportions.append(prop)
-    
-    ci_lower = np.percentile(bootstrap_proportions, 2.5)
-    ci_upper = np.percentile(bootstrap_proportions, 97.5)
-    
-    # 가설검정
-    median_action = np.median(action_games['US Sales (millions)'])
-    median_platform = np.median(platform_games['US Sales (millions)'])
-    observed_diff = median_action - median_platform
-    
-    # 부트스트랩 가설검정
-    n_samples = 1000
-    bootstrap_diffs = []
-    for _ in range(n_samples):
-        sample_action = action_games.sample(n=len(action_games), replace=True)
-        sample_platform = platform_games.sample(n=len(platform_games), replace=True)
-        diff = np.median(sample_action['US Sales (millions)']) - np.median(sample_platform['US Sales (millions)'])
-        bootstrap_diffs.append(diff)
-    
-    p_value = np.sum(np.array(bootstrap_diffs) >= observed_diff) / n_samples
-    
-    # 차트 생성
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-    
-    # 신뢰구간 히스토그램
-    ax1.hist(bootstrap_proportions, bins=30, alpha=0.7, color='skyblue')
-    ax1.axvline(proportion_platform, color='red', linestyle='--', label=f'관찰된 비율: {proportion_platform:.3f}')
-    ax1.axvline(ci_lower, color='green', linestyle='--', label=f'95% CI 하한: {ci_lower:.3f}')
-    ax1.axvline(ci_upper, color='green', linestyle='--', label=f'95% CI 상한: {ci_upper:.3f}')
-    ax1.set_title('Platform 게임 비율의 부트스트랩 분포')
-    ax1.set_xlabel('비율')
-    ax1.set_ylabel('빈도')
-    ax1.legend()
-    
-    # 가설검정 히스토그램
-    ax2.hist(bootstrap_diffs, bins=30, alpha=0.7, color='lightcoral')
-    ax2.axvline(observed_diff, color='red', linestyle='--', label=f'관찰된 차이: {observed_diff:.3f}')
-    ax2.set_title('Action vs Platform 중앙값 차이의 부트스트랩 분포')
-    ax2.set_xlabel('중앙값 차이')
-    ax2.set_ylabel('빈도')
-    ax2.legend()
-    
-    plt.tight_layout()
-    
-    # 차트를 base64로 인코딩
-    img = io.BytesIO()
-    plt.savefig(img, format='png', bbox_inches='tight', dpi=300)
-    img.seek(0)
-    chart_url = base64.b64encode(img.getvalue()).decode()
-    plt.close()
-    
-    return render_template('project2.html', 
-                         chart_url=chart_url,
-                         proportion=proportion_platform,
-                         ci_lower=ci_lower,
-                         ci_upper=ci_upper,
-                         p_value=p_value,
-                         observed_diff=observed_diff)
+    # 부트스트랩 신뢰구간 (재표본 인덱스를 한 번에 뽑아 벡터화 계산)
+    ci = bootstrap_proportion(df['Platform'].to_numpy() == 1, n_bootstrap, seed=seed)
+    
+    # 부트스트랩 가설검정 (Action vs Platform 중앙값 차이, 프로세스 풀에서 병렬 계산)
+    action_sales = action_games['US Sales (millions)'].to_numpy()
+    platform_sales = platform_games['US Sales (millions)'].to_numpy()
+    test = resampler.difference(action_sales, platform_sales, np.median, n_bootstrap, seed=seed)
+    
+    # 순열검정 (두 장르 라벨을 섞었을 때의 중앙값 차이 분포)
+    permutation = resampler.permutation_test(action_sales, platform_sales, np.median, n_bootstrap,
+                                             seed=seed)
+    return {
+        'proportion': ci['proportion'],
+        'ci_lower': ci['ci_lower'],
+        'ci_upper': ci['ci_upper'],
+        'bootstrap_proportions': ci['replicates'],
+        'observed_diff': test['observed_diff'],
+        'p_value': test['p_value'],
+        'bootstrap_diffs': test['replicates'],
+        'permutation_p_value': permutation['p_value']
+    }
 
-@app.route('/project3')
-def project3():
-    # 프로젝트 3 분석
+def analyze_project3(df, test_size, random_state):
+    """매출 선형회귀와 평균 이상 매출 로지스틱 회귀"""
     df_cleaned = df[['US Sales (millions)', 'Review Score', 'YearReleased', 'Usedprice']].dropna()
     
     X = df_cleaned.drop(columns=['US Sales (millions)'])
     y = df_cleaned['US Sales (millions)']
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=random_state)
     
     # 선형회귀
     X_train_sm = sm.add_constant(X_train)
@@ -179,7 +203,7 @@ def project3():
     
     # 로지스틱 회귀
     y_train_logistic = (y_train > y_train.mean()).astype(int)
-    logit_model = sm.Logit(y_train_logistic, X_train_sm).fit()
+    logit_model = sm.Logit(y_train_logistic, X_train_sm).fit(disp=0)
     
     y_pred_prob = logit_model.predict(X_train_sm)
     auc = roc_auc_score(y_train_logistic, y_pred_prob)
@@ -193,57 +217,306 @@ def project3():
     sensitivity = recall_score(y_test_logistic, y_pred_test)
     specificity = cm[0, 0] / (cm[0, 0] + cm[0, 1])
     
-    # 차트 생성
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
-    
-    # 선형회귀 잔차 플롯
-    residuals = y_test - y_pred
-    ax1.scatter(y_pred, residuals, alpha=0.6)
-    ax1.axhline(y=0, color='red', linestyle='--')
-    ax1.set_xlabel('예측값')
-    ax1.set_ylabel('잔차')
-    ax1.set_title('선형회귀 잔차 vs 예측값')
-    
-    # 실제 vs 예측
-    ax2.scatter(y_test, y_pred, alpha=0.6)
-    ax2.plot([y_test.min(), y_test.max()], [y_test.min(), y_test.max()], 'r--', lw=2)
-    ax2.set_xlabel('실제값')
-    ax2.set_ylabel('예측값')
-    ax2.set_title('실제값 vs 예측값')
-    
-    # ROC 곡선
-    from sklearn.metrics import roc_curve
     fpr, tpr, _ = roc_curve(y_train_logistic, y_pred_prob)
-    ax3.plot(fpr, tpr, label=f'ROC Curve (AUC = {auc:.3f})')
-    ax3.plot([0, 1], [0, 1], 'k--', label='Random')
-    ax3.set_xlabel('False Positive Rate')
-    ax3.set_ylabel('True Positive Rate')
-    ax3.set_title('ROC 곡선')
-    ax3.legend()
-    
-    # 혼동행렬 히트맵
-    sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', ax=ax4)
-    ax4.set_title('혼동행렬')
-    ax4.set_xlabel('예측')
-    ax4.set_ylabel('실제')
-    
-    plt.tight_layout()
-    
-    # 차트를 base64로 인코딩
-    img = io.BytesIO()
-    plt.savefig(img, format='png', bbox_inches='tight', dpi=300)
-    img.seek(0)
-    chart_url = base64.b64encode(img.getvalue()).decode()
-    plt.close()
-    
+    return {
+        'ols_params': model_sm.params.to_dict(),
+        'logit_params': logit_model.params.to_dict(),
+        'y_test': y_test.to_numpy(),
+        'y_pred': y_pred.to_numpy(),
+        'fpr': fpr,
+        'tpr': tpr,
+        'cm': cm,
+        'rmse': float(rmse),
+        'r2': float(r2),
+        'auc': float(auc),
+        'accuracy': float(accuracy),
+        'sensitivity': float(sensitivity),
+        'specificity': float(specificity)
+    }
+
+ANALYSES = {
+    'project1': (analyze_project1, {}),
+    'project2': (analyze_project2, PROJECT2_PARAMS),
+    'project3': (analyze_project3, PROJECT3_PARAMS)
+}
+
+def _model_key(params):
+    """학습 파라미터 식별값"""
+    return hashlib.sha1(json.dumps(params, sort_keys=True).encode('utf-8')).hexdigest()[:8]
+
+def train_project3(data, fingerprint, params):
+    """project3 모델 학습 작업 (같은 데이터/파라미터로 저장된 결과가 있으면 재사용)"""
+    result = result_cache.get_or_compute('project3', fingerprint, dict(params, version=ANALYSIS_VERSION),
+                                         lambda: analyze_project3(data, **params))
+    return dict(result, params=params, model_key=_model_key(params), data_version=fingerprint,
+                trained_at=datetime.now().isoformat(timespec='seconds'))
+
+def submit_training(params=None):
+    """현재 데이터로 project3 모델 학습 작업 제출 (같은 작업이 진행 중이면 그 작업 반환)"""
+    data, fingerprint = get_data()
+    params = dict(PROJECT3_PARAMS, **(params or {}))
+    return job_manager.submit('project3', fingerprint, train_project3, data, fingerprint, params,
+                              params=params)
+
+def get_model():
+    """
+    가장 최근에 학습이 끝난 project3 모델
+    
+    현재 데이터로 학습된 모델이 없으면 학습을 제출하고, 이전 데이터로 학습된 모델이 있으면
+    재학습이 끝날 때까지 그 모델을 바로 반환합니다. 모델이 하나도 없을 때만 첫 학습을 기다립니다.
+    """
+    _, fingerprint = get_data()
+    job = job_manager.latest('project3', fingerprint)
+    if job is not None:
+        return job.result
+    # 이전 모델이 있으면 같은 학습 파라미터로 새 데이터에 재학습
+    stale = job_manager.latest('project3')
+    pending = submit_training(stale.result['params'] if stale is not None else None)
+    if stale is not None:
+        return stale.result
+    return pending.wait()
+
+def content_version(name, analysis):
+    """차트/API 캐시 키와 URL의 v 값 (project3는 모델의 데이터 지문 + 학습 파라미터)"""
+    if 'model_key' in analysis:
+        return f"{analysis['data_version']}-{analysis['model_key']}"
+    return get_data()[1]
+
+def get_analysis(name):
+    """현재 데이터 기준 분석 결과 (데이터 지문 + 파라미터별로 캐시, project3는 최근 학습 모델)"""
+    if name == 'project3':
+        return get_model()
+    func, params = ANALYSES[name]
+    data, fingerprint = get_data()
+    return result_cache.get_or_compute(name, fingerprint, dict(params, version=ANALYSIS_VERSION),
+                                       lambda: func(data, **params))
+
+def warm_cache():
+    """모든 분석 결과를 미리 계산해 캐시에 채우기"""
+    for name in ANALYSES:
+        get_analysis(name)
+    get_order_cube()
+
+@app.context_processor
+def chart_helpers():
+    """템플릿에서 차트 이미지 URL 생성 (데이터 지문을 v로 붙여 데이터가 바뀌면 URL도 바뀜)"""
+    def chart_src(name, fmt='png', **params):
+        return url_for('chart', name=name, fmt=fmt, v=content_version(name, get_analysis(name)), **params)
+    return {'chart_src': chart_src}
+
+@app.route('/')
+def index():
+    return render_template('index.html')
+
+@app.route('/project1')
+def project1():
+    # 프로젝트 1 분석 (캐시), 차트는 /charts/project1.png에서 별도로 제공
+    get_analysis('project1')
+    return render_template('project1.html')
+
+@app.route('/project2')
+def project2():
+    # 프로젝트 2 분석 (캐시)
+    analysis = get_analysis('project2')
+    return render_template('project2.html', 
+                         proportion=analysis['proportion'],
+                         ci_lower=analysis['ci_lower'],
+                         ci_upper=analysis['ci_upper'],
+                         p_value=analysis['p_value'],
+                         permutation_p_value=analysis['permutation_p_value'],
+                         n_bootstrap=N_BOOTSTRAP,
+                         observed_diff=analysis['observed_diff'])
+
+@app.route('/project3')
+def project3():
+    # 프로젝트 3 분석 (백그라운드에서 학습이 끝난 최근 모델)
+    analysis = get_analysis('project3')
     return render_template('project3.html',
-                         chart_url=chart_url,
-                         rmse=rmse,
-                         r2=r2,
-                         auc=auc,
-                         accuracy=accuracy,
-                         sensitivity=sensitivity,
-                         specificity=specificity)
+                         model_params=analysis['params'],
+                         trained_at=analysis['trained_at'],
+                         retraining=bool(job_manager.pending('project3')),
+                         rmse=analysis['rmse'],
+                         r2=analysis['r2'],
+                         auc=analysis['auc'],
+                         accuracy=analysis['accuracy'],
+                         sensitivity=analysis['sensitivity'],
+                         specificity=analysis['specificity'])
+
+@app.route('/charts/<name>.<any(png, svg):fmt>')
+def chart(name, fmt):
+    """
+    분석 차트 이미지
+    
+    ?size=thumbnail|screen|export 또는 ?dpi=로 해상도를 고르며, 렌더링 결과는 데이터 지문별로 캐시합니다.
+    ?v=가 현재 데이터 지문과 같으면 URL이 내용을 고정하므로 장기 캐시를 허용합니다.
+    """
+    if name not in CHARTS:
+        abort(404)
+    dpi = resolve_dpi(request.args.get('size'), request.args.get('dpi'))
+    if fmt == 'svg':
+        dpi = 72  # 벡터 출력은 DPI와 무관하므로 캐시 키를 하나로 통일
+    
+    analysis = get_analysis(name)
+    version = content_version(name, analysis)
+    image = chart_cache.get_or_compute(f'chart-{name}', version, {'fmt': fmt, 'dpi': dpi},
+                                       lambda: chart_renderer.render(name, analysis, fmt, dpi))
+    
+    response = Response(image['body'], mimetype=image['mimetype'])
+    response.set_etag(image['etag'])
+    _set_cache_headers(response, version)
+    return response.make_conditional(request)
+
+def _set_cache_headers(response, version):
+    """?v=가 현재 내용 버전과 같으면 장기 캐시, 아니면 매번 ETag로 재검증"""
+    response.cache_control.public = True
+    if request.args.get('v') == version:
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+
+@app.route('/api/<name>')
+def api(name):
+    """
+    분석 집계값 JSON (브라우저 차트용)
+    
+    직렬화/gzip 결과는 데이터 지문별로 캐시하며, Accept-Encoding에 gzip이 있으면 압축본을 보냅니다.
+    """
+    if name not in API_PAYLOADS:
+        abort(404)
+    analysis = get_analysis(name)
+    version = content_version(name, analysis)
+    encoded = api_cache.get_or_compute(
+        f'api-{name}', version, {'version': ANALYSIS_VERSION},
+        lambda: encode_payload(API_PAYLOADS[name](analysis), version))
+    
+    if 'gzip' in request.accept_encodings:
+        response = Response(encoded['gzip_body'], mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+        response.set_etag(encoded['etag'] + '-gzip')
+    else:
+        response = Response(encoded['body'], mimetype='application/json')
+        response.set_etag(encoded['etag'])
+    response.vary.add('Accept-Encoding')
+    _set_cache_headers(response, version)
+    return response.make_conditional(request)
+
+def _job_response(job):
+    """작업 상태 JSON (성공한 학습 작업은 지표 포함)"""
+    payload = job.to_dict()
+    if job.status == 'succeeded' and job.name == 'project3':
+        payload['metrics'] = {key: job.result[key]
+                              for key in ('rmse', 'r2', 'auc', 'accuracy', 'sensitivity', 'specificity')}
+    return payload
+
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """작업 목록"""
+    return jsonify({'jobs': [_job_response(job) for job in job_manager.list()]})
+
+@app.route('/api/jobs/project3', methods=['POST'])
+def retrain_project3():
+    """
+    project3 모델 재학습 요청 (202와 함께 작업 상태 URL 반환)
+    
+    JSON 본문으로 test_size(0~1), random_state(정수)를 바꿀 수 있으며,
+    학습이 끝나면 페이지/차트/API가 새 모델을 사용합니다.
+    """
+    body = request.get_json(silent=True) or {}
+    params = {}
+    try:
+        if 'test_size' in body:
+            params['test_size'] = float(body['test_size'])
+            if not 0 < params['test_size'] < 1:
+                raise ValueError("test_size는 0과 1 사이여야 합니다")
+        if 'random_state' in body:
+            params['random_state'] = int(body['random_state'])
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    job = submit_training(params)
+    response = jsonify(_job_response(job))
+    response.status_code = 202
+    response.headers['Location'] = url_for('job_status', job_id=job.job_id)
+    return response
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """작업 상태 조회"""
+    job = job_manager.get(job_id)
+    if job is None:
+        abort(404)
+    return jsonify(_job_response(job))
+
+# 주문 대시보드 차원별 표 (차원, 정렬 기준, 최대 행 수), 정렬 기준이 없으면 차원 값 순서
+ORDER_BREAKDOWNS = [
+    ('구역', 'revenue', None),
+    ('카테고리', 'revenue', None),
+    ('업체명', 'revenue', 10),
+    ('요일', None, None),
+    ('시간', None, None),
+    ('주문상태', 'orders', None)
+]
+
+def _order_filters(args):
+    """쿼리 문자열의 차원 조건 (같은 차원에 값을 여러 개 주면 그중 하나에 해당하는 주문)"""
+    filters = {}
+    for name in ORDER_DIMENSIONS:
+        values = [value for value in args.getlist(name) if value != '']
+        if values:
+            filters[name] = values
+    return filters
+
+@app.route('/orders')
+def orders():
+    """주문 대시보드 (구역/카테고리/업체명/요일/시간/주문상태 조건으로 선택)"""
+    cube = get_order_cube()
+    filters = _order_filters(request.args)
+    totals = result_totals(cube.query((), filters))
+    breakdowns = []
+    for name, sort, limit in ORDER_BREAKDOWNS:
+        rows = result_rows(cube.query([name], filters), sort=sort, limit=limit)
+        max_revenue = max((row['revenue'] for row in rows), default=0)
+        breakdowns.append({'name': name, 'rows': rows, 'max_revenue': max_revenue, 'limit': limit})
+    return render_template('orders.html',
+                         dimensions={name: cube.levels(name) for name in ORDER_DIMENSIONS},
+                         selected=filters,
+                         totals=totals,
+                         breakdowns=breakdowns,
+                         cube_info=cube.info())
+
+@app.route('/api/orders/cube')
+def order_cube_api():
+    """
+    주문 큐브 조회 JSON
+    
+    ?group_by=구역,시간 으로 결과 차원을, ?카테고리=치킨&카테고리=피자 처럼 차원별 허용 값을 지정하며
+    ?sort=orders|revenue|avg_rating, ?limit=로 상위 행만 받을 수 있습니다.
+    """
+    cube = get_order_cube()
+    group_by = [name for name in request.args.get('group_by', '').split(',') if name]
+    filters = _order_filters(request.args)
+    try:
+        result = cube.query(group_by, filters)
+        rows = result_rows(result, sort=request.args.get('sort'),
+                           limit=request.args.get('limit', type=int))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    response = jsonify({
+        'group_by': group_by,
+        'filters': filters,
+        'totals': result_totals(result),
+        'rows': rows,
+        'data_version': cube.info()['fingerprint']
+    })
+    response.add_etag()
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=8080) 
\ No newline at end of file
+    # 개발 서버 (운영: gunicorn -c gunicorn.conf.py asgi:application)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    # 시작 시 분석 결과를 백그라운드에서 미리 계산
+    threading.Thread(target=warm_cache, daemon=True).start()
+    app.run(debug=True, host='0.0.0.0', port=8080, threaded=True) 
\ No newline at end of file
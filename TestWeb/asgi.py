@@ -0,0 +1,166 @@
+"""
+ASGI 서빙 진입점
+Flask 앱(app.py)의 라우트와 템플릿을 그대로 ASGI 서버(uvicorn)에서 서빙합니다.
+요청은 경로에 따라 두 개의 스레드 풀로 나눠 실행되어, 분석/차트처럼 CPU를 많이 쓰는 요청이
+몰려도 작업 상태 조회 같은 가벼운 요청과 /healthz(이벤트 루프에서 직접 응답)는 밀리지 않습니다.
+
+실행:
+    uvicorn asgi:application --host 0.0.0.0 --port 8080 --workers 4
+    gunicorn -c gunicorn.conf.py asgi:application
+"""
+
+import io
+import os
+import sys
+import json
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+import app as flask_app
+
+logger = logging.getLogger(__name__)
+
+# CPU를 많이 쓰는 경로 (분석 페이지, 차트, 분석 API, 시작/데이터 교체 후 첫 요청에서 큐브를 만드는 주문 대시보드)
+HEAVY_PREFIXES = ('/project', '/charts/', '/api/project', '/orders', '/api/orders/')
+
+# 경로별 실행 스레드 수 (무거운 요청 동시 실행 수를 제한해 가벼운 요청의 지연을 낮게 유지)
+heavy_executor = ThreadPoolExecutor(max_workers=int(os.environ.get('HEAVY_THREADS', 4)),
+                                    thread_name_prefix='asgi-heavy')
+light_executor = ThreadPoolExecutor(max_workers=int(os.environ.get('LIGHT_THREADS', 16)),
+                                    thread_name_prefix='asgi-light')
+
+
+def build_environ(scope: Dict[str, Any], body: bytes) -> Dict[str, Any]:
+    """ASGI HTTP scope를 WSGI environ으로 변환"""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False
+    }
+    for raw_name, raw_value in scope.get('headers', []):
+        name = raw_name.decode('latin-1').upper().replace('-', '_')
+        value = raw_value.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = value
+        elif name == 'CONTENT_LENGTH':
+            environ['CONTENT_LENGTH'] = value
+        else:
+            key = f"HTTP_{name}"
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def run_wsgi(environ: Dict[str, Any]) -> Tuple[int, List[Tuple[bytes, bytes]], bytes]:
+    """Flask 앱 호출 후 (상태 코드, 헤더, 본문) 반환 (작업 스레드에서 실행)"""
+    response: Dict[str, Any] = {}
+
+    def start_response(status, headers, exc_info=None):
+        response['status'] = int(status.split(' ', 1)[0])
+        response['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                               for name, value in headers]
+
+    result = flask_app.app(environ, start_response)
+    try:
+        body = b''.join(result)
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+    return response['status'], response['headers'], body
+
+
+async def _read_body(receive) -> bytes:
+    """요청 본문 전체 읽기"""
+    chunks = []
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            break
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body', False):
+            break
+    return b''.join(chunks)
+
+
+async def _send(send, status: int, headers: List[Tuple[bytes, bytes]], body: bytes):
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def health() -> Dict[str, Any]:
+    """서버 상태 (데이터셋, 캐시, 주문 큐브, 진행 중인 학습 작업)"""
+    return {
+        'status': 'ok',
+        'pid': os.getpid(),
+        'dataset': flask_app.dataset.info(),
+        'result_cache': flask_app.result_cache.stats(),
+        'chart_cache': flask_app.chart_cache.stats(),
+        'order_cube': flask_app.order_cube.info(),
+        'pending_jobs': len(flask_app.job_manager.pending('project3'))
+    }
+
+
+async def _lifespan(receive, send):
+    """워커 시작 시 분석 결과를 백그라운드에서 미리 계산하고, 종료 시 작업 풀 정리"""
+    loop = asyncio.get_running_loop()
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            if os.environ.get('WARM_CACHE', '1') != '0':
+                loop.run_in_executor(heavy_executor, flask_app.warm_cache)
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            flask_app.dataset.stop()
+            flask_app.order_dataset.stop()
+            flask_app.job_manager.shutdown(wait=False)
+            flask_app.chart_renderer.close()
+            flask_app.resampler.close()
+            heavy_executor.shutdown(wait=False)
+            light_executor.shutdown(wait=False)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    """ASGI 애플리케이션"""
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        raise RuntimeError(f"지원하지 않는 ASGI scope입니다: {scope['type']}")
+
+    body = await _read_body(receive)
+    path = scope['path']
+
+    if path == '/healthz':
+        payload = json.dumps(health(), ensure_ascii=False).encode('utf-8')
+        await _send(send, 200, [(b'content-type', b'application/json'),
+                                (b'cache-control', b'no-store')], payload)
+        return
+
+    executor = heavy_executor if path.startswith(HEAVY_PREFIXES) else light_executor
+    loop = asyncio.get_running_loop()
+    try:
+        status, headers, response_body = await loop.run_in_executor(
+            executor, run_wsgi, build_environ(scope, body))
+    except Exception as e:
+        logger.error(f"요청 처리 실패: {scope['method']} {path} - {e}")
+        await _send(send, 500, [(b'content-type', b'text/plain; charset=utf-8')],
+                    'Internal Server Error'.encode('utf-8'))
+        return
+    await _send(send, status, headers, response_body)
@@ -0,0 +1,337 @@
+"""
+벡터화 부트스트랩 도구
+재표본 인덱스를 numpy.random.Generator.integers로 한 번에 2차원 배열로 뽑고
+행(axis=1) 단위로 통계량을 계산합니다. 메모리 사용량은 청크 크기로 제한합니다.
+ParallelResampler는 재표본을 블록으로 나눠 프로세스 풀에서 계산하며,
+블록마다 SeedSequence.spawn으로 만든 독립 난수 스트림을 사용합니다.
+"""
+
+import threading
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
+
+# 한 청크에서 만들 재표본 원소 수 상한 (int32 인덱스 + float64 값 기준 약 48MB)
+DEFAULT_CHUNK_ELEMENTS = 1 << 22
+
+
+def make_rng(seed: Any = None) -> np.random.Generator:
+    """시드(int, SeedSequence, Generator 또는 None)로 난수 생성기 생성"""
+    return np.random.default_rng(seed)
+
+
+def resample_statistic(values, statistic: Callable, n_resamples: int = 1000, seed: Any = None,
+                       chunk_elements: int = DEFAULT_CHUNK_ELEMENTS) -> np.ndarray:
+    """
+    values를 n_resamples번 복원추출해 재표본별 통계량 배열 반환
+
+    Args:
+        values: 1차원 표본
+        statistic: 2차원 배열과 axis 인자를 받는 함수 (예: np.mean, np.median)
+        n_resamples: 재표본 수
+        seed: 난수 시드 또는 Generator
+        chunk_elements: 한 번에 만들 인덱스 원소 수 상한
+    """
+    values = np.asarray(values)
+    n = len(values)
+    if n == 0:
+        raise ValueError("빈 표본은 재추출할 수 없습니다")
+
+    rng = make_rng(seed)
+    index_dtype = np.int32 if n < np.iinfo(np.int32).max else np.int64
+    rows = max(1, chunk_elements // n)
+
+    replicates = np.empty(n_resamples, dtype=np.float64)
+    for start in range(0, n_resamples, rows):
+        stop = min(start + rows, n_resamples)
+        indices = rng.integers(0, n, size=(stop - start, n), dtype=index_dtype)
+        replicates[start:stop] = statistic(values[indices], axis=1)
+    return replicates
+
+
+def percentile_interval(replicates: np.ndarray, confidence: float = 0.95):
+    """재표본 통계량의 백분위 신뢰구간 (하한, 상한)"""
+    alpha = (1 - confidence) / 2 * 100
+    lower, upper = np.percentile(replicates, [alpha, 100 - alpha])
+    return float(lower), float(upper)
+
+
+def bootstrap_proportion(mask, n_resamples: int = 1000, confidence: float = 0.95,
+                         seed: Any = None, exact: bool = False,
+                         chunk_elements: int = DEFAULT_CHUNK_ELEMENTS) -> Dict[str, Any]:
+    """
+    불리언 표본의 비율과 부트스트랩 신뢰구간
+
+    복원추출한 재표본의 True 개수는 이항분포 B(n, p)를 따르므로 인덱스를 뽑지 않고
+    개수를 직접 뽑습니다 (exact=True면 인덱스 재추출로 계산).
+
+    Returns:
+        proportion, ci_lower, ci_upper, replicates
+    """
+    mask = np.asarray(mask, dtype=bool)
+    n = len(mask)
+    if n == 0:
+        raise ValueError("빈 표본은 재추출할 수 없습니다")
+    if exact:
+        replicates = resample_statistic(mask, np.mean, n_resamples, seed, chunk_elements)
+    else:
+        replicates = make_rng(seed).binomial(n, mask.mean(), size=n_resamples) / n
+    ci_lower, ci_upper = percentile_interval(replicates, confidence)
+    return {
+        'proportion': float(mask.mean()),
+        'ci_lower': ci_lower,
+        'ci_upper': ci_upper,
+        'replicates': replicates
+    }
+
+
+def bootstrap_median_difference(a, b, n_resamples: int = 1000, seed: Any = None,
+                                chunk_elements: int = DEFAULT_CHUNK_ELEMENTS) -> Dict[str, Any]:
+    """
+    두 표본의 중앙값 차이(a - b) 부트스트랩 분포
+
+    각 표본을 독립적으로 재추출하며, p_value는 재표본 차이가 관찰된 차이 이상인 비율입니다.
+
+    Returns:
+        observed_diff, p_value, replicates
+    """
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    rng = make_rng(seed)
+
+    replicates = (resample_statistic(a, np.median, n_resamples, rng, chunk_elements)
+                  - resample_statistic(b, np.median, n_resamples, rng, chunk_elements))
+    observed_diff = float(np.median(a) - np.median(b))
+    return {
+        'observed_diff': observed_diff,
+        'p_value': float(np.mean(replicates >= observed_diff)),
+        'replicates': replicates
+    }
+
+
+def bootstrap_statistic(values, statistic: Callable = np.mean, n_resamples: int = 1000,
+                        confidence: float = 0.95, seed: Any = None,
+                        chunk_elements: int = DEFAULT_CHUNK_ELEMENTS) -> Dict[str, Any]:
+    """
+    임의 통계량의 부트스트랩 추정치, 표준오차, 신뢰구간
+
+    Returns:
+        estimate, std_error, ci_lower, ci_upper, replicates
+    """
+    values = np.asarray(values)
+    replicates = resample_statistic(values, statistic, n_resamples, seed, chunk_elements)
+    ci_lower, ci_upper = percentile_interval(replicates, confidence)
+    return {
+        'estimate': float(statistic(values[np.newaxis, :], axis=1)[0]),
+        'std_error': float(replicates.std(ddof=1)) if n_resamples > 1 else 0.0,
+        'ci_lower': ci_lower,
+        'ci_upper': ci_upper,
+        'replicates': replicates
+    }
+
+
+def _permutation_replicates(a: np.ndarray, b: np.ndarray, statistic: Callable, n_permutations: int,
+                            seed: Any = None,
+                            chunk_elements: int = DEFAULT_CHUNK_ELEMENTS) -> np.ndarray:
+    """두 표본을 합쳐 무작위로 다시 나눴을 때의 통계량 차이(a - b) 배열"""
+    pooled = np.concatenate([a, b])
+    n_a = len(a)
+    rng = make_rng(seed)
+    rows = max(1, chunk_elements // len(pooled))
+
+    replicates = np.empty(n_permutations, dtype=np.float64)
+    for start in range(0, n_permutations, rows):
+        stop = min(start + rows, n_permutations)
+        shuffled = rng.permuted(np.broadcast_to(pooled, (stop - start, len(pooled))), axis=1)
+        replicates[start:stop] = (statistic(shuffled[:, :n_a], axis=1)
+                                  - statistic(shuffled[:, n_a:], axis=1))
+    return replicates
+
+
+def _permutation_p_value(replicates: np.ndarray, observed: float, alternative: str) -> float:
+    """순열 분포 기준 p-value ((극단값 수 + 1) / (순열 수 + 1))"""
+    if alternative == 'two-sided':
+        extreme = np.count_nonzero(np.abs(replicates) >= abs(observed))
+    elif alternative == 'greater':
+        extreme = np.count_nonzero(replicates >= observed)
+    elif alternative == 'less':
+        extreme = np.count_nonzero(replicates <= observed)
+    else:
+        raise ValueError(f"지원하지 않는 대립가설입니다: {alternative}")
+    return (extreme + 1) / (len(replicates) + 1)
+
+
+def permutation_test(a, b, statistic: Callable = np.median, n_permutations: int = 1000,
+                     alternative: str = 'two-sided', seed: Any = None,
+                     chunk_elements: int = DEFAULT_CHUNK_ELEMENTS) -> Dict[str, Any]:
+    """
+    두 표본 통계량 차이(a - b)의 순열 검정
+
+    Args:
+        statistic: 2차원 배열과 axis 인자를 받는 함수 (기본: 중앙값)
+        alternative: 'two-sided', 'greater' 또는 'less'
+
+    Returns:
+        observed_diff, p_value, replicates
+    """
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    replicates = _permutation_replicates(a, b, statistic, n_permutations, seed, chunk_elements)
+    observed_diff = float(statistic(a) - statistic(b))
+    return {
+        'observed_diff': observed_diff,
+        'p_value': _permutation_p_value(replicates, observed_diff, alternative),
+        'replicates': replicates
+    }
+
+
+def _run_block(kind: str, samples: tuple, statistic: Callable, n: int,
+               seed_sequence: np.random.SeedSequence, chunk_elements: int) -> np.ndarray:
+    """블록 하나의 재표본 통계량 계산 (프로세스 풀 작업 함수)"""
+    rng = make_rng(seed_sequence)
+    if kind == 'bootstrap':
+        return resample_statistic(samples[0], statistic, n, rng, chunk_elements)
+    if kind == 'difference':
+        return (resample_statistic(samples[0], statistic, n, rng, chunk_elements)
+                - resample_statistic(samples[1], statistic, n, rng, chunk_elements))
+    if kind == 'permutation':
+        return _permutation_replicates(samples[0], samples[1], statistic, n, rng, chunk_elements)
+    raise ValueError(f"지원하지 않는 작업입니다: {kind}")
+
+
+class ParallelResampler:
+    """
+    병렬 부트스트랩/순열 검정 실행기
+
+    재표본을 block_size 단위 블록으로 나누고 블록마다 SeedSequence(seed).spawn으로 만든
+    자식 스트림을 배정하므로, 같은 seed면 작업자 수나 완료 순서와 관계없이 결과가 비트 단위로 같습니다.
+    statistic은 프로세스 간 전달을 위해 모듈 수준 함수(np.mean, np.median 등)여야 합니다.
+    """
+
+    def __init__(self, workers: Optional[int] = None, seed: Any = None, block_size: int = 10000,
+                 chunk_elements: int = DEFAULT_CHUNK_ELEMENTS,
+                 progress: Optional[Callable[[int, int], None]] = None):
+        """
+        초기화
+
+        Args:
+            workers: 작업 프로세스 수 (None이면 CPU 코어 수, 1이면 현재 프로세스에서 실행)
+            seed: 기본 난수 시드 (호출마다 같은 시드에서 다시 시작)
+            block_size: 블록당 재표본 수
+            chunk_elements: 블록 안에서 한 번에 만들 인덱스 원소 수 상한
+            progress: 블록이 끝날 때마다 (완료 재표본 수, 전체 재표본 수)로 호출할 함수
+        """
+        self.workers = workers
+        self.seed = seed
+        self.block_size = block_size
+        self.chunk_elements = chunk_elements
+        self.progress = progress
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        """프로세스 풀 (첫 사용 시 생성 후 재사용), 스레드가 여럿인 서버에서 fork하지 않도록 spawn 사용"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
+
+    def _run(self, kind: str, samples: tuple, statistic: Callable, n_resamples: int,
+             seed: Any) -> np.ndarray:
+        """재표본을 블록으로 나눠 실행하고 블록 순서대로 이어 붙이기"""
+        sizes = [min(self.block_size, n_resamples - start)
+                 for start in range(0, n_resamples, self.block_size)]
+        seed = self.seed if seed is None else seed
+        children = np.random.SeedSequence(seed).spawn(len(sizes))
+
+        results: List[Optional[np.ndarray]] = [None] * len(sizes)
+        done = 0
+        if self.workers == 1 or len(sizes) == 1:
+            for i, (size, child) in enumerate(zip(sizes, children)):
+                results[i] = _run_block(kind, samples, statistic, size, child, self.chunk_elements)
+                done += size
+                if self.progress is not None:
+                    self.progress(done, n_resamples)
+        else:
+            futures = {
+                self._pool().submit(_run_block, kind, samples, statistic, size, child,
+                                    self.chunk_elements): i
+                for i, (size, child) in enumerate(zip(sizes, children))
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                results[i] = future.result()
+                done += sizes[i]
+                if self.progress is not None:
+                    self.progress(done, n_resamples)
+
+        return np.concatenate(results) if results else np.empty(0, dtype=np.float64)
+
+    def bootstrap(self, values, statistic: Callable = np.mean, n_resamples: int = 100000,
+                  confidence: float = 0.95, seed: Any = None) -> Dict[str, Any]:
+        """
+        임의 통계량의 부트스트랩 추정치, 표준오차, 신뢰구간
+
+        Returns:
+            estimate, std_error, ci_lower, ci_upper, replicates
+        """
+        values = np.asarray(values)
+        replicates = self._run('bootstrap', (values,), statistic, n_resamples, seed)
+        ci_lower, ci_upper = percentile_interval(replicates, confidence)
+        return {
+            'estimate': float(statistic(values[np.newaxis, :], axis=1)[0]),
+            'std_error': float(replicates.std(ddof=1)) if n_resamples > 1 else 0.0,
+            'ci_lower': ci_lower,
+            'ci_upper': ci_upper,
+            'replicates': replicates
+        }
+
+    def difference(self, a, b, statistic: Callable = np.median, n_resamples: int = 100000,
+                   seed: Any = None) -> Dict[str, Any]:
+        """
+        두 표본 통계량 차이(a - b)의 부트스트랩 분포 (bootstrap_median_difference와 같은 p_value 정의)
+
+        Returns:
+            observed_diff, p_value, replicates
+        """
+        a = np.asarray(a, dtype=np.float64)
+        b = np.asarray(b, dtype=np.float64)
+        replicates = self._run('difference', (a, b), statistic, n_resamples, seed)
+        observed_diff = float(statistic(a) - statistic(b))
+        return {
+            'observed_diff': observed_diff,
+            'p_value': float(np.mean(replicates >= observed_diff)),
+            'replicates': replicates
+        }
+
+    def permutation_test(self, a, b, statistic: Callable = np.median, n_permutations: int = 100000,
+                         alternative: str = 'two-sided', seed: Any = None) -> Dict[str, Any]:
+        """
+        두 표본 통계량 차이(a - b)의 순열 검정
+
+        Returns:
+            observed_diff, p_value, replicates
+        """
+        a = np.asarray(a, dtype=np.float64)
+        b = np.asarray(b, dtype=np.float64)
+        replicates = self._run('permutation', (a, b), statistic, n_permutations, seed)
+        observed_diff = float(statistic(a) - statistic(b))
+        return {
+            'observed_diff': observed_diff,
+            'p_value': _permutation_p_value(replicates, observed_diff, alternative),
+            'replicates': replicates
+        }
+
+    def close(self):
+        """프로세스 풀 종료"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self) -> 'ParallelResampler':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
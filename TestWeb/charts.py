@@ -0,0 +1,209 @@
+"""
+차트 렌더링 도구
+분석 결과(get_analysis)로 프로젝트별 차트를 그려 PNG/SVG 바이트로 변환합니다.
+/charts/<name>.<fmt> 엔드포인트가 결과를 캐시하고 ETag/Cache-Control과 함께 내려줍니다.
+
+pyplot 전역 상태를 쓰지 않고 요청마다 Figure/FigureCanvasAgg 객체를 만들어 그리므로
+여러 스레드에서 동시에 렌더링해도 차트가 섞이지 않습니다.
+"""
+
+import io
+import hashlib
+import platform
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional
+
+import matplotlib
+import seaborn as sns
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# 한글 폰트 설정 (렌더링 작업 프로세스에서도 적용되도록 이 모듈에서 설정)
+if platform.system() == 'Darwin':  # macOS
+    matplotlib.rcParams['font.family'] = 'AppleGothic'
+elif platform.system() == 'Windows':
+    matplotlib.rcParams['font.family'] = 'Malgun Gothic'
+else:  # Linux
+    matplotlib.rcParams['font.family'] = 'DejaVu Sans'
+
+matplotlib.rcParams['axes.unicode_minus'] = False
+# SVG 요소 ID를 고정해 같은 차트는 같은 바이트(ETag)가 되도록 함
+matplotlib.rcParams['svg.hashsalt'] = 'charts'
+
+# 클라이언트 용도별 DPI (?size=thumbnail|screen|export)
+CHART_DPI = {'thumbnail': 50, 'screen': 100, 'export': 300}
+DEFAULT_DPI = CHART_DPI['screen']
+MIN_DPI = 30
+MAX_DPI = 300
+
+CHART_FORMATS = {'png': 'image/png', 'svg': 'image/svg+xml'}
+
+
+def resolve_dpi(size: Optional[str] = None, dpi: Optional[str] = None) -> int:
+    """?size 또는 ?dpi 파라미터로 렌더링 DPI 결정 (범위 밖이면 MIN_DPI~MAX_DPI로 제한)"""
+    if dpi:
+        try:
+            return max(MIN_DPI, min(MAX_DPI, int(dpi)))
+        except ValueError:
+            pass
+    return CHART_DPI.get(size or '', DEFAULT_DPI)
+
+
+def draw_project1(analysis: Dict[str, Any]):
+    """장르별 총/평균 매출 막대 차트"""
+    fig = Figure(figsize=(15, 6))
+    ax1, ax2 = fig.subplots(1, 2)
+
+    # 총 매출 차트
+    sns.barplot(data=analysis['sales_by_genre'], x='US Sales (millions)', y='Genre', ax=ax1, palette='viridis')
+    ax1.set_title('총 매출별 게임 장르')
+
+    # 평균 매출 차트
+    sns.barplot(data=analysis['avg_sales_by_genre'], x='US Sales (millions)', y='Genre', ax=ax2, palette='viridis')
+    ax2.set_title('게임당 평균 매출별 장르')
+
+    fig.tight_layout()
+    return fig
+
+
+def draw_project2(analysis: Dict[str, Any]):
+    """부트스트랩 비율 분포와 중앙값 차이 분포 히스토그램"""
+    proportion_platform = analysis['proportion']
+    ci_lower, ci_upper = analysis['ci_lower'], analysis['ci_upper']
+    observed_diff = analysis['observed_diff']
+
+    fig = Figure(figsize=(15, 6))
+    ax1, ax2 = fig.subplots(1, 2)
+
+    # 신뢰구간 히스토그램
+    ax1.hist(analysis['bootstrap_proportions'], bins=30, alpha=0.7, color='skyblue')
+    ax1.axvline(proportion_platform, color='red', linestyle='--', label=f'관찰된 비율: {proportion_platform:.3f}')
+    ax1.axvline(ci_lower, color='green', linestyle='--', label=f'95% CI 하한: {ci_lower:.3f}')
+    ax1.axvline(ci_upper, color='green', linestyle='--', label=f'95% CI 상한: {ci_upper:.3f}')
+    ax1.set_title('Platform 게임 비율의 부트스트랩 분포')
+    ax1.set_xlabel('비율')
+    ax1.set_ylabel('빈도')
+    ax1.legend()
+
+    # 가설검정 히스토그램
+    ax2.hist(analysis['bootstrap_diffs'], bins=30, alpha=0.7, color='lightcoral')
+    ax2.axvline(observed_diff, color='red', linestyle='--', label=f'관찰된 차이: {observed_diff:.3f}')
+    ax2.set_title('Action vs Platform 중앙값 차이의 부트스트랩 분포')
+    ax2.set_xlabel('중앙값 차이')
+    ax2.set_ylabel('빈도')
+    ax2.legend()
+
+    fig.tight_layout()
+    return fig
+
+
+def draw_project3(analysis: Dict[str, Any]):
+    """회귀 잔차, 실제 vs 예측, ROC 곡선, 혼동행렬"""
+    y_test, y_pred = analysis['y_test'], analysis['y_pred']
+
+    fig = Figure(figsize=(15, 12))
+    (ax1, ax2), (ax3, ax4) = fig.subplots(2, 2)
+
+    # 선형회귀 잔차 플롯
+    residuals = y_test - y_pred
+    ax1.scatter(y_pred, residuals, alpha=0.6)
+    ax1.axhline(y=0, color='red', linestyle='--')
+    ax1.set_xlabel('예측값')
+    ax1.set_ylabel('잔차')
+    ax1.set_title('선형회귀 잔차 vs 예측값')
+
+    # 실제 vs 예측
+    ax2.scatter(y_test, y_pred, alpha=0.6)
+    ax2.plot([y_test.min(), y_test.max()], [y_test.min(), y_test.max()], 'r--', lw=2)
+    ax2.set_xlabel('실제값')
+    ax2.set_ylabel('예측값')
+    ax2.set_title('실제값 vs 예측값')
+
+    # ROC 곡선
+    ax3.plot(analysis['fpr'], analysis['tpr'], label=f"ROC Curve (AUC = {analysis['auc']:.3f})")
+    ax3.plot([0, 1], [0, 1], 'k--', label='Random')
+    ax3.set_xlabel('False Positive Rate')
+    ax3.set_ylabel('True Positive Rate')
+    ax3.set_title('ROC 곡선')
+    ax3.legend()
+
+    # 혼동행렬 히트맵
+    sns.heatmap(analysis['cm'], annot=True, fmt='d', cmap='Blues', ax=ax4)
+    ax4.set_title('혼동행렬')
+    ax4.set_xlabel('예측')
+    ax4.set_ylabel('실제')
+
+    fig.tight_layout()
+    return fig
+
+
+CHARTS = {
+    'project1': draw_project1,
+    'project2': draw_project2,
+    'project3': draw_project3
+}
+
+
+def render_chart(name: str, analysis: Dict[str, Any], fmt: str = 'png',
+                 dpi: int = DEFAULT_DPI) -> Dict[str, Any]:
+    """
+    차트를 그려 이미지 바이트로 변환
+
+    Returns:
+        body (이미지 바이트), etag (내용 해시), mimetype
+    """
+    fig = CHARTS[name](analysis)
+    FigureCanvasAgg(fig)
+    buffer = io.BytesIO()
+    # SVG 생성 시각 메타데이터를 빼서 같은 차트는 같은 바이트(ETag)가 되도록 함
+    metadata = {'Date': None} if fmt == 'svg' else None
+    fig.savefig(buffer, format=fmt, bbox_inches='tight', dpi=dpi, metadata=metadata)
+    body = buffer.getvalue()
+    return {
+        'body': body,
+        'etag': hashlib.sha1(body).hexdigest(),
+        'mimetype': CHART_FORMATS[fmt]
+    }
+
+
+class ChartRenderer:
+    """
+    제한된 크기의 렌더링 작업 풀
+
+    Agg 렌더링은 GIL을 잡고 있으므로 여러 요청이 동시에 렌더링할 때 서로 막지 않도록
+    작업 프로세스에서 실행합니다. 동시에 실행되는 렌더링은 workers개로 제한되고 나머지는 대기합니다.
+    """
+
+    def __init__(self, workers: int = 2):
+        """
+        초기화
+
+        Args:
+            workers: 렌더링 작업 프로세스 수 (0이면 호출한 스레드에서 직접 렌더링)
+        """
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        """작업 풀 (첫 사용 시 생성), 스레드가 여럿인 서버에서 fork하지 않도록 spawn 사용"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
+
+    def render(self, name: str, analysis: Dict[str, Any], fmt: str = 'png',
+               dpi: int = DEFAULT_DPI) -> Dict[str, Any]:
+        """차트 렌더링 (render_chart와 같은 결과 형식)"""
+        if self.workers <= 0:
+            return render_chart(name, analysis, fmt, dpi)
+        return self._pool().submit(render_chart, name, analysis, fmt, dpi).result()
+
+    def close(self):
+        """작업 풀 종료"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
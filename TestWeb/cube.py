@@ -0,0 +1,451 @@
+"""
+주문 집계 큐브 도구
+배달의민족 주문 데이터를 구역 × 카테고리 × 업체명 × 요일 × 시간 × 주문상태 조합별로 미리 집계해
+범주 코드로 인덱싱하는 밀집 NumPy 배열에 담습니다. 조건 선택(slice)과 상위 집계(roll-up)는
+pandas groupby 없이 배열 인덱싱과 합계로 계산하고, 새 주문은 해당 칸에만 더해 증분 갱신합니다.
+
+카테고리는 대부분 업체명으로 정해지므로 두 차원을 따로 축으로 두지 않고 실제로 나온
+(업체명, 카테고리) 조합을 하나의 축('업체')으로 둡니다. 업체명/카테고리 조회는 이 축을 조합의
+업체명 또는 카테고리로 묶어 계산합니다. 집계값 배열은 값이 들어가는 가장 작은 정수 타입으로
+시작해 넘칠 때만 넓힙니다.
+
+자주 쓰는 축 조합의 상위 집계 배열(cuboid)은 처음 조회할 때 만들어 보관하고 함께 갱신하므로,
+같은 조합의 다음 조회는 작은 배열만 읽습니다.
+
+메모리: 기본 배열 칸 수는 구역 × (업체명, 카테고리) 조합 × 요일 × 시간 × 주문상태이며, 칸마다
+약 10바이트입니다. db.py로 만든 10만 건(25 × 298 × 7 × 14 × 5 ≈ 365만 칸)은 약 37MB이고,
+웹 워커 프로세스마다 따로 가집니다.
+"""
+
+import itertools
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 큐브 차원 (조회에 쓰는 이름)
+DIMENSIONS = ('구역', '카테고리', '업체명', '요일', '시간', '주문상태')
+WEEKDAYS = ['월', '화', '수', '목', '금', '토', '일']
+# 미리 정해진 값 목록이 있는 차원 (결과를 이 순서로 정렬, 나머지 차원은 값 순서로 정렬)
+PRESET_LEVELS = {'요일': WEEKDAYS}
+MISSING_LABEL = '(없음)'
+
+# 배열 축 (업체 축의 값은 (업체명, 카테고리) 조합)
+AXES = ('구역', '업체', '요일', '시간', '주문상태')
+STORE_AXIS = AXES.index('업체')
+STORE_DIMENSIONS = ('업체명', '카테고리')
+DIMENSION_AXIS = {name: STORE_AXIS if name in STORE_DIMENSIONS else AXES.index(name)
+                  for name in DIMENSIONS}
+
+# 집계값별 초기 배열 타입 (칸 값이 넘치면 INTEGER_TYPES 순서로 넓힘)
+MEASURE_DTYPES = {
+    'orders': np.int16,
+    'revenue': np.int32,
+    'rating_sum': np.int16,
+    'rating_count': np.int16
+}
+INTEGER_TYPES = (np.int16, np.int32, np.int64)
+# 조회 결과에서 정렬 기준으로 쓸 수 있는 값
+MEASURE_NAMES = ('orders', 'revenue', 'avg_rating')
+
+
+def order_dimensions(df: pd.DataFrame) -> Dict[str, Any]:
+    """주문 데이터프레임에서 축별 값 추출 (요일/시간은 주문일시에서 계산)"""
+    ordered_at = pd.to_datetime(df['주문일시'], format='%Y-%m-%d %H:%M:%S', errors='coerce')
+    stores = [df[name].astype(object).where(df[name].notna(), MISSING_LABEL) for name in STORE_DIMENSIONS]
+    return {
+        '구역': df['구역'],
+        '업체': pd.MultiIndex.from_arrays(stores),
+        '요일': ordered_at.dt.dayofweek.map(dict(enumerate(WEEKDAYS))),
+        '시간': ordered_at.dt.hour.astype('Int64'),
+        '주문상태': df['주문상태']
+    }
+
+
+def order_measures(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """주문별 집계값 (평점은 배달완료 주문에만 있으므로 평점 수를 따로 셈)"""
+    rating = pd.to_numeric(df['평점'], errors='coerce')
+    return {
+        'orders': np.ones(len(df), dtype=np.int64),
+        'revenue': pd.to_numeric(df['최종결제금액'], errors='coerce').fillna(0).to_numpy(np.int64),
+        'rating_sum': rating.fillna(0).to_numpy(np.int64),
+        'rating_count': rating.notna().to_numpy(np.int64)
+    }
+
+
+def _label(value: Any) -> Any:
+    """NumPy 스칼라를 파이썬 값으로 변환 (JSON 직렬화용, 업체 조합은 원소별로 변환)"""
+    if isinstance(value, tuple):
+        return tuple(_label(item) for item in value)
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _sort_key(label: Any) -> Tuple[bool, Any]:
+    """값 순서 정렬 키 (없음은 마지막)"""
+    missing = label == MISSING_LABEL
+    return missing, 0 if missing else label
+
+
+def _fitting_dtype(values: np.ndarray, minimum=np.int16):
+    """값이 들어가는 가장 작은 정수 타입 (minimum 이상)"""
+    low, high = (int(values.min()), int(values.max())) if values.size else (0, 0)
+    for dtype in INTEGER_TYPES:
+        if np.dtype(dtype).itemsize >= np.dtype(minimum).itemsize \
+                and np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max:
+            return dtype
+    raise OverflowError("집계값이 int64 범위를 넘었습니다")
+
+
+def _flat_index(codes: np.ndarray, key: Tuple[int, ...], shape: Tuple[int, ...]) -> np.ndarray:
+    """주문별 범주 코드를 cuboid 배열의 1차원 위치로 변환"""
+    if not key:
+        return np.zeros(len(codes), dtype=np.intp)
+    return np.ravel_multi_index(tuple(codes[:, axis] for axis in key), shape)
+
+
+class CubeState:
+    """큐브 배열과 범주 코드표 (재생성 시 교체 단위)"""
+
+    BASE = tuple(range(len(AXES)))
+
+    def __init__(self):
+        self.levels: List[List[Any]] = [list(PRESET_LEVELS.get(name, [])) for name in AXES]
+        self.index: List[Dict[Any, int]] = [{label: code for code, label in enumerate(levels)}
+                                            for levels in self.levels]
+        # 축 번호 튜플 → 집계값별 배열 (BASE는 모든 축을 가진 기본 배열)
+        self.cuboids: 'OrderedDict[Tuple[int, ...], Dict[str, np.ndarray]]' = OrderedDict()
+        self.rows = 0
+        self.first_order_id: Optional[str] = None
+        self.last_order_id: Optional[str] = None
+        self.fingerprint: Optional[str] = None
+        self.updated_at = datetime.now()
+
+    def shape(self, key: Tuple[int, ...]) -> Tuple[int, ...]:
+        return tuple(len(self.levels[axis]) for axis in key)
+
+    def encode(self, axis: int, values) -> np.ndarray:
+        """축 값을 범주 코드로 변환 (처음 보는 값은 새 코드 추가)"""
+        local_codes, uniques = pd.factorize(values)
+        mapping = [self._code(axis, _label(value)) for value in uniques]
+        if (local_codes < 0).any():
+            local_codes = np.where(local_codes < 0, len(mapping), local_codes)
+            mapping.append(self._code(axis, MISSING_LABEL))
+        return np.asarray(mapping, dtype=np.intp)[local_codes]
+
+    def _code(self, axis: int, label: Any) -> int:
+        code = self.index[axis].get(label)
+        if code is None:
+            code = len(self.levels[axis])
+            self.levels[axis].append(label)
+            self.index[axis][label] = code
+        return code
+
+    def dimension_labels(self, name: str) -> List[Any]:
+        """차원의 축 코드별 값 (업체명/카테고리는 업체 조합에서 꺼냄)"""
+        levels = self.levels[DIMENSION_AXIS[name]]
+        if name in STORE_DIMENSIONS:
+            position = STORE_DIMENSIONS.index(name)
+            return [store[position] for store in levels]
+        return levels
+
+    def fit_shapes(self):
+        """새 범주가 생긴 축을 0으로 늘려 모든 배열 모양을 코드표에 맞춤"""
+        if self.BASE not in self.cuboids:
+            self.cuboids[self.BASE] = {measure: np.zeros(self.shape(self.BASE), dtype=dtype)
+                                       for measure, dtype in MEASURE_DTYPES.items()}
+            self.cuboids.move_to_end(self.BASE, last=False)
+        for key, arrays in self.cuboids.items():
+            target = self.shape(key)
+            for measure, array in arrays.items():
+                if array.shape != target:
+                    arrays[measure] = np.pad(array, [(0, new - old) for old, new in zip(array.shape, target)])
+
+    def nbytes(self) -> int:
+        return sum(array.nbytes for arrays in self.cuboids.values() for array in arrays.values())
+
+
+class OrderCube:
+    """주문 집계 큐브 (스레드 안전)"""
+
+    def __init__(self, max_cuboids: int = 32):
+        """
+        초기화
+
+        Args:
+            max_cuboids: 보관할 상위 집계 배열 수 (초과 시 오래 조회하지 않은 것부터 제거, 기본 배열은 항상 유지)
+        """
+        self.max_cuboids = max_cuboids
+        self._state: Optional[CubeState] = None
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+
+    # ---- 적재 ----
+
+    def _ingest(self, state: CubeState, df: pd.DataFrame):
+        """주문을 모든 배열의 해당 칸에 더하기 (칸 값이 타입 범위를 넘으면 배열 타입을 넓힘)"""
+        axis_values = order_dimensions(df)
+        codes = np.empty((len(df), len(AXES)), dtype=np.intp)
+        for axis, name in enumerate(AXES):
+            codes[:, axis] = state.encode(axis, axis_values[name])
+        measures = order_measures(df)
+
+        state.fit_shapes()
+        for key, arrays in state.cuboids.items():
+            cells, inverse = np.unique(_flat_index(codes, key, state.shape(key)), return_inverse=True)
+            for measure, array in arrays.items():
+                added = np.zeros(len(cells), dtype=np.int64)
+                np.add.at(added, inverse.reshape(-1), measures[measure])
+                updated = array.reshape(-1)[cells].astype(np.int64) + added
+                dtype = _fitting_dtype(updated, minimum=array.dtype)
+                if dtype != array.dtype:
+                    array = arrays[measure] = array.astype(dtype)
+                array.reshape(-1)[cells] = updated
+
+        if len(df):
+            if state.rows == 0:
+                state.first_order_id = str(df['주문ID'].iloc[0])
+            state.last_order_id = str(df['주문ID'].iloc[-1])
+        state.rows += len(df)
+        state.updated_at = datetime.now()
+
+    def _is_append(self, state: CubeState, df: pd.DataFrame) -> bool:
+        """새 데이터가 이미 적재한 주문 뒤에 행만 추가된 것인지 (첫/마지막 주문ID로 확인)"""
+        return (0 < state.rows < len(df)
+                and str(df['주문ID'].iloc[0]) == state.first_order_id
+                and str(df['주문ID'].iloc[state.rows - 1]) == state.last_order_id)
+
+    def sync(self, df: pd.DataFrame, fingerprint: str) -> bool:
+        """
+        데이터에 맞춰 큐브 갱신
+
+        행이 뒤에 추가된 경우에는 추가된 주문만 더하고, 그 밖의 변경은 큐브를 새로 만들어 교체합니다.
+
+        Returns:
+            갱신 여부
+        """
+        state = self._state
+        if state is not None and state.fingerprint == fingerprint:
+            return False
+        with self._sync_lock:
+            state = self._state
+            if state is not None and state.fingerprint == fingerprint:
+                return False
+
+            if state is not None and self._is_append(state, df):
+                tail = df.iloc[state.rows:]
+                with self._lock:
+                    self._ingest(state, tail)
+                    state.fingerprint = fingerprint
+                logger.info(f"주문 큐브 증분 갱신: {len(tail)}건 추가 (총 {state.rows}건)")
+                return True
+
+            fresh = CubeState()
+            self._ingest(fresh, df)
+            fresh.fingerprint = fingerprint
+            with self._lock:
+                self._state = fresh
+        logger.info(f"주문 큐브 생성: {fresh.rows}건, 기본 배열 {fresh.shape(CubeState.BASE)} "
+                    f"({fresh.nbytes() / 1e6:.1f}MB)")
+        return True
+
+    # ---- 조회 ----
+
+    def _cuboid(self, state: CubeState, key: Tuple[int, ...]) -> Dict[str, np.ndarray]:
+        """축 조합의 집계 배열 (없으면 가장 작은 상위 배열에서 합계로 만들어 보관)"""
+        arrays = state.cuboids.get(key)
+        if arrays is not None:
+            if key != CubeState.BASE:
+                state.cuboids.move_to_end(key)
+            return arrays
+
+        source_key = min((candidate for candidate in state.cuboids if set(key) <= set(candidate)),
+                         key=lambda candidate: state.cuboids[candidate]['orders'].size)
+        drop = tuple(position for position, axis in enumerate(source_key) if axis not in key)
+        arrays = {}
+        for measure, array in state.cuboids[source_key].items():
+            summed = np.asarray(array.sum(axis=drop, dtype=np.int64))
+            arrays[measure] = summed.astype(_fitting_dtype(summed, minimum=MEASURE_DTYPES[measure]))
+        state.cuboids[key] = arrays
+
+        while len(state.cuboids) > self.max_cuboids + 1:
+            oldest = next(candidate for candidate in state.cuboids if candidate != CubeState.BASE)
+            del state.cuboids[oldest]
+        return arrays
+
+    @staticmethod
+    def _parse_label(name: str, value: Any) -> Any:
+        """쿼리 문자열 값을 차원 값 타입으로 변환 (시간은 정수)"""
+        if name == '시간' and isinstance(value, str) and value.isdigit():
+            return int(value)
+        return value
+
+    def _select(self, state: CubeState, axis: int, filters: Dict[str, List[Any]]) -> np.ndarray:
+        """축에서 조건에 맞는 코드 (해당 축 차원의 조건을 모두 만족)"""
+        codes = np.arange(len(state.levels[axis]), dtype=np.intp)
+        for name, values in filters.items():
+            if DIMENSION_AXIS[name] != axis:
+                continue
+            labels = state.dimension_labels(name)
+            allowed = set(values)
+            codes = codes[[labels[code] in allowed for code in codes]] if len(codes) else codes
+        return codes
+
+    def _group(self, state: CubeState, names: List[str],
+               codes: np.ndarray) -> Tuple[List[List[Any]], np.ndarray]:
+        """
+        축 코드를 결과 차원 값으로 묶기
+
+        Returns:
+            차원별 값 목록 (표시 순서), 코드별 결과 위치 (차원 값 조합의 1차원 위치)
+        """
+        labels, positions = [], []
+        for name in names:
+            code_labels = state.dimension_labels(name)
+            selected = [code_labels[code] for code in codes]
+            if name in PRESET_LEVELS:
+                ordered = [label for label in code_labels if label in set(selected)]
+            else:
+                ordered = sorted(set(selected), key=_sort_key)
+            lookup = {label: position for position, label in enumerate(ordered)}
+            labels.append(ordered)
+            positions.append(np.asarray([lookup[label] for label in selected], dtype=np.intp))
+        shape = tuple(len(ordered) for ordered in labels)
+        return labels, np.ravel_multi_index(tuple(positions), shape) if names else np.zeros(len(codes), np.intp)
+
+    def query(self, group_by: Sequence[str] = (),
+              filters: Optional[Dict[str, Iterable[Any]]] = None) -> Dict[str, Any]:
+        """
+        조건 선택 + 상위 집계
+
+        Args:
+            group_by: 결과에 남길 차원 (순서대로 결과 배열의 축)
+            filters: 차원별 허용 값 목록 (없는 값은 무시, 목록이 모두 없는 값이면 결과는 0)
+
+        Returns:
+            group_by, labels (차원별 값 목록), 집계값별 배열 (모양은 labels 길이)
+        """
+        group_by = list(group_by)
+        filters = {name: [self._parse_label(name, value) for value in values]
+                   for name, values in (filters or {}).items()}
+        unknown = [name for name in group_by + list(filters) if name not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"알 수 없는 차원입니다: {', '.join(map(str, unknown))}")
+        if len(set(group_by)) != len(group_by):
+            raise ValueError("group_by에 같은 차원이 중복되었습니다")
+
+        with self._lock:
+            state = self._state
+            if state is None:
+                raise RuntimeError("주문 큐브가 아직 만들어지지 않았습니다")
+            key = tuple(sorted({DIMENSION_AXIS[name] for name in group_by + list(filters)}))
+            arrays = self._cuboid(state, key)
+
+            # 축별로 조건에 맞는 코드를 고르고, 결과 차원 값으로 묶을 위치 계산
+            selectors, groups, axis_dimensions = [], [], []
+            labels = {}
+            for axis in key:
+                codes = self._select(state, axis, filters)
+                names = [name for name in group_by if DIMENSION_AXIS[name] == axis]
+                axis_labels, group_index = self._group(state, names, codes)
+                labels.update(zip(names, axis_labels))
+                selectors.append(codes)
+                groups.append((group_index, tuple(len(values) for values in axis_labels)))
+                axis_dimensions.append(names)
+
+            result_dimensions = [name for names in axis_dimensions for name in names]
+            order = [result_dimensions.index(name) for name in group_by]
+            result = {'group_by': group_by, 'labels': [labels[name] for name in group_by]}
+            for measure, array in arrays.items():
+                selected = array[np.ix_(*selectors)] if selectors else array
+                # 축마다 코드를 결과 위치로 모아 더함 (묶을 차원이 없는 축은 하나로 합쳐짐)
+                summed = selected.astype(np.int64)
+                for position, (group_index, shape) in enumerate(groups):
+                    moved = np.moveaxis(summed, position, 0)
+                    grouped = np.zeros((int(np.prod(shape)),) + moved.shape[1:], dtype=np.int64)
+                    np.add.at(grouped, group_index, moved)
+                    summed = np.moveaxis(grouped, 0, position)
+                shape = tuple(length for _, group_shape in groups for length in group_shape)
+                result[measure] = summed.reshape(shape).transpose(order)
+        return result
+
+    def levels(self, name: str) -> List[Any]:
+        """차원 값 목록 (표시 순서)"""
+        state = self._state
+        if state is None:
+            return []
+        labels = state.dimension_labels(name)
+        if name in PRESET_LEVELS:
+            return list(labels)
+        return sorted(set(labels), key=_sort_key)
+
+    def info(self) -> Dict[str, Any]:
+        """큐브 상태 요약"""
+        state = self._state
+        if state is None:
+            return {'built': False}
+        with self._lock:
+            return {
+                'built': True,
+                'rows': state.rows,
+                'fingerprint': state.fingerprint,
+                'shape': dict(zip(AXES, state.shape(CubeState.BASE))),
+                'cuboids': len(state.cuboids),
+                'memory_mb': round(state.nbytes() / 1e6, 1),
+                'updated_at': state.updated_at.isoformat(timespec='seconds')
+            }
+
+
+def _avg_rating(rating_sum: int, rating_count: int) -> Optional[float]:
+    return round(rating_sum / rating_count, 3) if rating_count else None
+
+
+def result_totals(result: Dict[str, Any]) -> Dict[str, Any]:
+    """조회 결과 전체 합계"""
+    rating_sum, rating_count = int(result['rating_sum'].sum()), int(result['rating_count'].sum())
+    return {
+        'orders': int(result['orders'].sum()),
+        'revenue': int(result['revenue'].sum()),
+        'avg_rating': _avg_rating(rating_sum, rating_count),
+        'rated_orders': rating_count
+    }
+
+
+def result_rows(result: Dict[str, Any], sort: Optional[str] = None,
+                limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    조회 결과를 행 목록으로 변환 (주문이 없는 조합은 제외)
+
+    Args:
+        sort: 내림차순 정렬 기준 (MEASURE_NAMES 중 하나, 없으면 차원 값 순서)
+        limit: 최대 행 수 (0 이상)
+    """
+    if sort is not None and sort not in MEASURE_NAMES:
+        raise ValueError(f"정렬 기준은 {', '.join(MEASURE_NAMES)} 중 하나여야 합니다: {sort}")
+    if limit is not None and limit < 0:
+        raise ValueError(f"limit은 0 이상이어야 합니다: {limit}")
+    orders = result['orders'].reshape(-1)
+    revenue = result['revenue'].reshape(-1)
+    rating_sum = result['rating_sum'].reshape(-1)
+    rating_count = result['rating_count'].reshape(-1)
+
+    rows = []
+    for position, labels in enumerate(itertools.product(*result['labels'])):
+        if orders[position] == 0:
+            continue
+        row = dict(zip(result['group_by'], labels))
+        row.update({
+            'orders': int(orders[position]),
+            'revenue': int(revenue[position]),
+            'avg_rating': _avg_rating(int(rating_sum[position]), int(rating_count[position]))
+        })
+        rows.append(row)
+
+    if sort is not None:
+        rows.sort(key=lambda row: -1 if row[sort] is None else row[sort], reverse=True)
+    return rows[:limit] if limit is not None else rows
@@ -0,0 +1,257 @@
+"""
+데이터셋 관리 도구
+CSV를 처음 사용할 때 읽고(지연 로딩), 컬럼 타입을 지정하며, 빠른 재시작을 위해
+바이너리 스냅샷(Parquet, 없으면 pickle)을 남깁니다. 감시 스레드가 원본 파일 변경을 감지하면
+백그라운드에서 새 데이터프레임을 읽어 원자적으로 교체하므로 요청은 로딩을 기다리지 않습니다.
+"""
+
+import os
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from result_cache import dataset_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+class DatasetState:
+    """현재 데이터프레임과 메타데이터 (교체 단위)"""
+
+    def __init__(self, df: pd.DataFrame, fingerprint: str, signature: Optional[Tuple[int, int]],
+                 source: str):
+        self.df = df
+        self.fingerprint = fingerprint
+        self.signature = signature
+        self.source = source  # 'csv', 'snapshot', 'fallback'
+        self.loaded_at = datetime.now()
+
+
+class DatasetManager:
+    """지연 로딩/핫 리로드 데이터셋 관리 클래스 (스레드 안전)"""
+
+    def __init__(self, path: str, read_options: Optional[Dict[str, Any]] = None,
+                 dtypes: Optional[Dict[str, str]] = None,
+                 fallback: Optional[Callable[[], pd.DataFrame]] = None,
+                 snapshot_dir: Optional[str] = None, poll_interval: float = 2.0,
+                 on_change: Optional[Callable[[Optional[str], str], None]] = None):
+        """
+        초기화
+
+        Args:
+            path: 원본 CSV 경로
+            read_options: pd.read_csv 추가 인자 (예: encoding)
+            dtypes: 컬럼별 타입 (없는 컬럼이나 변환 실패 컬럼은 원래 타입 유지)
+            fallback: 원본이 없거나 읽기 실패 시 데이터프레임을 만들 함수
+            snapshot_dir: 스냅샷 저장 디렉토리 (없으면 스냅샷을 쓰지 않음)
+            poll_interval: 원본 변경 확인 간격(초), 0이면 감시하지 않음
+            on_change: 데이터가 교체될 때 (이전 지문, 새 지문)으로 호출할 함수
+        """
+        self.path = path
+        self.read_options = read_options or {}
+        self.dtypes = dtypes or {}
+        self.fallback = fallback
+        self.snapshot_dir = snapshot_dir
+        self.poll_interval = poll_interval
+        self.on_change = on_change
+
+        self._state: Optional[DatasetState] = None
+        self._load_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    def _signature(self) -> Optional[Tuple[int, int]]:
+        """원본 파일 (수정 시각, 크기), 없으면 None"""
+        try:
+            stat = os.stat(self.path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def _apply_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """컬럼 타입 지정"""
+        for column, dtype in self.dtypes.items():
+            if column in df.columns and str(df[column].dtype) != dtype:
+                try:
+                    df[column] = df[column].astype(dtype)
+                except (TypeError, ValueError) as e:
+                    logger.warning(f"컬럼 타입 변환 실패, 원래 타입 유지: {column} -> {dtype} ({e})")
+        return df
+
+    # ---- 스냅샷 ----
+
+    def _snapshot_paths(self) -> Tuple[str, str]:
+        name = os.path.splitext(os.path.basename(self.path))[0]
+        return (os.path.join(self.snapshot_dir, f"{name}.snapshot"),
+                os.path.join(self.snapshot_dir, f"{name}.snapshot.json"))
+
+    def _read_snapshot(self, signature: Tuple[int, int]) -> Optional[DatasetState]:
+        """원본과 같은 시그니처로 만든 스냅샷이 있으면 읽기"""
+        if not self.snapshot_dir:
+            return None
+        data_path, meta_path = self._snapshot_paths()
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if tuple(meta['signature']) != tuple(signature) or meta.get('dtypes') != self.dtypes:
+                return None
+            if meta['format'] == 'parquet':
+                df = pd.read_parquet(data_path)
+            else:
+                df = pd.read_pickle(data_path)
+            return DatasetState(df, meta['fingerprint'], signature, 'snapshot')
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"스냅샷 읽기 실패, 원본을 다시 읽습니다: {e}")
+            return None
+
+    def _write_snapshot(self, state: DatasetState):
+        """스냅샷 저장 (Parquet 엔진이 없으면 pickle), 임시 파일 후 교체"""
+        if not self.snapshot_dir:
+            return
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        data_path, meta_path = self._snapshot_paths()
+        temp_path = f"{data_path}.{os.getpid()}.tmp"
+        try:
+            try:
+                state.df.to_parquet(temp_path, index=False)
+                snapshot_format = 'parquet'
+            except ImportError:
+                state.df.to_pickle(temp_path)
+                snapshot_format = 'pickle'
+            os.replace(temp_path, data_path)
+
+            meta_temp_path = f"{meta_path}.{os.getpid()}.tmp"
+            with open(meta_temp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'source': self.path,
+                    'signature': list(state.signature),
+                    'fingerprint': state.fingerprint,
+                    'format': snapshot_format,
+                    'dtypes': self.dtypes,
+                    'rows': len(state.df),
+                    'created_at': datetime.now().isoformat()
+                }, f, ensure_ascii=False)
+            os.replace(meta_temp_path, meta_path)
+        except Exception as e:
+            logger.warning(f"스냅샷 저장 실패: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    # ---- 로딩 ----
+
+    def _load(self, allow_fallback: bool = True) -> DatasetState:
+        """
+        스냅샷 → 원본 CSV → 대체 데이터 순으로 읽기
+
+        Args:
+            allow_fallback: 원본이 없거나 읽기 실패 시 대체 데이터 사용 여부 (처음 로딩할 때만 사용,
+                            다시 읽을 때는 예외를 그대로 올려 기존 데이터를 유지)
+        """
+        fallback = self.fallback if allow_fallback else None
+        signature = self._signature()
+        if signature is not None:
+            state = self._read_snapshot(signature)
+            if state is not None:
+                logger.info(f"스냅샷에서 데이터 로드: {self.path} ({len(state.df)}행)")
+                return state
+            try:
+                df = self._apply_dtypes(pd.read_csv(self.path, **self.read_options))
+                state = DatasetState(df, dataset_fingerprint(df), signature, 'csv')
+                self._write_snapshot(state)
+                logger.info(f"CSV에서 데이터 로드: {self.path} ({len(df)}행)")
+                return state
+            except Exception as e:
+                if fallback is None:
+                    raise
+                logger.warning(f"CSV 읽기 실패, 대체 데이터를 사용합니다: {self.path} - {e}")
+        elif fallback is None:
+            raise FileNotFoundError(self.path)
+        else:
+            logger.warning(f"데이터 파일이 없어 대체 데이터를 사용합니다: {self.path}")
+
+        df = self._apply_dtypes(fallback())
+        return DatasetState(df, dataset_fingerprint(df), signature, 'fallback')
+
+    def _swap(self, state: DatasetState):
+        """새 상태로 원자적 교체 후 변경 알림"""
+        old = self._state
+        self._state = state
+        if old is not None and old.fingerprint != state.fingerprint and self.on_change is not None:
+            self.on_change(old.fingerprint, state.fingerprint)
+
+    def get(self) -> Tuple[pd.DataFrame, str]:
+        """현재 (데이터프레임, 지문), 처음 호출 시 로딩하고 감시 스레드 시작"""
+        state = self._state
+        if state is None:
+            with self._load_lock:
+                if self._state is None:
+                    self._swap(self._load())
+                    self.start_watching()
+                state = self._state
+        return state.df, state.fingerprint
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        원본이 바뀌었으면(force면 항상) 다시 읽어 교체 (읽기 실패 시 예외, 기존 데이터는 유지)
+
+        Returns:
+            교체 여부
+        """
+        with self._load_lock:
+            current = self._state
+            signature = self._signature()
+            if not force and current is not None:
+                # 파일이 교체되는 도중 잠시 사라진 경우에는 기존 데이터 유지
+                if signature == current.signature or (signature is None and current.source != 'fallback'):
+                    return False
+            # 이미 데이터가 있으면 읽기 실패 시 대체 데이터로 바꾸지 않음 (_watch가 기록 후 기존 데이터 유지)
+            state = self._load(allow_fallback=current is None)
+            self._swap(state)
+        logger.info(f"데이터 교체 완료: {self.path} ({state.source}, 지문 {state.fingerprint})")
+        return True
+
+    # ---- 감시 ----
+
+    def _watch(self):
+        """원본 파일 변경 감시 루프"""
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.reload()
+            except Exception as e:
+                logger.error(f"데이터 다시 읽기 실패, 기존 데이터를 유지합니다: {e}")
+
+    def start_watching(self):
+        """감시 스레드 시작 (poll_interval이 0이면 시작하지 않음)"""
+        if self.poll_interval <= 0 or (self._watcher is not None and self._watcher.is_alive()):
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, name='dataset-watcher', daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        """감시 스레드 종료"""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def info(self) -> Dict[str, Any]:
+        """현재 데이터 상태 요약"""
+        state = self._state
+        if state is None:
+            return {'path': self.path, 'loaded': False}
+        return {
+            'path': self.path,
+            'loaded': True,
+            'source': state.source,
+            'rows': len(state.df),
+            'fingerprint': state.fingerprint,
+            'loaded_at': state.loaded_at.isoformat(timespec='seconds'),
+            'watching': self._watcher is not None and self._watcher.is_alive()
+        }
@@ -0,0 +1,43 @@
+"""
+운영 서버 설정 (gunicorn + uvicorn 워커)
+
+실행:
+    gunicorn -c gunicorn.conf.py asgi:application
+
+워커 프로세스마다 분석 결과/차트 캐시를 따로 가지므로 RESULT_CACHE_DIR(또는 REDIS_URL)을
+지정해 워커 간에 계산 결과를 공유하는 것을 권장합니다.
+
+CPU 예산: 웹 워커마다 재표본 계산 풀(BOOTSTRAP_WORKERS), 차트 렌더링 풀(RENDER_WORKERS),
+무거운 요청 스레드(HEAVY_THREADS)를 따로 가지므로, 지정하지 않은 값은 CPU 코어를 웹 워커 수로
+나눈 몫(워커당 코어)에 맞춰 정합니다. 예를 들어 4코어/워커 4개면 워커당 코어가 1개이므로
+재표본 계산과 렌더링을 요청 스레드에서 직접 실행해, CPU를 쓰는 프로세스가 워커 4개뿐입니다.
+웹 워커를 늘리면 동시에 받을 수 있는 요청과 장애 격리가 늘지만 워커당 풀과 캐시가 작아지고,
+워커를 줄이면(WEB_CONCURRENCY) 요청 하나의 부트스트랩/렌더링이 여러 코어를 쓰지만 동시 처리 수가 줄어듭니다.
+"""
+
+import os
+import multiprocessing
+
+bind = os.environ.get('BIND', '0.0.0.0:8080')
+cpu_count = multiprocessing.cpu_count()
+workers = int(os.environ.get('WEB_CONCURRENCY', min(4, cpu_count)))
+worker_class = 'uvicorn.workers.UvicornWorker'
+
+# 워커당 코어 수에 맞춘 풀 크기 (환경 변수로 지정한 값이 우선, 워커 프로세스가 상속)
+cores_per_worker = max(1, cpu_count // workers)
+os.environ.setdefault('BOOTSTRAP_WORKERS', str(cores_per_worker))  # 1이면 요청 스레드에서 계산
+os.environ.setdefault('RENDER_WORKERS', str(min(2, cores_per_worker // 2)))  # 0이면 요청 스레드에서 렌더링
+os.environ.setdefault('HEAVY_THREADS', str(max(2, cores_per_worker)))
+
+# 첫 분석(부트스트랩/학습)이 길어질 수 있으므로 여유 있게 설정
+timeout = int(os.environ.get('WORKER_TIMEOUT', 120))
+graceful_timeout = 30
+keepalive = 5
+
+# 메모리 누적 방지를 위해 일정 요청 수마다 워커 재시작 (동시에 재시작되지 않도록 지터)
+max_requests = 1000
+max_requests_jitter = 100
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('LOG_LEVEL', 'info')
@@ -0,0 +1,172 @@
+"""
+백그라운드 작업 관리 도구
+모델 학습 같은 오래 걸리는 작업을 스레드 풀에서 비동기로 실행하고
+작업 테이블(상태, 시각, 결과, 에러)로 진행 상황을 조회할 수 있게 합니다.
+"""
+
+import uuid
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
+
+class Job:
+    """작업 하나의 상태"""
+
+    def __init__(self, name: str, key: Any, params: Optional[Dict[str, Any]] = None):
+        self.job_id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.key = key
+        self.params = params or {}
+        self.status = QUEUED
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.error: Optional[str] = None
+        self.result: Any = None
+        self.future: Optional[Future] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    def wait(self, timeout: Optional[float] = None) -> Any:
+        """작업이 끝날 때까지 대기 후 결과 반환 (실패 시 예외 발생)"""
+        return self.future.result(timeout)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """상태 조회 응답 형식 (결과 본문은 제외)"""
+        def iso(value):
+            return value.isoformat() if value else None
+        duration = None
+        if self.started_at and self.finished_at:
+            duration = (self.finished_at - self.started_at).total_seconds()
+        return {
+            'job_id': self.job_id,
+            'name': self.name,
+            'key': self.key,
+            'params': self.params,
+            'status': self.status,
+            'created_at': iso(self.created_at),
+            'started_at': iso(self.started_at),
+            'finished_at': iso(self.finished_at),
+            'duration_seconds': duration,
+            'error': self.error
+        }
+
+
+class JobManager:
+    """백그라운드 작업 관리 클래스 (스레드 안전)"""
+
+    def __init__(self, workers: int = 1, max_history: int = 100):
+        """
+        초기화
+
+        Args:
+            workers: 작업 스레드 수
+            max_history: 작업 테이블에 보관할 최대 작업 수 (초과 시 끝난 작업부터 오래된 순으로 제거)
+        """
+        self.max_history = max_history
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='jobs')
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _run(self, job: Job, func: Callable, args: tuple, kwargs: dict) -> Any:
+        """작업 실행 및 상태 기록"""
+        with self._lock:
+            job.status = RUNNING
+            job.started_at = datetime.now()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            with self._lock:
+                job.status = FAILED
+                job.error = str(e)
+                job.finished_at = datetime.now()
+            logger.error(f"작업 실패: {job.name} ({job.job_id}) - {e}")
+            raise
+        with self._lock:
+            job.result = result
+            job.status = SUCCEEDED
+            job.finished_at = datetime.now()
+        logger.info(f"작업 완료: {job.name} ({job.job_id})")
+        return result
+
+    def _trim(self):
+        """보관 수를 넘으면 끝난 작업을 오래된 순으로 제거 (각 이름의 최근 성공 작업은 유지)"""
+        if len(self._jobs) <= self.max_history:
+            return
+        keep = {id(self._latest(name)) for name in {job.name for job in self._jobs.values()}}
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self.max_history:
+                break
+            job = self._jobs[job_id]
+            if job.done and id(job) not in keep:
+                del self._jobs[job_id]
+
+    def submit(self, name: str, key: Any, func: Callable, *args,
+               params: Optional[Dict[str, Any]] = None, dedupe: bool = True, **kwargs) -> Job:
+        """
+        작업 제출
+
+        Args:
+            name: 작업 종류 (예: 'project3')
+            key: 작업 대상 식별값 (예: 데이터 지문)
+            func: 실행할 함수
+            params: 작업 파라미터 (조회용으로 기록)
+            dedupe: 같은 name/key/params 작업이 대기 중이거나 실행 중이면 새로 만들지 않고 그 작업 반환
+        """
+        with self._lock:
+            if dedupe:
+                for job in reversed(self._jobs.values()):
+                    if job.name == name and job.key == key and job.params == (params or {}) \
+                            and not job.done:
+                        return job
+            job = Job(name, key, params)
+            self._jobs[job.job_id] = job
+            self._trim()
+            job.future = self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """작업 조회"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _latest(self, name: str, key: Any = None) -> Optional[Job]:
+        """가장 최근에 성공한 작업 (호출자가 잠금을 잡고 있어야 함)"""
+        best = None
+        for job in self._jobs.values():
+            if job.name == name and job.status == SUCCEEDED and (key is None or job.key == key):
+                if best is None or job.finished_at >= best.finished_at:
+                    best = job
+        return best
+
+    def latest(self, name: str, key: Any = None) -> Optional[Job]:
+        """가장 최근에 끝난 성공 작업 (key를 주면 해당 대상만)"""
+        with self._lock:
+            return self._latest(name, key)
+
+    def pending(self, name: str) -> List[Job]:
+        """대기 중이거나 실행 중인 작업 목록"""
+        with self._lock:
+            return [job for job in self._jobs.values() if job.name == name and not job.done]
+
+    def list(self, name: Optional[str] = None) -> List[Job]:
+        """작업 목록 (최근 제출 순)"""
+        with self._lock:
+            return [job for job in reversed(self._jobs.values()) if name is None or job.name == name]
+
+    def shutdown(self, wait: bool = True):
+        """작업 스레드 종료"""
+        self._executor.shutdown(wait=wait)
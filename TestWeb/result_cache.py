@@ -0,0 +1,171 @@
+"""
+분석 결과 캐시
+데이터셋 지문(내용 해시)과 분석 파라미터로 키를 만들어 결과를 프로세스 메모리에 보관하고,
+선택적으로 디스크(pickle 파일)나 Redis에도 저장해 재시작 후에도 재사용합니다.
+데이터가 바뀌면 지문이 달라지므로 이전 결과는 자동으로 쓰이지 않습니다.
+"""
+
+import os
+import json
+import pickle
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def dataset_fingerprint(df: pd.DataFrame) -> str:
+    """컬럼, dtype, 값 전체를 반영한 데이터프레임 지문"""
+    digest = hashlib.sha1()
+    digest.update(json.dumps([[str(column), str(dtype)] for column, dtype in df.dtypes.items()],
+                             ensure_ascii=False).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return digest.hexdigest()[:16]
+
+
+class ResultCache:
+    """데이터셋 지문 기반 분석 결과 캐시 클래스 (스레드 안전)"""
+
+    def __init__(self, cache_dir: Optional[str] = None, redis_url: Optional[str] = None,
+                 max_entries: int = 64, redis_ttl: int = 7 * 24 * 3600):
+        """
+        초기화
+
+        Args:
+            cache_dir: 결과 pickle 파일을 저장할 디렉토리 (없으면 디스크에 저장하지 않음)
+            redis_url: 결과를 저장할 Redis URL (없으면 사용하지 않음, redis 패키지 필요)
+            max_entries: 메모리에 보관할 최대 결과 수 (초과 시 가장 오래 쓰이지 않은 것부터 제거)
+            redis_ttl: Redis 저장 유효 시간(초)
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.redis_ttl = redis_ttl
+        self.redis_client = None
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: 'OrderedDict[str, Tuple[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        if redis_url:
+            try:
+                import redis
+                self.redis_client = redis.Redis.from_url(redis_url)
+                self.redis_client.ping()
+            except Exception as e:
+                logger.warning(f"Redis 결과 캐시 사용 불가, 메모리/디스크만 사용합니다: {e}")
+                self.redis_client = None
+
+    @staticmethod
+    def make_key(name: str, fingerprint: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """분석 이름, 데이터 지문, 파라미터로 캐시 키 생성"""
+        params_text = json.dumps(params or {}, sort_keys=True, default=str)
+        params_hash = hashlib.sha1(params_text.encode('utf-8')).hexdigest()[:12]
+        return f"{name}-{fingerprint}-{params_hash}"
+
+    def _load_persistent(self, key: str) -> Tuple[bool, Any]:
+        """디스크/Redis에서 결과 읽기"""
+        try:
+            if self.redis_client is not None:
+                payload = self.redis_client.get(f"result_cache:{key}")
+                if payload is not None:
+                    return True, pickle.loads(payload)
+            if self.cache_dir:
+                path = os.path.join(self.cache_dir, f"{key}.pkl")
+                if os.path.exists(path):
+                    with open(path, 'rb') as f:
+                        return True, pickle.load(f)
+        except Exception as e:
+            logger.warning(f"저장된 결과 읽기 실패, 다시 계산합니다: {key} - {e}")
+        return False, None
+
+    def _save_persistent(self, key: str, result: Any):
+        """디스크/Redis에 결과 저장 (디스크는 임시 파일 후 교체)"""
+        try:
+            payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+            if self.redis_client is not None:
+                self.redis_client.setex(f"result_cache:{key}", self.redis_ttl, payload)
+            if self.cache_dir:
+                path = os.path.join(self.cache_dir, f"{key}.pkl")
+                temp_path = f"{path}.{os.getpid()}.tmp"
+                with open(temp_path, 'wb') as f:
+                    f.write(payload)
+                os.replace(temp_path, path)
+        except Exception as e:
+            logger.warning(f"결과 저장 실패: {key} - {e}")
+
+    def _remember(self, key: str, fingerprint: str, result: Any):
+        """메모리에 결과 보관 (LRU)"""
+        with self._lock:
+            self._entries[key] = (fingerprint, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, name: str, fingerprint: str, params: Optional[Dict[str, Any]],
+                       compute: Callable[[], Any]) -> Any:
+        """
+        캐시된 결과 반환, 없으면 compute()로 계산 후 저장
+
+        같은 키를 동시에 요청하면 한 번만 계산하고 나머지는 그 결과를 기다립니다.
+        """
+        key = self.make_key(name, fingerprint, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is not None:
+                with self._lock:
+                    self.hits += 1
+                return entry[1]
+
+            found, result = self._load_persistent(key)
+            if not found:
+                result = compute()
+                self._save_persistent(key, result)
+                with self._lock:
+                    self.misses += 1
+            else:
+                with self._lock:
+                    self.hits += 1
+            self._remember(key, fingerprint, result)
+
+        with self._lock:
+            self._key_locks.pop(key, None)
+        return result
+
+    def invalidate(self, fingerprint: Optional[str] = None):
+        """지정한 지문(없으면 전체)의 메모리 결과 제거 (디스크/Redis는 키가 달라 재사용되지 않음)"""
+        with self._lock:
+            if fingerprint is None:
+                self._entries.clear()
+                return
+            for key in [key for key, (entry_fingerprint, _) in self._entries.items()
+                        if entry_fingerprint == fingerprint]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 상태 요약"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'cache_dir': self.cache_dir,
+                'redis': self.redis_client is not None
+            }